@@ -0,0 +1,13 @@
+"""
+Benchmarks of the JMC compiler against deterministic synthetic JMC projects
+
+Usage (from `src`):
+```
+python -m benchmarks run --scale 1 10 100 --output result.json
+python -m benchmarks compare base.json result.json
+python -m benchmarks generate --scale 10 path/to/folder
+```
+"""
+
+from .corpus import CorpusConfig, generate_corpus, write_corpus, corpus_stats
+from .scenarios import SCENARIOS, run_benchmarks, compare
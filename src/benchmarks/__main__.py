@@ -0,0 +1,124 @@
+"""Command line interface of the benchmarks"""
+
+import argparse
+from json import dumps, loads
+from pathlib import Path
+import sys
+
+from jmc.compile import set_debug_log
+
+from .corpus import CorpusConfig, corpus_stats, generate_corpus, write_corpus
+from .scenarios import SCENARIOS, compare, run_benchmarks
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks of the JMC compiler")
+    subparser = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparser.add_parser("run", help="run benchmarks")
+    run_parser.add_argument(
+        "--scale",
+        "-s",
+        default=[1],
+        nargs="+",
+        type=int,
+        help="multipliers of the project size, 1 is roughly a typical datapack",
+    )
+    run_parser.add_argument(
+        "--scenario",
+        default=None,
+        nargs="+",
+        choices=list(SCENARIOS),
+        help="scenarios to run, defaults to every scenario",
+    )
+    run_parser.add_argument(
+        "--repeat", "-r", default=5, type=int, help="amount of timed runs"
+    )
+    run_parser.add_argument(
+        "--warmup", default=1, type=int, help="amount of untimed runs before timed runs"
+    )
+    run_parser.add_argument(
+        "--seed", default=0, type=int, help="seed of the project generator"
+    )
+    run_parser.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        type=Path,
+        help="write result JSON to this file instead of stdout",
+    )
+    run_parser.add_argument(
+        "--no-debug-log",
+        dest="is_no_debug_log",
+        action="store_true",
+        help="don't record debug log (like `jmc --no-debug-log`)",
+    )
+
+    compare_parser = subparser.add_parser(
+        "compare", help="compare two results, exit with 1 if there's a regression"
+    )
+    compare_parser.add_argument("base", type=Path, help="result to compare against")
+    compare_parser.add_argument("head", type=Path, help="result to compare")
+    compare_parser.add_argument(
+        "--threshold",
+        "-t",
+        default=0.1,
+        type=float,
+        help="relative slowdown of median time that counts as regression",
+    )
+
+    generate_parser = subparser.add_parser(
+        "generate", help="write a generated JMC project to a folder"
+    )
+    generate_parser.add_argument("folder", type=Path, help="project folder")
+    generate_parser.add_argument(
+        "--scale", "-s", default=1, type=int, help="multiplier of the project size"
+    )
+    generate_parser.add_argument(
+        "--seed", default=0, type=int, help="seed of the project generator"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = get_args()
+    if args.command == "run":
+        set_debug_log(not args.is_no_debug_log)
+        result = run_benchmarks(
+            args.scale,
+            args.scenario,
+            args.repeat,
+            args.warmup,
+            CorpusConfig(seed=args.seed),
+        )
+        for row in result["results"]:
+            print(
+                f"{row['scenario']:>16} x{row['scale']:<4} median {row['median'] * 1000:10.2f}ms"
+                f" (min {row['min'] * 1000:.2f}ms, {row['corpus']['lines']} lines)",
+                file=sys.stderr,
+            )
+        if args.output is None:
+            print(dumps(result, indent=4))
+        else:
+            args.output.write_text(dumps(result, indent=4), encoding="utf-8")
+    elif args.command == "compare":
+        rows = compare(
+            loads(args.base.read_text(encoding="utf-8")),
+            loads(args.head.read_text(encoding="utf-8")),
+            args.threshold,
+        )
+        for row in rows:
+            print(
+                f"{row['scenario']:>16} x{row['scale']:<4} {row['base'] * 1000:10.2f}ms -> {row['head'] * 1000:10.2f}ms"
+                f" ({row['ratio']:.2f}x){' REGRESSION' if row['is_regression'] else ''}"
+            )
+        if any(row["is_regression"] for row in rows):
+            sys.exit(1)
+    elif args.command == "generate":
+        corpus = generate_corpus(CorpusConfig(seed=args.seed).scaled(args.scale))
+        write_corpus(corpus, args.folder)
+        print(dumps(corpus_stats(corpus)))
+
+
+if __name__ == "__main__":
+    main()
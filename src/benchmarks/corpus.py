@@ -0,0 +1,259 @@
+"""Module generating deterministic synthetic JMC projects for benchmarking"""
+
+from pathlib import Path
+from random import Random
+from typing import Any
+
+MAIN_FILE_NAME = "main.jmc"
+HEADER_FILE_NAME = "main.hjmc"
+MODULE_FOLDER_NAME = "modules"
+VARIABLE_COUNT = 8
+"""Amount of scoreboard variables used by each file"""
+TEXT_COLORS = ("gold", "aqua", "red", "green", "yellow", "light_purple")
+
+
+class CorpusConfig:
+    """
+    Shape of a generated JMC project, the default is roughly the size of a typical datapack
+
+    :param files: Amount of JMC files besides the main file, defaults to 8
+    :param functions: Amount of functions in each file, defaults to 12
+    :param statements: Amount of statements in each block, defaults to 4
+    :param nesting: Maximum depth of nested if/else and for blocks, defaults to 3
+    :param macros: Amount of `#define` in the header file, defaults to 32
+    :param macro_density: Chance of a command using a macro, defaults to 0.25
+    :param repeats: Amount of `Hardcode.repeat` in each file, defaults to 2
+    :param repeat_iterations: Amount of iterations of each `Hardcode.repeat`, defaults to 16
+    :param switch_cases: Amount of cases of the switch statement in each file, defaults to 12
+    :param texts: Amount of formatted text (`Text.tellraw`) in each function, defaults to 2
+    :param seed: Seed of the random generator, defaults to 0
+    """
+
+    __slots__ = (
+        "files",
+        "functions",
+        "statements",
+        "nesting",
+        "macros",
+        "macro_density",
+        "repeats",
+        "repeat_iterations",
+        "switch_cases",
+        "texts",
+        "seed",
+    )
+
+    def __init__(
+        self,
+        files: int = 8,
+        functions: int = 12,
+        statements: int = 4,
+        nesting: int = 3,
+        macros: int = 32,
+        macro_density: float = 0.25,
+        repeats: int = 2,
+        repeat_iterations: int = 16,
+        switch_cases: int = 12,
+        texts: int = 2,
+        seed: int = 0,
+    ) -> None:
+        self.files = files
+        self.functions = functions
+        self.statements = statements
+        self.nesting = nesting
+        self.macros = macros
+        self.macro_density = macro_density
+        self.repeats = repeats
+        self.repeat_iterations = repeat_iterations
+        self.switch_cases = switch_cases
+        self.texts = texts
+        self.seed = seed
+
+    def scaled(self, scale: int) -> "CorpusConfig":
+        """
+        Get the same project shape with `scale` times as many files
+
+        :param scale: Multiplier of amount of files
+        :return: New CorpusConfig
+        """
+        config = CorpusConfig(**self.toJSON())
+        config.files = self.files * scale
+        return config
+
+    def toJSON(self) -> dict[str, Any]:
+        """
+        Turn get JSON from instance
+
+        :return: JSON
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _FileGenerator:
+    """
+    Generator of one JMC file, every random choice comes from its own seeded Random
+
+    :param config: Shape of the project
+    :param index: Index of the file
+    """
+
+    __slots__ = ("config", "index", "random", "lines", "for_count")
+
+    def __init__(self, config: CorpusConfig, index: int) -> None:
+        self.config = config
+        self.index = index
+        self.random = Random(f"{config.seed}/{index}")
+        self.lines: list[str] = []
+        self.for_count = 0
+
+    def __variable(self) -> str:
+        return f"$m{self.index}_v{self.random.randrange(VARIABLE_COUNT)}"
+
+    def __number(self) -> str:
+        if self.config.macros and self.random.random() < self.config.macro_density:
+            return f"MACRO_{self.random.randrange(self.config.macros)}"
+        return str(self.random.randrange(-64, 64))
+
+    def __text(self) -> str:
+        color = self.random.choice(TEXT_COLORS)
+        style = self.random.choice(("", ", bold", ", italic"))
+        return (
+            f'"&<{color}{style}>Module {self.index} &<gray>value: '
+            f'&<{self.random.choice(TEXT_COLORS)}>{self.__variable()}"'
+        )
+
+    def __statement(self, indent: str) -> None:
+        kind = self.random.randrange(5)
+        if kind == 0:
+            self.lines.append(f"{indent}{self.__variable()} = {self.__number()};")
+        elif kind == 1:
+            operator = self.random.choice(("+=", "-=", "*="))
+            self.lines.append(
+                f"{indent}{self.__variable()} {operator} {self.__variable()};"
+            )
+        elif kind == 2:
+            self.lines.append(
+                f"{indent}tp @s {self.__number()} ~ {self.__number()};"
+            )
+        elif kind == 3:
+            self.lines.append(
+                f"{indent}execute as @a[tag=module_{self.index}] at @s run particle minecraft:flame ~ ~1 ~ 0 0 0 0 1;"
+            )
+        else:
+            self.lines.append(f'{indent}say "Module {self.index} {self.__variable()}";')
+
+    def __block(self, indent: str, depth: int) -> None:
+        for _ in range(self.config.statements):
+            self.__statement(indent)
+        if depth >= self.config.nesting:
+            return
+        if self.random.random() < 0.5:
+            self.lines.append(
+                f"{indent}if ({self.__variable()} > {self.__number()}) {{"
+            )
+            self.__block(indent + "    ", depth + 1)
+            self.lines.append(f"{indent}}} else {{")
+            self.__block(indent + "    ", depth + 1)
+            self.lines.append(f"{indent}}}")
+        else:
+            counter = f"$m{self.index}_i{self.for_count}"
+            self.for_count += 1
+            self.lines.append(
+                f"{indent}for ({counter} = 0; {counter} < {self.random.randrange(2, 10)}; {counter}++) {{"
+            )
+            self.__block(indent + "    ", depth + 1)
+            self.lines.append(f"{indent}}}")
+
+    def generate(self) -> str:
+        """
+        Generate content of the file
+
+        :return: JMC code
+        """
+        self.lines.append(f"class module_{self.index} {{")
+        for function_index in range(self.config.functions):
+            self.lines.append(f"    function f_{function_index}() {{")
+            self.__block(" " * 8, 1)
+            for _ in range(self.config.texts):
+                self.lines.append(f"        Text.tellraw(@a, {self.__text()});")
+            if function_index:
+                self.lines.append(
+                    f"        module_{self.index}.f_{self.random.randrange(function_index)}();"
+                )
+            self.lines.append("    }")
+        self.lines.append("    function dispatch() {")
+        self.lines.append(f"        switch ($m{self.index}_v0) {{")
+        for case in range(1, self.config.switch_cases + 1):
+            self.lines.append(f"            case {case}:")
+            if self.config.functions:
+                self.lines.append(
+                    f"                module_{self.index}.f_{self.random.randrange(self.config.functions)}();"
+                )
+            self.lines.append(f"                Text.actionbar(@a, {self.__text()});")
+        self.lines.append("        }")
+        self.lines.append("    }")
+        self.lines.append("}")
+        for _ in range(self.config.repeats):
+            self.lines.append("Hardcode.repeat((index)=>{")
+            self.lines.append(
+                f'    scoreboard players set $m{self.index}_r{self.random.randrange(4)} __variable__ $index;'
+            )
+            self.lines.append('    tellraw @a "$index^2=Hardcode.calc($index**2)";')
+            self.lines.append(f"}}, start=0, stop={self.config.repeat_iterations});")
+        return "\n".join(self.lines) + "\n"
+
+
+def generate_corpus(config: CorpusConfig) -> dict[str, str]:
+    """
+    Generate a JMC project, the same config always generates the same project
+
+    :param config: Shape of the project
+    :return: Dictionary of file path (relative to the project folder) and file content
+    """
+    random = Random(config.seed)
+    header = [
+        f"#define MACRO_{index} {random.randrange(-64, 64)}"
+        for index in range(config.macros)
+    ]
+    main = [
+        f'import "{MODULE_FOLDER_NAME}/module_{index}";' for index in range(config.files)
+    ]
+    main.append("function tick() {")
+    main.extend(f"    module_{index}.dispatch();" for index in range(config.files))
+    main.append("}")
+    corpus = {
+        HEADER_FILE_NAME: "\n".join(header) + "\n",
+        MAIN_FILE_NAME: "\n".join(main) + "\n",
+    }
+    for index in range(config.files):
+        corpus[f"{MODULE_FOLDER_NAME}/module_{index}.jmc"] = _FileGenerator(
+            config, index
+        ).generate()
+    return corpus
+
+
+def write_corpus(corpus: dict[str, str], folder: Path) -> None:
+    """
+    Write generated project to a folder
+
+    :param corpus: Dictionary of file path and file content
+    :param folder: Project folder
+    """
+    for path, content in corpus.items():
+        file = folder / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content, encoding="utf-8")
+
+
+def corpus_stats(corpus: dict[str, str]) -> dict[str, int]:
+    """
+    Get size of generated project
+
+    :param corpus: Dictionary of file path and file content
+    :return: Amount of files, lines and bytes
+    """
+    return {
+        "files": len(corpus),
+        "lines": sum(content.count("\n") for content in corpus.values()),
+        "bytes": sum(len(content.encode("utf-8")) for content in corpus.values()),
+    }
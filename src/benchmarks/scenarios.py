@@ -0,0 +1,266 @@
+"""Module containing timed benchmark scenarios and their machine-readable results"""
+
+from datetime import datetime, timezone
+import gc
+import platform
+import shutil
+import subprocess
+from pathlib import Path
+from statistics import mean, median, pstdev
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable
+
+from jmc.compile.compiling import build, read_cert, read_header
+from jmc.compile.context import CompileContext
+from jmc.compile.header import Header
+from jmc.compile.lexer import Lexer
+from jmc.compile.tokenizer import Tokenizer
+from jmc.config import VERSION
+from jmc.terminal import Configuration, GlobalData
+
+from .corpus import MAIN_FILE_NAME, CorpusConfig, corpus_stats, generate_corpus, write_corpus
+
+RESULT_FORMAT = 1
+"""Version of the result JSON format"""
+NAMESPACE = "bench"
+PACK_FORMAT = "57"
+OUTPUT_FOLDER_NAME = "output"
+
+
+def make_config(folder: Path) -> Configuration:
+    """
+    Make JMC configuration of a project written by `write_corpus`
+
+    :param folder: Project folder
+    :return: JMC configuration
+    """
+    return Configuration(
+        GlobalData(),
+        namespace=NAMESPACE,
+        description="__THIS_IS_FOR_BENCHMARKING__",
+        pack_format=PACK_FORMAT,
+        target=folder / MAIN_FILE_NAME,
+        output=folder / OUTPUT_FOLDER_NAME,
+    )
+
+
+def _prepare(config: Configuration) -> tuple[bool, dict[str, str], Path]:
+    """Start a compilation from an empty output folder, return result of read_cert"""
+    shutil.rmtree(config.output, ignore_errors=True)
+    Header.clear()
+    read_header(config)
+    return read_cert(config)
+
+
+def tokenize(config: Configuration, corpus: dict[str, str]) -> float:
+    """Tokenize every JMC file"""
+    _prepare(config)
+    files = [
+        ((config.target.parent / path).as_posix(), content)
+        for path, content in corpus.items()
+        if path.endswith(".jmc")
+    ]
+    start = perf_counter()
+    for file_path, content in files:
+        Tokenizer(content, file_path)
+    return perf_counter() - start
+
+
+def lex(config: Configuration, corpus: dict[str, str]) -> float:
+    """Read, tokenize and parse every JMC file into a datapack"""
+    _prepare(config)
+    start = perf_counter()
+    Lexer(config)
+    return perf_counter() - start
+
+
+def datapack_build(config: Configuration, corpus: dict[str, str]) -> float:
+    """`DataPack.build` of a parsed datapack"""
+    _prepare(config)
+    datapack = Lexer(config).datapack
+    start = perf_counter()
+    datapack.build()
+    return perf_counter() - start
+
+
+def build_virtual(config: Configuration, corpus: dict[str, str]) -> float:
+    """`compiling.build` of a parsed datapack into a dictionary of output files"""
+    is_delete, cert_config, cert_file = _prepare(config)
+    datapack = Lexer(config).datapack
+    start = perf_counter()
+    build(datapack, config, is_delete, cert_config, cert_file, _is_virtual=True)
+    return perf_counter() - start
+
+
+def build_disk(config: Configuration, corpus: dict[str, str]) -> float:
+    """`compiling.build` of a parsed datapack into the output folder"""
+    is_delete, cert_config, cert_file = _prepare(config)
+    datapack = Lexer(config).datapack
+    start = perf_counter()
+    build(datapack, config, is_delete, cert_config, cert_file)
+    return perf_counter() - start
+
+
+def compile_disk(config: Configuration, corpus: dict[str, str]) -> float:
+    """Whole compilation (header, certificate, lexer and build) into the output folder"""
+    shutil.rmtree(config.output, ignore_errors=True)
+    start = perf_counter()
+    Header.clear()
+    read_header(config)
+    is_delete, cert_config, cert_file = read_cert(config)
+    datapack = Lexer(config).datapack
+    build(datapack, config, is_delete, cert_config, cert_file)
+    return perf_counter() - start
+
+
+SCENARIOS: dict[str, Callable[[Configuration, dict[str, str]], float]] = {
+    "tokenize": tokenize,
+    "lex": lex,
+    "datapack_build": datapack_build,
+    "build_virtual": build_virtual,
+    "build_disk": build_disk,
+    "compile_disk": compile_disk,
+}
+"""Dictionary of scenario name and function returning time (seconds) of the timed part of a run"""
+
+
+def time_scenario(
+    scenario: str,
+    config: Configuration,
+    corpus: dict[str, str],
+    repeat: int,
+    warmup: int = 1,
+) -> list[float]:
+    """
+    Run a scenario multiple times, each in a fresh CompileContext
+
+    :param scenario: Name of the scenario
+    :param config: JMC configuration of the project
+    :param corpus: Dictionary of file path and file content of the project
+    :param repeat: Amount of timed runs
+    :param warmup: Amount of untimed runs before the timed runs, defaults to 1
+    :return: Time (seconds) of each timed run
+    """
+    function = SCENARIOS[scenario]
+    samples: list[float] = []
+    for run in range(warmup + repeat):
+        gc.collect()
+        with CompileContext().use():
+            elapsed = function(config, corpus)
+        if run >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def get_commit() -> str | None:
+    """
+    Get git commit of the JMC source being benchmarked
+
+    :return: Commit hash (with `-dirty` if there're uncommitted changes), None if it's not a git repository
+    """
+    cwd = Path(__file__).parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + "-dirty" if status else commit
+
+
+def run_benchmarks(
+    scales: list[int],
+    scenarios: list[str] | None = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    corpus_config: CorpusConfig | None = None,
+) -> dict[str, Any]:
+    """
+    Run every scenario against generated projects of every scale
+
+    :param scales: Multipliers of the project size (1 is roughly a typical datapack)
+    :param scenarios: Name of scenarios to run, defaults to every scenario
+    :param repeat: Amount of timed runs of each scenario, defaults to 5
+    :param warmup: Amount of untimed runs of each scenario, defaults to 1
+    :param corpus_config: Shape of the project at scale 1, defaults to CorpusConfig()
+    :return: JSON serializable result
+    """
+    if scenarios is None:
+        scenarios = list(SCENARIOS)
+    if corpus_config is None:
+        corpus_config = CorpusConfig()
+    results: list[dict[str, Any]] = []
+    for scale in scales:
+        scaled_config = corpus_config.scaled(scale)
+        corpus = generate_corpus(scaled_config)
+        with TemporaryDirectory(prefix="jmc_benchmark_") as folder:
+            write_corpus(corpus, Path(folder))
+            config = make_config(Path(folder))
+            for scenario in scenarios:
+                samples = time_scenario(scenario, config, corpus, repeat, warmup)
+                results.append(
+                    {
+                        "scenario": scenario,
+                        "scale": scale,
+                        "corpus": corpus_stats(corpus),
+                        "samples": samples,
+                        "min": min(samples),
+                        "median": median(samples),
+                        "mean": mean(samples),
+                        "stdev": pstdev(samples),
+                    }
+                )
+    return {
+        "format": RESULT_FORMAT,
+        "version": VERSION,
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "warmup": warmup,
+        "corpus_config": corpus_config.toJSON(),
+        "results": results,
+    }
+
+
+def compare(
+    base: dict[str, Any], head: dict[str, Any], threshold: float = 0.1
+) -> list[dict[str, Any]]:
+    """
+    Compare median time of every scenario and scale that are in both results
+
+    :param base: Result of `run_benchmarks` to compare against (e.g. of the main branch)
+    :param head: Result of `run_benchmarks` to compare (e.g. of a pull request)
+    :param threshold: Relative slowdown of median time that counts as regression, defaults to 0.1 (10%)
+    :return: List of scenario, scale, base and head median, ratio (head/base) and whether it's a regression
+    """
+    base_results = {
+        (result["scenario"], result["scale"]): result for result in base["results"]
+    }
+    rows: list[dict[str, Any]] = []
+    for result in head["results"]:
+        key = (result["scenario"], result["scale"])
+        if key not in base_results:
+            continue
+        base_median = base_results[key]["median"]
+        ratio = result["median"] / base_median if base_median else float("inf")
+        rows.append(
+            {
+                "scenario": result["scenario"],
+                "scale": result["scale"],
+                "base": base_median,
+                "head": result["median"],
+                "ratio": ratio,
+                "is_regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
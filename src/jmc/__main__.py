@@ -11,7 +11,8 @@ from pathlib import Path
 import sys
 
 
-from .compile import Logger
+from .compile import Logger, set_debug_log
+from .compile.profiler import DEFAULT_PROFILE_PATH
 from .terminal import Colors, Configuration, eprint, handle_exception, pprint, RestartException, GlobalData, start
 from .config import VERSION, CONFIG_FILE_NAME
 
@@ -31,13 +32,18 @@ def main():
     os.system("")  # required for ANSI escape codes on Windows terminal
     logger.info(f"Argv: {sys.argv}")
     args = get_args()
+    set_debug_log(not args.is_no_debug_log)
     logger.info(f"Args: {args}")
     if args.command == "init":
         init(args)
     elif args.command == "compile":
         compile(args)
+    elif args.command == "watch":
+        watch(args)
     elif args.command == "config":
         config(args)
+    elif args.command == "serve":
+        serve(args)
     elif args.command == "run" or args.command is None:
         atexit.register(lambda: sys.stdout.isatty() and print(Colors.EXIT.value + "\n"))
         run()
@@ -48,6 +54,12 @@ def main():
 def get_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Javascript-like Minecraft Function")
     parser.add_argument("--version", "-v", action="version", version=VERSION)
+    parser.add_argument(
+        "--no-debug-log",
+        dest="is_no_debug_log",
+        action="store_true",
+        help="don't record debug log (faster, `log debug` will only contain info log)",
+    )
     subparser = parser.add_subparsers(dest="command", required=False)
 
     compile_parser = subparser.add_parser("compile", help="compile")
@@ -63,6 +75,104 @@ def get_args() -> argparse.Namespace:
         type=str,
         help="set macros defined with #env to 1",
     )
+    compile_parser.add_argument(
+        "--no-cache",
+        dest="is_no_cache",
+        action="store_true",
+        help="ignore compile cache and tokenize every file",
+    )
+    compile_parser.add_argument(
+        "--zip",
+        "-z",
+        dest="zip_output",
+        required=False,
+        default=None,
+        type=Path,
+        help="write the datapack into a zip file instead of the output folder",
+    )
+    compile_parser.add_argument(
+        "--jobs",
+        "-j",
+        required=False,
+        default=1,
+        type=int,
+        help="tokenize imported files in this many worker processes",
+    )
+    compile_parser.add_argument(
+        "--pgo",
+        dest="function_profile",
+        required=False,
+        default=None,
+        type=Path,
+        help="optimize using in-game profiling data (JSON or `<function> <calls> [<time>]` lines)",
+    )
+    compile_parser.add_argument(
+        "--profile",
+        required=False,
+        default=None,
+        nargs="?",
+        const=DEFAULT_PROFILE_PATH,
+        type=Path,
+        help="record time and allocations of each compilation phase into <profile>.json and <profile>.collapsed (flamegraph)",
+    )
+
+    watch_parser = subparser.add_parser(
+        "watch", help="compile and recompile whenever a source file changes"
+    )
+    watch_parser.add_argument(
+        "--environment",
+        "--environments",
+        "--env",
+        "--envs",
+        "-e",
+        required=False,
+        default=[],
+        nargs="+",
+        type=str,
+        help="set macros defined with #env to 1",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        "-i",
+        required=False,
+        default=terminal_commands.WATCH_INTERVAL,
+        type=float,
+        help="seconds between each check for changes",
+    )
+    watch_parser.add_argument(
+        "--no-cache",
+        dest="is_no_cache",
+        action="store_true",
+        help="ignore compile cache and tokenize every file",
+    )
+    watch_parser.add_argument(
+        "--jobs",
+        "-j",
+        required=False,
+        default=1,
+        type=int,
+        help="tokenize imported files in this many worker processes",
+    )
+    watch_parser.add_argument(
+        "--pgo",
+        dest="function_profile",
+        required=False,
+        default=None,
+        type=Path,
+        help="optimize using in-game profiling data (JSON or `<function> <calls> [<time>]` lines)",
+    )
+
+    serve_parser = subparser.add_parser(
+        "serve",
+        help="start a compile daemon that keeps caches warm, taking JSON-RPC requests (one per line)",
+    )
+    serve_parser.add_argument(
+        "--socket",
+        required=False,
+        default=None,
+        type=Path,
+        help="listen on this Unix socket instead of stdin/stdout",
+    )
 
     run_parser = subparser.add_parser("run", help="start a jmc session")
 
@@ -220,9 +330,42 @@ def compile(args: argparse.Namespace):
         eprint("Compilation failed: Configuration file does not exist.")
         return
     global_data.config.load_config()
+    global_data.use_cache = not args.is_no_cache
+    global_data.zip_output = args.zip_output
+    global_data.jobs = args.jobs
+    global_data.function_profile = args.function_profile
+    global_data.profile = args.profile
     terminal_commands.compile_(*args.environment)
 
 
+def watch(args: argparse.Namespace):
+    if not global_data.config.is_file_exist():
+        eprint("Watching failed: Configuration file does not exist.")
+        return
+    global_data.config.load_config()
+    global_data.use_cache = not args.is_no_cache
+    global_data.jobs = args.jobs
+    global_data.function_profile = args.function_profile
+    global_data.EVENT.clear()
+    try:
+        terminal_commands.watch_loop(tuple(args.environment), args.interval)
+    except KeyboardInterrupt:
+        pprint("Stopping...", Colors.INFO)
+
+
+def serve(args: argparse.Namespace):
+    from .terminal.server import CompileServer
+
+    server = CompileServer()
+    try:
+        if args.socket is None:
+            server.serve_stream(sys.stdin, sys.stdout)
+        else:
+            server.serve_socket(args.socket)
+    except KeyboardInterrupt:
+        pass
+
+
 def run():
     logger.info("Starting session")
     while True:
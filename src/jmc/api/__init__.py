@@ -1,6 +1,7 @@
 """API for pipeling JMC"""
 from ..compile import EXCEPTIONS
 from ..config import VERSION
+from ..compile.output_sink import DirectorySink, OutputSink, ZipSink
 from ._py_jmc import PyJMC
 
-__all__ = ["PyJMC"]
+__all__ = ["PyJMC", "OutputSink", "DirectorySink", "ZipSink"]
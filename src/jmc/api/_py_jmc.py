@@ -1,12 +1,16 @@
 from dataclasses import dataclass
+from json import dumps
 from pathlib import Path
 
+from ..compile.context import CompileContext
 from ..compile.datapack import DataPack
 from ..compile.lexer import Lexer
 
 from ..terminal import Configuration, GlobalData
 from ..compile.header import Header
 from ..compile.compiling import cert_config_to_string, read_cert, read_header, build
+from ..compile.output_sink import OutputSink
+from ..compile.profiler import CompileProfiler, profile_span
 
 
 @dataclass(frozen=True, slots=True)
@@ -26,6 +30,7 @@ class Core:
     lexer: Lexer
     global_data: GlobalData
     header: Header
+    context: CompileContext
 
 
 class PyJMC:
@@ -37,6 +42,9 @@ class PyJMC:
     :param pack_format: pack_format
     :param target: Path of main jmc file
     :param jmc_txt: jmc.txt content, defaults to { "LOAD": "__load__", "TICK": "__tick__", "PRIVATE": "__private__", "VAR": "__variable__", "INT": "__int__", "STORAGE": "__storage__" }
+    :param envs: Environment variables to set to 1, defaults to None
+    :param sink: Sink to write the built datapack (including pack.mcmeta) into, e.g. ZipSink, defaults to None
+    :param profile: Whether to record time and allocations of each compilation phase into `profiler`, defaults to False
     """
 
     __slots__ = (
@@ -46,6 +54,8 @@ class PyJMC:
         "config",
         "core",
         "pack_mcmeta",
+        "profiler",
+        "context",
         "_cert_file",
     )
     files: dict[Path, str]
@@ -60,6 +70,10 @@ class PyJMC:
     """Inner working of JMC"""
     pack_mcmeta: dict[str, dict[str, float | str]]
     """Content of pack.mcmeta file"""
+    profiler: CompileProfiler | None
+    """Profiler of the compilation, None if `profile` is False (see `CompileProfiler.report` and `CompileProfiler.write`)"""
+    context: CompileContext
+    """Compile context of this pack, isolating it from other compilations in the same process"""
     _cert_file: str
 
     def __init__(
@@ -77,8 +91,12 @@ class PyJMC:
             "STORAGE": "__storage__",
         },
         envs: list[str] | None = None,
+        sink: OutputSink | None = None,
+        profile: bool = False,
     ) -> None:
-        Header().envs = envs if envs is not None else []
+        self.profiler = CompileProfiler() if profile else None
+        self.context = CompileContext()
+        self.context.header.envs = envs if envs is not None else []
         self.config = Configuration(
             GlobalData(),
             namespace=namespace,
@@ -89,13 +107,30 @@ class PyJMC:
         )
 
         self._cert_file = cert_config_to_string(jmc_txt)
-        self.__build()
+        with self.context.use():
+            self.__build()
         self.pack_mcmeta = {
             "pack": {
                 "pack_format": float(self.config.pack_format),
                 "description": self.config.description,
             }
         }
+        if sink is not None:
+            self.write(sink)
+
+    def write(self, sink: OutputSink) -> None:
+        """
+        Write the built datapack (including pack.mcmeta) into a sink
+
+        :param sink: Output sink, e.g. ZipSink or DirectorySink
+        """
+        sink.write(
+            {
+                **self.files,
+                self.config.output / "pack.mcmeta": dumps(self.pack_mcmeta, indent=4),
+            },
+            self.config.output,
+        )
 
     def __build(self) -> None:
         """
@@ -103,15 +138,22 @@ class PyJMC:
         :return: Self
         """
         Header.clear()
-        is_delete, cert_config, cert_file = read_cert(
-            self.config, _test_file=self._cert_file
-        )
-        read_header(self.config)
-        lexer = Lexer(self.config)
-        datapack = lexer.datapack
-        built = build(
-            datapack, self.config, is_delete, cert_config, cert_file, _is_virtual=True
-        )
+        Header().profiler = self.profiler
+        try:
+            is_delete, cert_config, cert_file = read_cert(
+                self.config, _test_file=self._cert_file
+            )
+            with profile_span("header"):
+                read_header(self.config)
+            with profile_span("lex"):
+                lexer = Lexer(self.config)
+            datapack = lexer.datapack
+            built = build(
+                datapack, self.config, is_delete, cert_config, cert_file, _is_virtual=True
+            )
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop()
         if built is None:
             raise ValueError("Lexer.built return None")
         self.files = built
@@ -136,7 +178,9 @@ class PyJMC:
             self.resource_locations.append(
                 Resource(resource_type, resource_location, content)
             )
-        self.core = Core(datapack, lexer, self.config.global_data, Header())
+        self.core = Core(
+            datapack, lexer, self.config.global_data, Header(), self.context
+        )
 
 
 __all__ = ["PyJMC"]
@@ -1,4 +1,4 @@
 from .compiling import compile_jmc
 from .exception import *
-from .log import get_debug_log, get_info_log, Logger
+from .log import get_debug_log, get_info_log, set_debug_log, Logger
 from .exception import EXCEPTIONS
@@ -0,0 +1,227 @@
+"""Module handling persistent per-file compilation cache"""
+
+from hashlib import sha256
+from json import JSONDecodeError, dumps, loads
+from pathlib import Path
+import pickle
+from typing import TYPE_CHECKING
+
+from .header import Header
+from .log import Logger
+from .tokenizer import Token, Tokenizer
+from ..config import VERSION
+
+if TYPE_CHECKING:
+    from ..terminal import Configuration
+
+logger = Logger(__name__)
+
+CACHE_FOLDER_NAME = ".jmc_cache"
+CACHE_INDEX_FILE_NAME = "index.json"
+CACHE_PROTOCOL = 3
+"""Version of cache layout, bump to invalidate every existing cache"""
+
+
+def header_fingerprint(config: "Configuration", envs: list[str]) -> str:
+    """
+    Make a fingerprint of everything from header that can change the tokens of a file
+
+    - Content of every header file that was read (`.hjmc` and `#include`)
+    - Name and argument count of every macro
+    - Environment variables and pack_format
+
+    :param config: JMC configuration
+    :param envs: Environment variables given before header was parsed (header.envs is consumed by `#env`)
+    :return: Hex digest of the fingerprint
+    """
+    header = Header()
+    hasher = sha256()
+    hasher.update(f"{VERSION}\0{CACHE_PROTOCOL}\0{config.pack_format}\0".encode())
+    for env in sorted(envs):
+        hasher.update(f"env\0{env}\0".encode())
+    for name, (_, arg_count) in sorted(header.macros.items()):
+        hasher.update(f"macro\0{name}\0{arg_count}\0".encode())
+    for name, value in sorted(header.number_macros.items()):
+        hasher.update(f"number_macro\0{name}\0{value}\0".encode())
+    for file_read in sorted(header.file_read):
+        hasher.update(f"file\0{file_read}\0".encode())
+        try:
+            hasher.update(Path(file_read).read_bytes())
+        except OSError:
+            hasher.update(b"\0missing\0")
+    return hasher.hexdigest()
+
+
+class CompileCache:
+    """
+    Persistent on-disk cache of tokenized JMC files
+
+    An entry is keyed on file path, content hash and header fingerprint.
+    Along with tokens, the cache also keeps the import set of each file so the dependency graph of the previous compilation can be rebuilt without parsing.
+
+    :param folder: Folder to store cache files in
+    :param fingerprint: Header fingerprint, see `header_fingerprint`
+    :param memory: Pickled entries kept in memory from the previous compilation (`touched` of the previous cache) to look up before reading disk, defaults to None
+    """
+
+    __slots__ = ("folder", "fingerprint", "imports", "hits", "misses", "memory", "touched")
+
+    folder: Path
+    """Folder containing cache files"""
+    fingerprint: str
+    """Header fingerprint of current compilation"""
+    imports: dict[str, list[str]]
+    """Dictionary of file path and list of file paths it imports"""
+    hits: int
+    """Amount of files loaded from cache"""
+    misses: int
+    """Amount of files that had to be tokenized"""
+    memory: dict[str, bytes]
+    """Dictionary of entry key and pickled programs to look up before reading disk"""
+    touched: dict[str, bytes]
+    """Dictionary of entry key and pickled programs of every entry used in this compilation"""
+
+    def __init__(
+        self, folder: Path, fingerprint: str, memory: dict[str, bytes] | None = None
+    ) -> None:
+        self.folder = folder
+        self.fingerprint = fingerprint
+        self.imports = {}
+        self.hits = 0
+        self.misses = 0
+        self.memory = memory if memory is not None else {}
+        self.touched = {}
+
+    @classmethod
+    def from_config(
+        cls,
+        config: "Configuration",
+        envs: list[str],
+        memory: dict[str, bytes] | None = None,
+    ) -> "CompileCache":
+        """
+        Create cache for a configuration, must be called after header is read
+
+        :param config: JMC configuration
+        :param envs: Environment variables given before header was parsed
+        :param memory: Pickled entries kept in memory from the previous compilation, defaults to None
+        :return: CompileCache
+        """
+        return cls(
+            config.target.parent / CACHE_FOLDER_NAME,
+            header_fingerprint(config, envs),
+            memory,
+        )
+
+    def __key(self, file_path_str: str, raw_string: str) -> str:
+        hasher = sha256()
+        hasher.update(self.fingerprint.encode())
+        hasher.update(b"\0")
+        hasher.update(file_path_str.encode())
+        hasher.update(b"\0")
+        hasher.update(raw_string.encode())
+        return hasher.hexdigest()
+
+    def __entry_path(self, key: str) -> Path:
+        return self.folder / key[:2] / (key[2:] + ".pickle")
+
+    def get_programs(
+        self, file_path_str: str, raw_string: str
+    ) -> list[list[Token]] | None:
+        """
+        Get cached programs of a file
+
+        :param file_path_str: Resolved path of the file
+        :param raw_string: Content of the file
+        :return: List of programs(list of tokens), None if cache missed
+        """
+        key = self.__key(file_path_str, raw_string)
+        try:
+            if key in self.memory:
+                data = self.memory[key]
+            else:
+                data = self.__entry_path(key).read_bytes()
+            programs: list[list[Token]] = pickle.loads(data)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            self.misses += 1
+            return None
+        logger.debug(f"Cache hit: {file_path_str}")
+        self.touched[key] = data
+        self.hits += 1
+        return programs
+
+    def set_programs(
+        self, file_path_str: str, raw_string: str, programs: list[list[Token]]
+    ) -> None:
+        """
+        Store programs of a file into cache, failing silently
+
+        :param file_path_str: Resolved path of the file
+        :param raw_string: Content of the file
+        :param programs: List of programs(list of tokens) from tokenizer
+        """
+        key = self.__key(file_path_str, raw_string)
+        path = self.__entry_path(key)
+        try:
+            data = pickle.dumps(programs, protocol=pickle.HIGHEST_PROTOCOL)
+            self.touched[key] = data
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("wb") as file:
+                file.write(data)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as error:
+            logger.debug(f"Unable to cache {file_path_str}: {error!r}")
+
+    def tokenize(self, raw_string: str, file_path_str: str) -> Tokenizer:
+        """
+        Get a tokenizer of a file, tokenizing only when cache missed
+
+        :param raw_string: Content of the file
+        :param file_path_str: Resolved path of the file
+        :return: Tokenizer
+        """
+        programs = self.get_programs(file_path_str, raw_string)
+        if programs is not None:
+            return Tokenizer.from_programs(programs, raw_string, file_path_str)
+        tokenizer = Tokenizer(raw_string, file_path_str)
+        self.set_programs(file_path_str, raw_string, tokenizer.programs)
+        return tokenizer
+
+    def add_import(self, file_path_str: str, imported_path_str: str) -> None:
+        """
+        Record that a file imports another file
+
+        :param file_path_str: Path of the importing file
+        :param imported_path_str: Path of the imported file
+        """
+        self.imports.setdefault(file_path_str, []).append(imported_path_str)
+
+    def read_index(self) -> dict[str, list[str]]:
+        """
+        Read import graph of the previous compilation
+
+        :return: Dictionary of file path and list of file paths it imports
+        """
+        try:
+            index = loads(
+                (self.folder / CACHE_INDEX_FILE_NAME).read_text(encoding="utf-8")
+            )
+            return index["imports"]
+        except (OSError, JSONDecodeError, KeyError, TypeError):
+            return {}
+
+    def save_index(self) -> None:
+        """
+        Write import graph of current compilation, failing silently
+        """
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            (self.folder / CACHE_INDEX_FILE_NAME).write_text(
+                dumps(
+                    {"fingerprint": self.fingerprint, "imports": self.imports},
+                    indent=4,
+                ),
+                encoding="utf-8",
+            )
+        except OSError as error:
+            logger.debug(f"Unable to save cache index: {error!r}")
+        logger.info(f"Compile cache: {self.hits} hit(s), {self.misses} miss(es)")
@@ -213,76 +213,120 @@ def do(
 
 
 SWITCH_CASE_NAME = "switch_case"
+SWITCH_MACRO_COST = 4
+"""Estimated extra cost (in commands) of calling a function macro, as it's instantiated on every call"""
+
+
+def __match_range(min_: int | None, max_: int | None) -> str:
+    if min_ is not None and min_ == max_:
+        return str(min_)
+    return f"{'' if min_ is None else min_}..{'' if max_ is None else max_}"
 
 
 def __parse_switch_binary(
-    min_: int,
-    max_: int,
+    labels: list[int],
+    min_: int | None,
+    max_: int | None,
     count: str,
     datapack: DataPack,
-    func_contents: list[list[str]],
+    cases: dict[int, list[str]],
     scoreboard_player: ScoreboardPlayer,
     name: str,
-    start_at: int = 1,
+    default_call: str | None = None,
 ) -> None:
     """
-    For recursion of JMC switch-case's binary tree
+    For recursion of JMC switch-case's binary tree over case labels
 
-    :param min_: Minimum integer to trigger minecraft function
-    :param max_: Maximum integer to trigger minecraft function
+    :param labels: Sorted case labels of this subtree
+    :param min_: Minimum integer that can reach this subtree, None for unbounded
+    :param max_: Maximum integer that can reach this subtree, None for unbounded
     :param count: Private function count for creating name of private function
     :param datapack: Datapack object
-    :param func_contents: List of function content(List of commands(string)) given by user
+    :param cases: Dictionary of case label and its function content(List of commands(string))
     :param scoreboard_player: Minecraft scoreboard objective to check the integer
     :param name: Private function's group name
-    :raises ValueError: min_ is more than max_
+    :param default_call: Function call of default case, None if there's no default case
     """
-    if max_ < min_:
-        raise ValueError("min_ is more than max_ in __parse_switch_binary")
-    if max_ == min_:
-        datapack.add_raw_private_function(name, func_contents[min_ - start_at], count)
-    else:
-        count_less = datapack.get_count(name)
-        count_more = datapack.get_count(name)
-
-        half2 = min_ + (max_ - min_ + 1) // 2
-        half1 = half2 - 1
-
-        match_less = f"{min_}..{half1}" if min_ != half1 else min_
-        match_more = f"{half2}..{max_}" if half2 != max_ else max_
-
-        if isinstance(scoreboard_player.value, int):
-            raise ValueError("scoreboard_player.value is int")
-
+    if isinstance(scoreboard_player.value, int):
+        raise ValueError("scoreboard_player.value is int")
+    score = f"{scoreboard_player.value[1]} {scoreboard_player.value[0]}"
+    if not labels:
+        datapack.add_raw_private_function(
+            name, [default_call] if default_call is not None else [], count
+        )
+        return
+    if len(labels) == 1:
+        label = labels[0]
+        if min_ == max_ == label or default_call is None:
+            datapack.add_raw_private_function(name, cases[label], count)
+            return
         datapack.add_raw_private_function(
             name,
             [
-                f"execute if score {scoreboard_player.value[1]} {scoreboard_player.value[0]} matches {match_less} run function {datapack.namespace}:{DataPack.private_name}/{name}/{count_less}",
-                f"execute if score {scoreboard_player.value[1]} {scoreboard_player.value[0]} matches {match_more} run function {datapack.namespace}:{DataPack.private_name}/{name}/{count_more}",
+                f"execute if score {score} matches {label} run {datapack.add_raw_private_function(name, cases[label])}",
+                f"execute unless score {score} matches {label} run {default_call}",
             ],
             count,
         )
+        return
 
-        __parse_switch_binary(
-            min_,
-            half1,
-            count_less,
-            datapack,
-            func_contents,
-            scoreboard_player,
-            name,
-            start_at,
-        )
-        __parse_switch_binary(
-            half2,
-            max_,
-            count_more,
-            datapack,
-            func_contents,
-            scoreboard_player,
-            name,
-            start_at,
-        )
+    count_less = datapack.get_count(name)
+    count_more = datapack.get_count(name)
+    half = len(labels) // 2
+    half1 = labels[half - 1]
+    half2 = labels[half] if default_call is None else half1 + 1
+
+    datapack.add_raw_private_function(
+        name,
+        [
+            f"execute if score {score} matches {__match_range(min_, half1)} run function {datapack.namespace}:{DataPack.private_name}/{name}/{count_less}",
+            f"execute if score {score} matches {__match_range(half2, max_)} run function {datapack.namespace}:{DataPack.private_name}/{name}/{count_more}",
+        ],
+        count,
+    )
+
+    __parse_switch_binary(
+        labels[:half],
+        min_,
+        half1,
+        count_less,
+        datapack,
+        cases,
+        scoreboard_player,
+        name,
+        default_call,
+    )
+    __parse_switch_binary(
+        labels[half:],
+        half2,
+        max_,
+        count_more,
+        datapack,
+        cases,
+        scoreboard_player,
+        name,
+        default_call,
+    )
+
+
+def switch_costs(
+    case_count: int, has_default: bool, datapack: DataPack
+) -> dict[str, int]:
+    """
+    Estimate amount of commands run per dispatch of each available switch lowering
+
+    :param case_count: Amount of (non-default) cases
+    :param has_default: Whether there's a default case
+    :param datapack: Datapack object
+    :return: Dictionary of lowering strategy ("flat", "bst", "macro") and its estimated cost
+    """
+    costs = {
+        "flat": 2 + case_count + has_default,
+        "bst": 2 + 2 * max(case_count - 1, 0).bit_length() + has_default,
+    }
+    if datapack.version >= PackVersionFeature.VANILLA_MACRO:
+        costs["macro"] = 3 + SWITCH_MACRO_COST + 3 * has_default
+    return costs
 
 
 def parse_switch(
@@ -295,21 +339,38 @@ def parse_switch(
     with_str: str | None = None,
 ) -> str:
     """
-    Create a binary tree for JMC switch-case
+    Create a dispatch (macro, binary tree or flat chain) for JMC switch-case
+
+    Without `#optimize`, vanilla macro is used when available (and not `#forcebst`), otherwise binary tree.
+    With `#optimize`, the cheapest lowering according to `switch_costs` is used.
+    With `with_str`, vanilla macro is always used when available.
 
     :param scoreboard_player: Minecraft scoreboard objective to check the integer
     :param func_contents: List of function content(List of commands(string)) given by user
     :param datapack: Datapack object
     :param name: Private function's group name, defaults to SWITCH_CASE_NAME
     :param case_numbers: List of case numbers provided (only matters with post-1.20.2 switch)
+    :param with_str: Argument of `with` to pass to the case functions, defaults to None
     :return: Minecraft function call to initiate switch case
     """
     assert not isinstance(scoreboard_player.value, int)
     if case_numbers is None:
-        case_numbers = [*range(1, len(func_contents) + 1)]
+        case_numbers = [*range(start_at, len(func_contents) + start_at)]
+    has_default = "default" in case_numbers
+    costs = switch_costs(len(func_contents) - has_default, has_default, datapack)
+    if with_str is not None and "macro" in costs:
+        # Only macro lowering passes `with` arguments to the case functions
+        strategy = "macro"
+    elif Header().force_bst:
+        strategy = "bst"
+    elif Header().is_optimize:
+        strategy = min(costs, key=lambda strategy: costs[strategy])
+    else:
+        strategy = "macro" if "macro" in costs else "bst"
+    Header().add_build_stat(f"switch_{strategy}")
+
     func_count = datapack.get_count(name)
-    if datapack.version >= PackVersionFeature.VANILLA_MACRO and not Header().force_bst:
-        has_default = "default" in case_numbers
+    if strategy == "macro":
         for case_body, case_label in zip(func_contents, case_numbers):
             if has_default and case_label != "default":
                 case_body.append(
@@ -347,16 +408,43 @@ def parse_switch(
     temp_score = ScoreboardPlayer(
         player_type=PlayerType.SCOREBOARD, value=(datapack.var_name, switch_id)
     )
-    __parse_switch_binary(
-        start_at,
-        len(func_contents) + start_at - 1,
-        func_count,
-        datapack,
-        func_contents,
-        temp_score,
-        name,
-        start_at,
-    )
+    cases: dict[int, list[str]] = {}
+    default_call: str | None = None
+    for case_body, case_label in zip(func_contents, case_numbers):
+        if case_label == "default":
+            default_call = datapack.add_raw_private_function(name, case_body)
+        else:
+            cases[case_label] = case_body
+    labels = sorted(cases)
+
+    if strategy == "flat":
+        commands = [
+            f"execute if score {switch_id} {datapack.var_name} matches {label} run {datapack.add_raw_private_function(name, cases[label])}"
+            for label in labels
+        ]
+        if default_call is not None:
+            commands.append(
+                f"execute {' '.join(f'unless score {switch_id} {datapack.var_name} matches {label}' for label in labels)} run {default_call}"
+                if labels
+                else default_call
+            )
+        datapack.add_raw_private_function(name, commands, func_count)
+    else:
+        if default_call is None:
+            min_, max_ = labels[0], labels[-1]
+        else:
+            min_, max_ = None, None
+        __parse_switch_binary(
+            labels,
+            min_,
+            max_,
+            func_count,
+            datapack,
+            cases,
+            temp_score,
+            name,
+            default_call,
+        )
     return (
         f"scoreboard players operation {switch_id} {datapack.var_name} = {scoreboard_player.value[1]} {scoreboard_player.value[0]}\n"
         + datapack.call_func(name, func_count)
@@ -1,6 +1,117 @@
-from . import load_only
-from . import load_once
-from . import jmc_command
-from . import bool_function
-from . import _var_operation
-from . import execute_excluded
+"""
+Package containing JMCFunction subclasses of every built-in JMC function
+
+Modules are imported lazily, only when one of their functions is first used (see `JMCFunction.get_subclasses`).
+Every function must be listed in `BUILTIN_FUNCTIONS`, which is checked by `tests.unit.test_builtin_function`.
+"""
+
+BUILTIN_FUNCTIONS: dict[str, dict[str, str]] = {
+    "BOOL_FUNCTION": {
+        "Timer.isOver": "bool_function:TimerIsOver",
+        "String.isEqual": "bool_function:StringIsEqual",
+        "Object.isEqual": "bool_function:ObjectIsEqual",
+    },
+    "EXECUTE_EXCLUDED": {
+        "Hardcode.repeat": "execute_excluded:HardcodeRepeat",
+        "Hardcode.repeatList": "execute_excluded:HardcodeRepeatList",
+        "Hardcode.repeatLists": "execute_excluded:HardcodeRepeatLists",
+        "Hardcode.switch": "execute_excluded:HardcodeSwitch",
+        "Raycast.simple": "execute_excluded:RaycastSimple",
+    },
+    "JMC_COMMAND": {
+        "Timer.set": "jmc_command:TimerSet",
+        "Item.clear": "jmc_command:ItemClear",
+        "Item.give": "jmc_command:ItemGive",
+        "Item.summon": "jmc_command:ItemSummon",
+        "Item.replaceBlock": "jmc_command:ItemReplaceBlock",
+        "Item.replaceEntity": "jmc_command:ItemReplaceEntity",
+        "JMC.call": "jmc_command:JMCCall",
+        "JMC.log": "jmc_command:JMCLog",
+        "JMC.logAny": "jmc_command:JMCLogAny",
+        "JMC.todo": "jmc_command:JMCTodo",
+        "JMC.put": "jmc_command:JMCPut",
+        "Text.tellraw": "jmc_command:TextTellraw",
+        "printf": "jmc_command:Printf",
+        "print": "jmc_command:Print",
+        "Text.title": "jmc_command:TextTitle",
+        "Text.subtitle": "jmc_command:TextSubtitle",
+        "Text.actionbar": "jmc_command:TextActionbar",
+        "Particle.circle": "jmc_command:ParticleCircle",
+        "Particle.sphere": "jmc_command:ParticleSphere",
+        "Particle.square": "jmc_command:ParticleSquare",
+        "Particle.cube": "jmc_command:ParticleCube",
+        "Particle.spiral": "jmc_command:ParticleSpiral",
+        "Particle.helix": "jmc_command:ParticleHelix",
+        "Particle.cylinder": "jmc_command:ParticleCylinder",
+        "Particle.line": "jmc_command:ParticleLine",
+        "Scoreboard.add": "jmc_command:ScoreboardAdd",
+        "Team.prefix": "jmc_command:TeamPrefix",
+        "Team.suffix": "jmc_command:TeamSuffix",
+        "Bossbar.add": "jmc_command:BossbarAdd",
+        "Bossbar.setName": "jmc_command:BossbarSetName",
+        "GUI.run": "jmc_command:GUIRun",
+        "Advancement.revoke": "jmc_command:AdvancementRevoke",
+        "Advancement.grant": "jmc_command:AdvancementGrant",
+        "Entity.launch": "jmc_command:EntityLaunch",
+        "JMC.pythonFile": "jmc_command:JMCPythonFile",
+        "JMC.python": "jmc_command:JMCPython",
+        "Array.forEach": "jmc_command:ArrayForEach",
+        "Tag.update": "execute_excluded:TagUpdate",
+    },
+    "LOAD_ONCE": {
+        "Player.firstJoin": "load_once:PlayerFirstJoin",
+        "Player.join": "load_once:PlayerJoin",
+        "Player.rejoin": "load_once:PlayerRejoin",
+        "Player.die": "load_once:PlayerDie",
+        "JMC.packMeta": "load_once:JMCPackMeta",
+    },
+    "LOAD_ONLY": {
+        "Predicate.locations": "load_only:PredicateLocations",
+        "RightClick.setup": "load_only:RightClickSetup",
+        "Item.create": "load_only:ItemCreate",
+        "Item.createUse": "load_only:ItemCreateUse",
+        "Item.createSpawnEgg": "load_only:ItemCreateSpawnEgg",
+        "Item.createSign": "load_only:ItemCreateSign",
+        "Player.onEvent": "load_only:PlayerOnEvent",
+        "Trigger.setup": "load_only:TriggerSetup",
+        "Trigger.add": "load_only:TriggerAdd",
+        "Timer.add": "load_only:TimerAdd",
+        "Recipe.table": "load_only:RecipeTable",
+        "GUI.template": "load_only:GUITemplate",
+        "GUI.registers": "load_only:GUIRegisters",
+        "GUI.register": "load_only:GUIRegister",
+        "GUI.create": "load_only:GUICreate",
+        "Team.add": "load_only:TeamAdd",
+        "TextProp.clickCommand": "load_only:TextPropClickCommand",
+        "TextProps.clickCommand": "load_only:TextPropsClickCommand",
+        "TextProp.suggestCommand": "load_only:TextPropSuggestCommand",
+        "TextProps.suggestCommand": "load_only:TextPropsSuggestCommand",
+        "TextProp.clickURL": "load_only:TextPropClickURL",
+        "TextProps.clickURL": "load_only:TextPropsClickURL",
+        "TextProp.clickPage": "load_only:TextPropClickPage",
+        "TextProps.clickPage": "load_only:TextPropsClickPage",
+        "TextProp.clipboard": "load_only:TextPropClipboard",
+        "TextProps.clipboard": "load_only:TextPropsClipboard",
+        "TextProp.hoverText": "load_only:TextPropHoverText",
+        "TextProps.hoverText": "load_only:TextPropsHoverText",
+        "TextProp.hoverItem": "load_only:TextPropHoverItem",
+        "TextProps.hoverItem": "load_only:TextPropsHoverItem",
+        "TextProp.hoverEntity": "load_only:TextPropHoverEntity",
+        "TextProps.hoverEntity": "load_only:TextPropsHoverEntity",
+        "TextProp.font": "load_only:TextPropFont",
+        "TextProps.font": "load_only:TextPropsFont",
+        "TextProp.keybind": "load_only:TextPropKeybind",
+        "TextProps.keybind": "load_only:TextPropsKeybind",
+        "TextProp.nbt": "load_only:TextPropNBT",
+        "TextProps.nbt": "load_only:TextPropsNBT",
+        "Debug.watch": "load_only:DebugWatch",
+        "Debug.history": "load_only:DebugHistory",
+        "Debug.trackFunction": "load_only:DebugTrackFunction",
+        "JMC.require": "load_only:JMCRequire",
+    },
+    "VARIABLE_OPERATION": {
+        "Math.sqrt": "_var_operation:MathSqrt",
+        "Math.random": "_var_operation:MathRandom",
+    },
+}
+"""Dictionary of function type name and according dictionary of function call string and `<module>:<class>`"""
@@ -13,6 +13,7 @@ from ...exception import (
     JMCValueError,
     relative_file_name,
 )
+from ...header import Header
 from ...hooks import emit_message
 from ..utils import ArgType, NumberType, find_scoreboard_player_type
 from ..jmc_function import JMCFunction, FuncType, func_property
@@ -1369,6 +1370,7 @@ class JMCPythonFile(JMCFunction):
                 new_path = Path(
                     (file_path.parent / (self.args["pythonFile"] + ".py")).resolve()
                 )
+            Header().source_files.add(new_path)
             with new_path.open("r") as file:
                 python_code = file.read()
 
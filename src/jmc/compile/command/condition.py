@@ -1,6 +1,7 @@
 """Module for parsing conditions (statements that return boolean), called from command/_flow_control.py and lexer.py"""
 
 from dataclasses import dataclass, field
+import re
 from sys import prefix
 from typing import TYPE_CHECKING, Union, cast
 
@@ -9,6 +10,7 @@ from ...compile.utils import is_number
 from ..tokenizer import TokenType, Tokenizer, Token
 from ..exception import JMCSyntaxException, JMCValueError
 from ..datapack import DataPack
+from ..pack_version import PackVersionFeature
 from .utils import (
     find_scoreboard_player_type,
     PlayerType,
@@ -29,6 +31,9 @@ IF = True
 UNLESS = False
 
 VAR = "__logic__"
+CONDITION_FUNCTION_NAME = "condition"
+"""Private function group of conditions lowered into `execute if function`"""
+SCORE_MATCHES_REGEX = re.compile(r"^score (.+) matches (-?\d*)(\.\.)?(-?\d*)$")
 BOOL_FUNCTIONS = JMCFunction.get_subclasses(FuncType.BOOL_FUNCTION)
 # The uglist hack ever written by mankind
 # `lexer_func_content`` will fill this list with the class after it finishes
@@ -457,6 +462,209 @@ def negate_ast(ast: AST_TYPE) -> AST_TYPE:
     raise ValueError("Invalid AST")
 
 
+def __ast_key(ast: AST_TYPE) -> tuple | None:
+    """Get hashable key of an AST for deduplication, None if it has pre-commands (which can't be skipped)"""
+    if isinstance(ast, Condition):
+        if ast.pre_commands:
+            return None
+        return (ast.string, ast.if_unless)
+    body = ast["body"]
+    if isinstance(body, list):
+        keys = tuple(__ast_key(inner_ast) for inner_ast in body)
+        if None in keys:
+            return None
+        return (ast["operator"], keys)
+    key = __ast_key(cast(AST_TYPE, body))
+    if key is None:
+        return None
+    return (ast["operator"], key)
+
+
+def __parse_range(condition: Condition) -> tuple[str, int | None, int | None] | None:
+    """Get score holder and range of a plain `if score ... matches ...` condition"""
+    if condition.if_unless != IF or condition.pre_commands:
+        return None
+    match = SCORE_MATCHES_REGEX.match(condition.string)
+    if match is None:
+        return None
+    holder, first, dot_dot, second = match.groups()
+    if dot_dot is None:
+        if not first or second:
+            return None
+        return holder, int(first), int(first)
+    return holder, int(first) if first else None, int(second) if second else None
+
+
+def __range_condition(holder: str, first: int | None, second: int | None) -> Condition:
+    if first is not None and first == second:
+        return Condition(f"score {holder} matches {first}", IF)
+    if first is None and second is None:
+        first = -(2**31)
+    return Condition(
+        f"score {holder} matches {'' if first is None else first}..{'' if second is None else second}",
+        IF,
+    )
+
+
+def __merge_ranges(body: list[AST_TYPE], is_union: bool) -> list[AST_TYPE]:
+    """Merge range checks of the same score holder (union for OR, intersection for AND)"""
+    ranges: dict[str, list[tuple[int, int | None, int | None]]] = {}
+    for index, inner_ast in enumerate(body):
+        if not isinstance(inner_ast, Condition):
+            continue
+        parsed = __parse_range(inner_ast)
+        if parsed is not None:
+            ranges.setdefault(parsed[0], []).append((index, parsed[1], parsed[2]))
+
+    replacements: dict[int, list[Condition]] = {}
+    removed: set[int] = set()
+    for holder, holder_ranges in ranges.items():
+        if len(holder_ranges) < 2:
+            continue
+        if is_union:
+            merged: list[tuple[int | None, int | None]] = []
+            for _, first, second in sorted(
+                holder_ranges,
+                key=lambda x: -(2**63) if x[1] is None else x[1],
+            ):
+                if merged:
+                    last_first, last_second = merged[-1]
+                    if last_second is None or first is None or first <= last_second + 1:
+                        if last_second is not None and (second is None or second > last_second):
+                            merged[-1] = (last_first, second)
+                        continue
+                merged.append((first, second))
+            if len(merged) == len(holder_ranges):
+                continue
+            conditions = [__range_condition(holder, first, second) for first, second in merged]
+        else:
+            firsts = [first for _, first, _ in holder_ranges if first is not None]
+            seconds = [second for _, _, second in holder_ranges if second is not None]
+            first = max(firsts) if firsts else None
+            second = min(seconds) if seconds else None
+            if first is not None and second is not None and first > second:
+                continue
+            conditions = [__range_condition(holder, first, second)]
+        replacements[holder_ranges[0][0]] = conditions
+        removed.update(index for index, _, _ in holder_ranges[1:])
+
+    if not replacements:
+        return body
+    new_body: list[AST_TYPE] = []
+    for index, inner_ast in enumerate(body):
+        if index in replacements:
+            new_body.extend(replacements[index])
+        elif index not in removed:
+            new_body.append(inner_ast)
+    return new_body
+
+
+def __lower_to_function(
+    branches: list[AST_TYPE], if_unless: bool, datapack: DataPack
+) -> Condition | None:
+    """
+    Lower OR of branches (or NOT of a single AND branch) into `execute if function`
+
+    Lowering is unconditional whenever it's possible: a logic variable resets and checks every branch (1 + n commands) while the function stops at the first branch that passes (at most 1 + n), so it's never more expensive
+
+    :return: Condition calling the function, None if it can't be lowered
+    """
+    if datapack.version < PackVersionFeature.EXECUTE_IF_FUNCTION:
+        return None
+    commands: list[str] = []
+    for branch in branches:
+        if isinstance(branch, Condition):
+            conditions = [branch]
+        elif branch["operator"] == AND_OPERATOR and all(
+            isinstance(inner_ast, Condition)
+            for inner_ast in cast(list[AST_TYPE], branch["body"])
+        ):
+            conditions = cast(list[Condition], branch["body"])
+        else:
+            return None
+        if any(condition.pre_commands for condition in conditions):
+            return None
+        commands.append(f"execute {merge_condition(conditions)[0]} run return 1")
+
+    count = datapack.get_count(CONDITION_FUNCTION_NAME)
+    datapack.add_raw_private_function(CONDITION_FUNCTION_NAME, commands, count)
+    return Condition(
+        f"function {datapack.namespace}:{datapack.private_name}/{CONDITION_FUNCTION_NAME}/{count}",
+        if_unless,
+    )
+
+
+def __simplify_ast(ast: AST_TYPE) -> AST_TYPE:
+    if isinstance(ast, Condition):
+        return ast
+    operator = ast["operator"]
+    if operator == NOT_OPERATOR:
+        body = __simplify_ast(cast(AST_TYPE, ast["body"]))
+        if isinstance(body, Condition):
+            body.reverse()
+            return body
+        if body["operator"] == NOT_OPERATOR:
+            return cast(AST_TYPE, body["body"])
+        if body["operator"] == OR_OPERATOR:
+            return __simplify_ast(negate_ast(body))
+        return {"operator": NOT_OPERATOR, "body": body}
+
+    body_: list[AST_TYPE] = []
+    keys: set[tuple] = set()
+    for inner_ast in cast(list[AST_TYPE], ast["body"]):
+        inner_ast = __simplify_ast(inner_ast)
+        if isinstance(inner_ast, dict) and inner_ast["operator"] == operator:
+            inner_asts = cast(list[AST_TYPE], inner_ast["body"])
+        else:
+            inner_asts = [inner_ast]
+        for flat_ast in inner_asts:
+            key = __ast_key(flat_ast)
+            if key is not None:
+                if key in keys:
+                    continue
+                keys.add(key)
+            body_.append(flat_ast)
+    body_ = __merge_ranges(body_, is_union=operator == OR_OPERATOR)
+    if len(body_) == 1:
+        return body_[0]
+    return {"operator": operator, "body": body_}
+
+
+def __lower_ast(ast: AST_TYPE, datapack: DataPack) -> AST_TYPE:
+    if isinstance(ast, Condition):
+        return ast
+    operator = ast["operator"]
+    if operator == NOT_OPERATOR:
+        body = __lower_ast(cast(AST_TYPE, ast["body"]), datapack)
+        lowered = __lower_to_function([body], UNLESS, datapack)
+        return lowered or {"operator": NOT_OPERATOR, "body": body}
+    body_ = [
+        __lower_ast(inner_ast, datapack)
+        for inner_ast in cast(list[AST_TYPE], ast["body"])
+    ]
+    if operator == OR_OPERATOR:
+        lowered = __lower_to_function(body_, IF, datapack)
+        if lowered is not None:
+            return lowered
+    return {"operator": operator, "body": body_}
+
+
+def optimize_ast(ast: AST_TYPE, datapack: DataPack) -> AST_TYPE:
+    """
+    Simplify abstract syntax tree before turning it into commands
+
+    - Flatten nested AND/OR and double NOT
+    - Remove duplicate siblings (so identical OR share the same logic variable)
+    - Merge range checks of the same score holder
+    - Lower OR and NOT of AND into `execute if function` when pack_format supports it
+
+    :param ast: Abstract syntax tree
+    :param datapack: Datapack object
+    :return: Optimized abstract syntax tree
+    """
+    return __lower_ast(__simplify_ast(ast), datapack)
+
+
 def ast_to_strings(ast: AST_TYPE, datapack: DataPack) -> tuple[str, str]:
     """
     Turns AST into tuple of full `execute if command` a multiple line string representing precommands
@@ -529,6 +737,8 @@ def parse_condition(
     tokens = condition_token if isinstance(condition_token, list) else [condition_token]
 
     ast = condition_to_ast(tokens, tokenizer, datapack, prefix)
+    if Header().is_optimize:
+        ast = optimize_ast(ast, datapack)
     condition, precommand = ast_to_strings(ast, datapack)
     precommand = precommand + "\n" if precommand else ""
     return condition, precommand
@@ -1,5 +1,6 @@
-from collections import defaultdict
 from enum import Enum, auto
+from functools import wraps
+from importlib import import_module
 from json import JSONDecodeError, loads
 from typing import TYPE_CHECKING, Any, Callable, TypeVar, cast
 
@@ -17,7 +18,9 @@ from .utils import (
 )
 from ..datapack import DataPack, Function
 from ..exception import JMCDecodeJSONError, JMCMissingValueError, JMCValueError
+from ..header import Header
 from ..tokenizer import Token, TokenType, Tokenizer
+from .builtin_function import BUILTIN_FUNCTIONS
 
 
 class FuncType(Enum):
@@ -35,6 +38,68 @@ class FuncType(Enum):
     """Returns a minecraft integer to a scoreboard variable"""
 
 
+class FunctionRegistry(dict[str, type["JMCFunction"]]):
+    """
+    Dictionary of function call string and JMCFunction subclass of a function type, importing built-in function modules lazily
+
+    Call strings of built-in functions are known from `BUILTIN_FUNCTIONS` without importing anything,
+    the module of a built-in function is only imported when its class is first looked up.
+
+    :param func_type: Function type of the registry
+    """
+
+    __slots__ = ("manifest",)
+
+    def __init__(self, func_type: FuncType) -> None:
+        super().__init__()
+        self.manifest = BUILTIN_FUNCTIONS.get(func_type.name, {})
+        """Dictionary of built-in function call string and `<module>:<class>`"""
+
+    def __missing__(self, call_string: str) -> type["JMCFunction"]:
+        if call_string not in self.manifest:
+            raise KeyError(call_string)
+        module_name, _ = self.manifest[call_string].split(":")
+        import_module(f"{__package__}.builtin_function.{module_name}")
+        if not dict.__contains__(self, call_string):
+            raise ImportError(
+                f"'{call_string}' is listed in BUILTIN_FUNCTIONS but module '{module_name}' doesn't define it"
+            )
+        return dict.__getitem__(self, call_string)
+
+    def get(self, call_string: str, default: Any = None) -> Any:  # type: ignore[override]
+        if call_string in self:
+            return self[call_string]
+        return default
+
+    def __contains__(self, call_string: object) -> bool:
+        return call_string in self.manifest or dict.__contains__(self, call_string)
+
+    def __iter__(self):
+        yield from self.manifest
+        for call_string in dict.__iter__(self):
+            if call_string not in self.manifest:
+                yield call_string
+
+    def __len__(self) -> int:
+        return len(self.manifest.keys() | dict.keys(self))
+
+    def keys(self):  # type: ignore[override]
+        return list(self)
+
+    def values(self):  # type: ignore[override]
+        return [self[call_string] for call_string in self]
+
+    def items(self):  # type: ignore[override]
+        return [(call_string, self[call_string]) for call_string in self]
+
+    def load_all(self) -> None:
+        """
+        Import every built-in function module of this function type
+        """
+        for call_string in self.manifest:
+            self[call_string]
+
+
 class JMCFunction:
     """
     Base function for all custom JMC function
@@ -112,7 +177,9 @@ class JMCFunction:
     arrow_func_args_params: dict[str, list[str]]
     """Dictionary containing parameter and parsed parameters (only valid for ARROW_FUNC type)"""
 
-    _subcls: dict[FuncType, dict[str, type["JMCFunction"]]] = defaultdict(dict)
+    _subcls: dict[FuncType, FunctionRegistry] = {
+        func_type: FunctionRegistry(func_type) for func_type in FuncType
+    }
     """:cvar: Dictionary of (Function type and according dictionary of funtion name and a subclass)"""
 
     prefix: str
@@ -270,9 +337,9 @@ class JMCFunction:
         raise NotImplementedError("Call(boolean) function not implemented")
 
     @classmethod
-    def get_subclasses(cls, func_type: FuncType) -> dict[str, type["JMCFunction"]]:
+    def get_subclasses(cls, func_type: FuncType) -> FunctionRegistry:
         """
-        Get dictionary of funtion name and a class matching function type
+        Get dictionary of funtion name and a class matching function type, built-in function modules are imported on first lookup
 
         :param func_type: Function type to search for
         :return: Dictionary of jmcfunction name and jmcfunction class
@@ -434,6 +501,26 @@ class JMCFunction:
 
 
 T = TypeVar("T", bound="JMCFunction")
+R = TypeVar("R")
+
+
+def _profiled(method: Callable[[T], R]) -> Callable[[T], R]:
+    """
+    Wrap call/call_bool of a JMCFunction so that it's recorded by the compile profiler (`call:<call_string>`)
+
+    :param method: call or call_bool method
+    :return: Wrapped method
+    """
+
+    @wraps(method)
+    def wrapper(self: T) -> R:
+        profiler = Header().profiler
+        if profiler is None:
+            return method(self)
+        with profiler.span(f"call:{self.call_string}"):
+            return method(self)
+
+    return wrapper
 
 
 def func_property(
@@ -485,6 +572,10 @@ def func_property(
         cls._ignore = ignore
         cls.name = name
 
+        for method_name in ("call", "call_bool"):
+            if method_name in cls.__dict__:
+                setattr(cls, method_name, _profiled(cls.__dict__[method_name]))
+
         # cls._decorated = True
         JMCFunction._subcls[func_type][call_string] = cls
         return cls
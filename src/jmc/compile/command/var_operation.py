@@ -6,14 +6,16 @@ from fractions import Fraction
 from ..expression_eval import (
     CommandNumber,
     Variable,
+    eliminate_common_subexpression,
     expression_to_tree,
     optimize_const,
+    optimize_operations,
     tokens_to_tokens,
     tree_to_operations,
 )
-from ..command.builtin_function.load_only import DebugWatch
 from .jmc_function import JMCFunction, FuncType
 from ..datapack import DataPack
+from ..header import Header
 from ..exception import JMCSyntaxException, relative_file_name
 from ..tokenizer import Token, TokenType, Tokenizer
 from .utils import (
@@ -31,6 +33,45 @@ VAR_OPERATION_COMMANDS = JMCFunction.get_subclasses(FuncType.VARIABLE_OPERATION)
 CASTING_TYPES = ("command", "const", "var", "score")
 
 
+def _debug_watch_wrapper(
+    return_command: str, player: str, objective: str, datapack: DataPack
+) -> str:
+    """
+    `DebugWatch.variable_operation_wrapper` that only imports `load_only` when the variable is being watched
+
+    :param return_command: Minecraft command of the variable operation
+    :param player: Scoreboard player being operated on
+    :param objective: Scoreboard objective being operated on
+    :param datapack: Datapack object
+    :return: Minecraft command
+    """
+    if (player, objective) not in datapack.data.watching:
+        return return_command
+    from .builtin_function.load_only import DebugWatch
+
+    return DebugWatch.variable_operation_wrapper(
+        return_command, player, objective, datapack
+    )
+
+
+def constant_operation(target: str, operator: str, number: int, datapack: DataPack) -> str:
+    """
+    Get command of a scoreboard operation against an integer constant, under `#optimize` avoiding `__int__` constant when the result doesn't depend on the score
+
+    :param target: Scoreboard player (`<selector> <objective>`)
+    :param operator: Scoreboard operation operator (`*=`, `/=`, `%=`, `<`, `>`)
+    :param number: Integer constant
+    :param datapack: Datapack object
+    :return: Minecraft command
+    """
+    if Header().is_optimize and (
+        (operator == "*=" and number == 0) or (operator == "%=" and number == 1)
+    ):
+        return f"scoreboard players set {target} 0"
+    datapack.add_int(number)
+    return f"scoreboard players operation {target} {operator} {number} {datapack.int_name}"
+
+
 def variable_operation(
     tokens: list[Token],
     tokenizer: Tokenizer,
@@ -54,7 +95,7 @@ def variable_operation(
     datapack.data.is_too_late_debug_watch = True
     datapack.data.last_code_data = (
         relative_file_name(tokenizer.file_path, tokens[0].line),
-        tokenizer.file_string.split("\n")[tokens[0].line - 1],
+        tokenizer.source.line(tokens[0].line),
     )
     is_token_obj_selector = False
     if tokens[0].string.startswith(DataPack.VARIABLE_SIGN):
@@ -175,14 +216,14 @@ Example: `$var = (const) $(my_int)`""",
 
     if vanilla_macro is not None and casting_type == "command":
         if operator == "=":
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"execute store result score {tokens[0].string} {objective_name} run {vanilla_macro.string}",
                 tokens[0].string,
                 objective_name,
                 datapack,
             )
         elif operator == "?=":
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"execute store result success {tokens[0].string} {objective_name} run {vanilla_macro.string}",
                 tokens[0].string,
                 objective_name,
@@ -201,13 +242,13 @@ Example: `$var = (const) $(my_int)`""",
             )
         if func_content[0].startswith("execute"):
             # len("execute ") = 8
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"execute store result score {tokens[0].string} {objective_name} {func_content[0][8:]}",
                 tokens[0].string,
                 objective_name,
                 datapack,
             )
-        return DebugWatch.variable_operation_wrapper(
+        return _debug_watch_wrapper(
             f"execute store result score {tokens[0].string} {objective_name} run {func_content[0]}",
             tokens[0].string,
             objective_name,
@@ -227,7 +268,7 @@ Example: `$var = (const) $(my_int)`""",
                 tokenizer,
                 suggestion="Probably missing semicolon.",
             )
-        return DebugWatch.variable_operation_wrapper(
+        return _debug_watch_wrapper(
             f"scoreboard players set {tokens[0].string} {objective_name} {'1' if tokens[2].string == 'true' else '0'}",
             tokens[0].string,
             objective_name,
@@ -248,14 +289,14 @@ Example: `$var = (const) $(my_int)`""",
                 suggestion="Probably missing semicolon.",
             )
         if tokens[2].string == "true":
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"execute unless score {tokens[0].string} {objective_name} = {tokens[0].string} {objective_name} run scoreboard players set {tokens[0].string} {objective_name} 1",
                 tokens[0].string,
                 objective_name,
                 datapack,
             )
         elif tokens[2].string == "false":
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"scoreboard players add {tokens[0].string} {objective_name} 0",
                 tokens[0].string,
                 objective_name,
@@ -279,13 +320,20 @@ Example: `$var = (const) $(my_int)`""",
         expression_tree = expression_to_tree(
             expression_tokens, tokenizer, datapack, prefix
         )
+        output = Variable(f"{tokens[0].string} {objective_name}", tokens[0])
+        if Header().is_optimize:
+            expression_tree = eliminate_common_subexpression(
+                expression_tree, output
+            )
         operations = tree_to_operations(
             expression_tree,
-            Variable(f"{tokens[0].string} {objective_name}", tokens[0]),
+            output,
             operator.lstrip(":").rstrip("="),
             tokenizer,
         )
         operations = optimize_const(operations)
+        if Header().is_optimize:
+            operations = optimize_operations(operations)
         expression_commands: list[str] = []
         for variable_, operator_, number_ in operations:
             if isinstance(number_, CommandNumber):
@@ -323,16 +371,16 @@ Example: `$var = (const) $(my_int)`""",
                     f"scoreboard players set {variable_.content} {number}"
                 )
             elif operator_.content == "%":
-                datapack.add_int(number)
                 expression_commands.append(
-                    f"scoreboard players operation {variable_.content} {operator_.content}= {number} {datapack.int_name}"
+                    constant_operation(variable_.content, "%=", number, datapack)
                 )
             elif operator_.content in "*/":
                 number_float = float(number_.content)
                 if number_float.is_integer():
-                    datapack.add_int(number)
                     expression_commands.append(
-                        f"scoreboard players operation {variable_.content} {operator_.content}= {number} {datapack.int_name}"
+                        constant_operation(
+                            variable_.content, f"{operator_.content}=", number, datapack
+                        )
                     )
                 else:
                     if operator_.content == "/":
@@ -340,18 +388,20 @@ Example: `$var = (const) $(my_int)`""",
                     fraction = Fraction(number_float).limit_denominator(1_000_000)
                     multiplier, divider = fraction.as_integer_ratio()
                     if multiplier != 1:
-                        datapack.add_int(multiplier)
                         expression_commands.append(
-                            f"scoreboard players operation {variable_.content} *= {multiplier} {datapack.int_name}"
+                            constant_operation(
+                                variable_.content, "*=", multiplier, datapack
+                            )
                         )
                     if divider != 1:
-                        datapack.add_int(divider)
                         expression_commands.append(
-                            f"scoreboard players operation {variable_.content} /= {divider} {datapack.int_name}"
+                            constant_operation(
+                                variable_.content, "/=", divider, datapack
+                            )
                         )
             else:
                 raise Exception("Somehow, there's an operator JMC doesn't know")
-        return DebugWatch.variable_operation_wrapper(
+        return _debug_watch_wrapper(
             "\n".join(expression_commands), tokens[0].string, objective_name, datapack
         )
 
@@ -363,14 +413,14 @@ Example: `$var = (const) $(my_int)`""",
                 tokenizer,
             )
         if operator == "++":
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"scoreboard players add {tokens[0].string} {objective_name} 1",
                 tokens[0].string,
                 objective_name,
                 datapack,
             )
         if operator == "--":
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"scoreboard players remove {tokens[0].string} {objective_name} 1",
                 tokens[0].string,
                 objective_name,
@@ -394,13 +444,13 @@ Example: `$var = (const) $(my_int)`""",
             )
         if func_content[0].startswith("execute"):
             # len("execute ") = 8
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"execute store success score {tokens[0].string} {objective_name} {func_content[0][8:]}",
                 tokens[0].string,
                 objective_name,
                 datapack,
             )
-        return DebugWatch.variable_operation_wrapper(
+        return _debug_watch_wrapper(
             f"execute store success score {tokens[0].string} {objective_name} run {func_content[0]}",
             tokens[0].string,
             objective_name,
@@ -493,7 +543,7 @@ Example: `$var = (const) $(my_int)`""",
                     tokens[2],
                     tokenizer,
                 )
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"""execute store result score {tokens[0].string} {objective_name} run {func[0]}""",
                 tokens[0].string,
                 objective_name,
@@ -512,7 +562,7 @@ Example: `$var = (const) $(my_int)`""",
         if vanilla_macro is None and len(tokens) > 3:
             if operator == "=":
                 try:
-                    return DebugWatch.variable_operation_wrapper(
+                    return _debug_watch_wrapper(
                         f"""execute store result score {left_token.string} {objective_name} run {variable_operation(old_tokens[2:] if old_tokens is not None else tokens[2:], tokenizer, datapack, is_execute, FuncContent, first_arguments, prefix)}""".replace(
                             "run execute store", "store"
                         ),
@@ -537,13 +587,13 @@ Example: `$var = (const) $(my_int)`""",
                             )
                         if func_content[0].startswith("execute"):
                             # len("execute ") = 8
-                            return DebugWatch.variable_operation_wrapper(
+                            return _debug_watch_wrapper(
                                 f"execute store result score {tokens[0].string} {objective_name} {func_content[0][8:]}",
                                 tokens[0].string,
                                 objective_name,
                                 datapack,
                             )
-                        return DebugWatch.variable_operation_wrapper(
+                        return _debug_watch_wrapper(
                             f"execute store result score {tokens[0].string} {objective_name} run {func_content[0]}",
                             tokens[0].string,
                             objective_name,
@@ -567,13 +617,13 @@ Example: `$var = (const) $(my_int)`""",
                     )
                 if func_content[0].startswith("execute"):
                     # len("execute ") = 8
-                    return DebugWatch.variable_operation_wrapper(
+                    return _debug_watch_wrapper(
                         f"execute unless score {tokens[0].string} {objective_name} = {tokens[0].string} {objective_name} store result score {tokens[0].string} {objective_name} {func_content[0][8:]}",
                         tokens[0].string,
                         objective_name,
                         datapack,
                     )
-                return DebugWatch.variable_operation_wrapper(
+                return _debug_watch_wrapper(
                     f"execute unless score {tokens[0].string} {objective_name} = {tokens[0].string} {objective_name} store result score {tokens[0].string} {objective_name} run {func_content[0]}",
                     tokens[0].string,
                     objective_name,
@@ -619,13 +669,13 @@ Example: `$var = (const) $(my_int)`""",
                     isinstance(scoreboard_player.value, int)
                     and scoreboard_player.value < 0
                 ):
-                    return DebugWatch.variable_operation_wrapper(
+                    return _debug_watch_wrapper(
                         f"scoreboard players remove {left_token.string} {objective_name} {scoreboard_player.value * -1}",
                         left_token.string,
                         objective_name,
                         datapack,
                     )
-                return DebugWatch.variable_operation_wrapper(
+                return _debug_watch_wrapper(
                     f"scoreboard players add {left_token.string} {objective_name} {scoreboard_player.value}",
                     left_token.string,
                     objective_name,
@@ -636,20 +686,20 @@ Example: `$var = (const) $(my_int)`""",
                     isinstance(scoreboard_player.value, int)
                     and scoreboard_player.value < 0
                 ):
-                    return DebugWatch.variable_operation_wrapper(
+                    return _debug_watch_wrapper(
                         f"scoreboard players add {left_token.string} {objective_name} {scoreboard_player.value * -1}",
                         left_token.string,
                         objective_name,
                         datapack,
                     )
-                return DebugWatch.variable_operation_wrapper(
+                return _debug_watch_wrapper(
                     f"scoreboard players remove {left_token.string} {objective_name} {scoreboard_player.value}",
                     left_token.string,
                     objective_name,
                     datapack,
                 )
             if operator == "=":
-                return DebugWatch.variable_operation_wrapper(
+                return _debug_watch_wrapper(
                     f"scoreboard players set {left_token.string} {objective_name} {scoreboard_player.value}",
                     left_token.string,
                     objective_name,
@@ -661,7 +711,7 @@ Example: `$var = (const) $(my_int)`""",
                         f"scoreboard players add {left_token.string} {objective_name} 0"
                     )
                 else:
-                    return DebugWatch.variable_operation_wrapper(
+                    return _debug_watch_wrapper(
                         f"execute unless score {left_token.string} {objective_name} = {left_token.string} {objective_name} run scoreboard players set {left_token.string} {objective_name} {scoreboard_player.value}",
                         left_token.string,
                         objective_name,
@@ -669,15 +719,19 @@ Example: `$var = (const) $(my_int)`""",
                     )
 
             if isinstance(scoreboard_player.value, int):
-                datapack.add_int(scoreboard_player.value)
-                return DebugWatch.variable_operation_wrapper(
-                    f"scoreboard players operation {left_token.string} {objective_name} {operator} {scoreboard_player.value} {DataPack.int_name}",
+                return _debug_watch_wrapper(
+                    constant_operation(
+                        f"{left_token.string} {objective_name}",
+                        operator,
+                        scoreboard_player.value,
+                        datapack,
+                    ),
                     left_token.string,
                     objective_name,
                     datapack,
                 )
             elif isinstance(scoreboard_player.value, str):
-                return DebugWatch.variable_operation_wrapper(
+                return _debug_watch_wrapper(
                     f"scoreboard players set __temp__ {DataPack.var_name} {scoreboard_player.value}\n"
                     f"scoreboard players operation {left_token.string} {objective_name} {operator} __temp__ {DataPack.var_name}",
                     left_token.string,
@@ -695,14 +749,14 @@ Example: `$var = (const) $(my_int)`""",
             raise NotImplementedError("Unreachable")
 
         if operator == "??=":
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"execute unless score {left_token.string} {objective_name} = {left_token.string} {objective_name} run scoreboard players operation {left_token.string} {objective_name} = {right_hand}",
                 left_token.string,
                 objective_name,
                 datapack,
             )
         else:
-            return DebugWatch.variable_operation_wrapper(
+            return _debug_watch_wrapper(
                 f"scoreboard players operation {left_token.string} {objective_name} {operator} {right_hand}",
                 left_token.string,
                 objective_name,
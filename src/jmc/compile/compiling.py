@@ -1,5 +1,6 @@
 """Module responsibile for all compiling in jmc"""
 
+from hashlib import sha256
 from json import JSONDecodeError, dump, dumps, loads
 import os.path
 from pathlib import Path
@@ -9,12 +10,18 @@ from typing import TYPE_CHECKING, Any
 from jmc.compile.utils import merge_dicts
 
 from .pack_version import PackVersionFeature
+from .context import CompileContext
 from .header import Header
 from .header_parse import parse_header
 from .lexer import Lexer
+from .cache import CompileCache
+from .function_profile import FunctionProfile
+from .parallel import pretokenize
+from .profiler import CompileProfiler, profile_span
 from .log import Logger
 from .datapack import DataPack
 from .exception import JMCBuildError
+from .output_sink import OutputSink, write_files
 
 import shutil
 
@@ -23,24 +30,69 @@ if TYPE_CHECKING:
 
 logger = Logger(__name__)
 JMC_CERT_FILE_NAME = "jmc.txt"
+JMC_MANIFEST_FILE_NAME = "jmc_manifest.json"
 
 
-def compile_jmc(config: "Configuration", debug: bool = False) -> None:
+def compile_jmc(
+    config: "Configuration",
+    debug: bool = False,
+    use_cache: bool = False,
+    sink: OutputSink | None = None,
+    jobs: int = 1,
+    function_profile: Path | None = None,
+    profile: Path | None = None,
+    context: CompileContext | None = None,
+) -> None:
     """
     Compile the files and build the datapack
 
     :param config: Configuration dictionary
     :param debug: Whether to debug into log, defaults to False
+    :param use_cache: Whether to reuse tokens of unchanged files from previous compilation, defaults to False
+    :param sink: Where to write the datapack to instead of the output folder (e.g. ZipSink), defaults to None
+    :param jobs: Amount of worker processes to tokenize files with, 1 to tokenize in the main process, defaults to 1
+    :param function_profile: Path to in-game profiling data for profile-guided optimization, defaults to None
+    :param profile: Path (without suffix) to write time and allocations of each compilation phase to, defaults to None
+    :param context: Compile context to compile in instead of the current one (for isolated compilations in the same process), defaults to None
     """
+    if context is not None:
+        with context.use():
+            compile_jmc(config, debug, use_cache, sink, jobs, function_profile, profile)
+        return
     logger.info("Configuration:\n" + dumps(config.toJSON(), indent=4))
     Header.clear()
-    read_header(config)
-    is_delete, cert_config, cert_file = read_cert(config)
-    logger.info("Parsing")
-    lexer = Lexer(config)
-    if debug:
-        logger.info(f"Datapack :{lexer.datapack!r}")
-    build(lexer.datapack, config, is_delete, cert_config, cert_file)
+    envs = Header().envs.copy()
+    profiler = CompileProfiler() if profile is not None else None
+    Header().profiler = profiler
+    try:
+        with profile_span("header"):
+            read_header(config)
+        if function_profile is not None:
+            Header().function_profile = FunctionProfile.from_file(function_profile)
+        if sink is None:
+            is_delete, cert_config, cert_file = read_cert(config)
+        else:
+            is_delete, cert_config, cert_file = (
+                False,
+                get_cert(),
+                Path(config.output) / "data" / config.namespace / JMC_CERT_FILE_NAME,
+            )
+        logger.info("Parsing")
+        cache = CompileCache.from_config(config, envs) if use_cache else None
+        if jobs > 1:
+            with profile_span("pretokenize"):
+                pretokenized = pretokenize(config, envs, jobs, cache)
+        else:
+            pretokenized = None
+        with profile_span("lex"):
+            lexer = Lexer(config, cache=cache, pretokenized=pretokenized)
+        if debug:
+            logger.info(f"Datapack :{lexer.datapack!r}")
+        build(lexer.datapack, config, is_delete, cert_config, cert_file, sink=sink)
+    finally:
+        if profile is not None and profiler is not None:
+            profiler.stop()
+            profiler.write(profile)
 
 
 def cert_config_to_string(cert_config: dict[str, str]) -> str:
@@ -258,6 +310,88 @@ def post_process(string: str) -> str:
     return string
 
 
+def read_manifest(path: Path) -> dict[str, str] | None:
+    """
+    Read output manifest
+
+    :param path: Path to manifest file
+    :return: Dictionary of file path (relative to output folder) and hash of its content, None if it doesn't exist or is invalid
+    """
+    if not path.is_file():
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as file:
+            manifest = loads(file.read())
+    except (OSError, JSONDecodeError):
+        return None
+    if not isinstance(manifest, dict):
+        return None
+    return manifest
+
+
+def hash_content(content: str) -> str:
+    """
+    Hash content of an output file for output manifest
+
+    :param content: File content
+    :return: Hex digest
+    """
+    return sha256(content.encode("utf-8")).hexdigest()
+
+
+def write_differential(
+    output: dict[Path, str],
+    output_folder: Path,
+    old_manifest: dict[str, str],
+    directory_exceptions: set[Path],
+) -> dict[str, str]:
+    """
+    Write only files that changed since the last build and delete only files from the last build that are no longer generated
+
+    :param output: Dictionary of file path and file content
+    :param output_folder: Root folder of the datapack
+    :param old_manifest: Output manifest of the last build
+    :param directory_exceptions: Set of directories that'll be excluded from deletion
+    :return: New output manifest
+    """
+    manifest: dict[str, str] = {}
+    changed: dict[Path, str] = {}
+    for path, content in output.items():
+        key = path.relative_to(output_folder).as_posix()
+        content_hash = hash_content(content)
+        manifest[key] = content_hash
+        if old_manifest.get(key) != content_hash or not path.is_file():
+            changed[path] = content
+    write_files(changed)
+
+    stale_folders: set[Path] = set()
+    for key in old_manifest.keys() - manifest.keys():
+        path = output_folder / key
+        if any(path.is_relative_to(exception) for exception in directory_exceptions):
+            continue
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as error:
+            raise JMCBuildError(
+                f"Something went wrong when deleting {path.as_posix()}, try deleting the namespace folder manually and try again."
+            ) from error
+        stale_folders.update(path.parents)
+    for folder in sorted(stale_folders, key=lambda path: len(path.parts), reverse=True):
+        if not folder.is_relative_to(output_folder) or folder == output_folder:
+            continue
+        try:
+            folder.rmdir()
+        except OSError:
+            continue
+
+    logger.info(
+        f"Differential write: {len(changed)} written, {len(output) - len(changed)} unchanged, {len(old_manifest.keys() - manifest.keys())} deleted"
+    )
+    return manifest
+
+
 def build(
     datapack: DataPack,
     config: "Configuration",
@@ -265,6 +399,8 @@ def build(
     cert_config: dict[str, str],
     cert_file: Path,
     _is_virtual: bool = False,
+    sink: OutputSink | None = None,
+    record_manifest: bool = False,
 ) -> dict[Path, str] | None:
     """
     Build and write files for minecraft datapack
@@ -272,6 +408,45 @@ def build(
     :param datapack: DataPack object
     :param config: JMC configuration
     :param _is_virtual: Whether to make a dictionary of output result instead of writing to files
+    :param sink: Where to write files to instead of the output folder (Output folder is left untouched), defaults to None
+    :param record_manifest: Whether to record output manifest into `Header().output_manifest` (Used by serve mode), defaults to False
+    :returns: Dictionary of file path and file content if _is_virtual is True
+    """
+    logger.debug(f"Building (_is_virtual={_is_virtual})")
+    with profile_span("build"):
+        datapack.build()
+    Header().finished_compiled_time = perf_counter()
+    with profile_span("write"):
+        return write_output(
+            datapack,
+            config,
+            is_delete,
+            cert_config,
+            cert_file,
+            _is_virtual,
+            sink,
+            record_manifest,
+        )
+
+
+def write_output(
+    datapack: DataPack,
+    config: "Configuration",
+    is_delete: bool,
+    cert_config: dict[str, str],
+    cert_file: Path,
+    _is_virtual: bool = False,
+    sink: OutputSink | None = None,
+    record_manifest: bool = False,
+) -> dict[Path, str] | None:
+    """
+    Write files of an already built datapack
+
+    :param datapack: DataPack object (after DataPack.build)
+    :param config: JMC configuration
+    :param _is_virtual: Whether to make a dictionary of output result instead of writing to files
+    :param sink: Where to write files to instead of the output folder (Output folder is left untouched), defaults to None
+    :param record_manifest: Whether to record output manifest into `Header().output_manifest` (Used by serve mode), defaults to False
     :returns: Dictionary of file path and file content if _is_virtual is True
     """
     output: dict[Path, str] = {}
@@ -282,21 +457,25 @@ def build(
     else:
         function_folder = "functions"
 
-    logger.debug(f"Building (_is_virtual={_is_virtual})")
-    datapack.build()
-    header.finished_compiled_time = perf_counter()
     output_folder = Path(config.output)
     namespace_folder = output_folder / "data" / config.namespace
     minecraft_folder = output_folder / "data" / "minecraft"
     overrides_folders = {
         output_folder / "data" / namespace for namespace in header.namespace_overrides
     }
+    manifest_file = cert_file.parent / JMC_MANIFEST_FILE_NAME
+    is_folder_output = not _is_virtual and sink is None
+    old_manifest = (
+        read_manifest(manifest_file)
+        if header.is_incremental_write and is_folder_output
+        else None
+    )
 
     functions_tags_folder = (
         output_folder / "data" / "minecraft" / "tags" / function_folder
     )
 
-    if is_delete:
+    if is_delete and is_folder_output and old_manifest is None:
         statics = header.statics
         for folder in {namespace_folder} | overrides_folders:
             if not os.path.isdir(folder):
@@ -318,7 +497,8 @@ def build(
                     "Something went wrong when deleting files, try deleting the namespace folder manually and try again."
                 ) from error
 
-    if not _is_virtual:
+    copied: dict[Path, str | bytes] = {}
+    if is_folder_output:
         make_cert(cert_config, cert_file)
         if header.copy is not None:
             for item in header.copy.iterdir():
@@ -326,32 +506,32 @@ def build(
                     shutil.copytree(item, output_folder / item.name, dirs_exist_ok=True)
                 else:
                     shutil.copy(item, output_folder / item.name)
+    elif sink is not None and header.copy is not None:
+        for item in header.copy.glob("**/*"):
+            if item.is_file():
+                copied[output_folder / item.relative_to(header.copy)] = (
+                    item.read_bytes()
+                )
 
-    if not _is_virtual:
-        functions_tags_folder.mkdir(exist_ok=True, parents=True)
     load_tag = functions_tags_folder / "load.json"
     tick_tag = functions_tags_folder / "tick.json"
 
-    load_json = {"values": []} if _is_virtual else read_func_tag(load_tag, config)
-    tick_json = {"values": []} if _is_virtual else read_func_tag(tick_tag, config)
+    load_json = (
+        read_func_tag(load_tag, config) if is_folder_output else {"values": []}
+    )
+    tick_json = (
+        read_func_tag(tick_tag, config) if is_folder_output else {"values": []}
+    )
 
     load_json["values"].append(f"{config.namespace}:{DataPack.load_name}")
-    if _is_virtual:
-        output[load_tag] = dumps(load_json, indent=4)
-    else:
-        with load_tag.open("w+", encoding="utf-8") as file:
-            dump(load_json, file, indent=4)
+    output[load_tag] = dumps(load_json, indent=4)
 
     if (
         DataPack.tick_name in datapack.functions
         and datapack.functions[DataPack.tick_name]
     ):
         tick_json["values"].append(f"{config.namespace}:{DataPack.tick_name}")
-        if _is_virtual:
-            output[tick_tag] = dumps(tick_json, indent=4)
-        else:
-            with tick_tag.open("w+", encoding="utf-8") as file:
-                dump(tick_json, file, indent=4)
+        output[tick_tag] = dumps(tick_json, indent=4)
 
     for func_path, func in datapack.functions.items():
         namespace = func_path.split("/")[0]
@@ -365,14 +545,7 @@ def build(
             )
         else:
             path = namespace_folder / function_folder / (func_path + ".mcfunction")
-        content = post_process(func.content)
-
-        if _is_virtual:
-            output[path] = content
-        else:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with path.open("w+", encoding="utf-8") as file:
-                file.write(content)
+        output[path] = post_process(func.content)
 
     for json_path, json in datapack.jsons.items():
         namespace = json_path.split("/")[0]
@@ -386,28 +559,45 @@ def build(
         else:
             path = namespace_folder / (json_path + ".json")
         if json:
-            if _is_virtual:
-                output[path] = dumps(json, indent=4)
-            else:
-                path.parent.mkdir(parents=True, exist_ok=True)
-                with path.open("w+", encoding="utf-8") as file:
-                    dump(json, file, indent=4)
+            output[path] = dumps(json, indent=4)
     if _is_virtual:
         return output
 
     if not header.nometa:
-        with (output_folder / "pack.mcmeta").open("w+", encoding="utf-8") as file:
-            dump(
-                merge_dicts(
-                    {
-                        "pack": {
-                            "pack_format": config.parsed_pack_format,
-                            "description": config.description,
-                        }
-                    },
-                    datapack.custom_pack_meta,
-                ),
-                file,
-                indent=4,
-            )
+        output[output_folder / "pack.mcmeta"] = dumps(
+            merge_dicts(
+                {
+                    "pack": {
+                        "pack_format": config.parsed_pack_format,
+                        "description": config.description,
+                    }
+                },
+                datapack.custom_pack_meta,
+            ),
+            indent=4,
+        )
+
+    if sink is not None:
+        sink.write({**copied, **output}, output_folder)
+        return None
+
+    if old_manifest is None:
+        write_files(output)
+        if header.is_incremental_write or record_manifest:
+            manifest = {
+                path.relative_to(output_folder).as_posix(): hash_content(content)
+                for path, content in output.items()
+            }
+    else:
+        manifest = write_differential(
+            output, output_folder, old_manifest, header.statics
+        )
+
+    if record_manifest:
+        header.output_manifest = manifest
+    if header.is_incremental_write:
+        with manifest_file.open("w+", encoding="utf-8") as file:
+            dump(manifest, file, indent=4)
+    else:
+        manifest_file.unlink(missing_ok=True)
     return None
@@ -0,0 +1,99 @@
+"""Module handling state of a compilation (header and datapack names) so that compilations can be isolated from each other"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:
+    from .header import Header
+
+
+class CompileContext:
+    """
+    All state of a compilation that used to be process-global
+
+    `Header()` and `DataPack.<name>_name` resolve to the context that is currently in use (see `use`).
+    Threads and tasks that never use a context share the default context, which behaves like the old singleton.
+    Lexer, Tokenizer and DataPack keep the context they were created in, so they don't need to look it up again.
+    """
+
+    __slots__ = (
+        "header",
+        "load_name",
+        "tick_name",
+        "private_name",
+        "var_name",
+        "int_name",
+        "storage_name",
+        "message_handler",
+    )
+
+    header: "Header"
+    """Information from header"""
+    load_name: str
+    """Name of load function"""
+    tick_name: str
+    """Name of tick function"""
+    private_name: str
+    """Name of folder containing private functions"""
+    var_name: str
+    """Name of objective for variables"""
+    int_name: str
+    """Name of objective for integer constants"""
+    storage_name: str
+    """Name of data storage"""
+    message_handler: Callable[[str], None] | None
+    """Handler for user-facing compile-time messages of this context, None to use the one registered with `hooks.register_message`"""
+
+    def __init__(self) -> None:
+        from .header import Header
+
+        self.header = Header.create()
+        self.load_name = "__load__"
+        self.tick_name = "__tick__"
+        self.private_name = "__private__"
+        self.var_name = "__variable__"
+        self.int_name = "__int__"
+        self.storage_name = "__storage__"
+        self.message_handler = None
+
+    @contextmanager
+    def use(self) -> Iterator["CompileContext"]:
+        """
+        Use this context in current thread/task until the end of the with statement
+
+        :return: Self
+        """
+        token = _current_context.set(self)
+        try:
+            yield self
+        finally:
+            _current_context.reset(token)
+
+
+_current_context: ContextVar[CompileContext] = ContextVar("jmc_compile_context")
+_default_context: CompileContext | None = None
+
+
+def default_context() -> CompileContext:
+    """
+    Get context shared by everything that isn't inside `CompileContext.use`
+
+    :return: Default context
+    """
+    global _default_context
+    if _default_context is None:
+        _default_context = CompileContext()
+    return _default_context
+
+
+def current_context() -> CompileContext:
+    """
+    Get context that is currently in use
+
+    :return: Current context
+    """
+    try:
+        return _current_context.get()
+    except LookupError:
+        return default_context()
@@ -19,7 +19,14 @@ from .exception import (
     relative_file_name,
 )
 from .log import Logger
-from .header import Header
+from .optimizer import (
+    deduplicate_private_functions,
+    inline_private_functions,
+    referenced_ints,
+    remove_unreachable_private_functions,
+    stable_private_function_names,
+)
+from .context import CompileContext, current_context
 
 if TYPE_CHECKING:
     from .lexer import Lexer
@@ -59,6 +66,7 @@ class PreFunction:
         "lexer",
         "tokenizer",
         "prefix",
+        "func_token",
     )
 
     def __init__(
@@ -75,6 +83,7 @@ class PreFunction:
         lexer: "Lexer",
         tokenizer: Tokenizer,
         prefix: str,
+        func_token: Token | None = None,
     ) -> None:
         self.func_name = func_name
         self.func_content = func_content
@@ -88,8 +97,15 @@ class PreFunction:
         self.lexer = lexer
         self.tokenizer = tokenizer
         self.prefix = prefix
+        self.func_token = func_token
 
     def parse(self, func_content: str | None = None) -> "Function":
+        if func_content is None and self.func_token is not None:
+            return Function(
+                self.lexer.parse_func_token(
+                    self.func_token, self.jmc_file_path, self.file_string, self.prefix
+                )
+            )
         return Function(
             self.lexer.parse_func_content(
                 (self.func_content if func_content is None else func_content),
@@ -267,7 +283,46 @@ class Function:
         return [line for string in strings for line in string.split("\n") if line]
 
 
-class DataPack:
+class _ContextName:
+    """
+    Descriptor of a name (e.g. `load_name`) of a CompileContext
+
+    On a DataPack it's the name of the datapack's context, on the DataPack class (through DataPackMeta) it's the name of the current context
+
+    :param attribute: Attribute name in CompileContext
+    """
+
+    __slots__ = ("attribute",)
+
+    def __init__(self, attribute: str) -> None:
+        self.attribute = attribute
+
+    def __context(self, instance: object) -> CompileContext:
+        if isinstance(instance, DataPack):
+            return instance.context
+        return current_context()
+
+    def __get__(self, instance: object, owner: type | None = None) -> str:
+        return getattr(self.__context(instance), self.attribute)
+
+    def __set__(self, instance: object, value: str) -> None:
+        setattr(self.__context(instance), self.attribute, value)
+
+
+class DataPackMeta(type):
+    """
+    Metaclass making `DataPack.<name>_name` read and write names of the current CompileContext
+    """
+
+    private_name = _ContextName("private_name")
+    load_name = _ContextName("load_name")
+    tick_name = _ContextName("tick_name")
+    var_name = _ContextName("var_name")
+    int_name = _ContextName("int_name")
+    storage_name = _ContextName("storage_name")
+
+
+class DataPack(metaclass=DataPackMeta):
     """
     A class representation for entire minecraft datapack
 
@@ -296,18 +351,21 @@ class DataPack:
         "after_func",
         "delayed_error",
         "custom_pack_meta",
+        "context",
     )
-    private_name = "__private__"
-    load_name = "__load__"
-    tick_name = "__tick__"
-    var_name = "__variable__"
-    int_name = "__int__"
-    storage_name = "__storage__"
+    private_name = _ContextName("private_name")
+    load_name = _ContextName("load_name")
+    tick_name = _ContextName("tick_name")
+    var_name = _ContextName("var_name")
+    int_name = _ContextName("int_name")
+    storage_name = _ContextName("storage_name")
     VARIABLE_SIGN = "$"
     """Data read from header file(s)"""
 
     def __init__(self, namespace: str, pack_format: float, lexer: "Lexer") -> None:
         logger.debug("Initializing Datapack")
+        self.context: CompileContext = lexer.context
+        """Compile context the datapack was created in (Names and header)"""
         self.version: PackVersion = PackVersion(pack_format)
         """Datapack's version details"""
         self.ints: set[int] = set()
@@ -513,7 +571,7 @@ class DataPack:
         self.functions[name] = Function(commands)
 
     def _get_func_in_comment(self, name: str, count: str) -> str:
-        if not Header().show_private_command:
+        if not self.context.header.show_private_command:
             return ""
         if (
             name not in self.private_functions
@@ -591,11 +649,9 @@ class DataPack:
             return self.lexer._parse_func_content(
                 tokenizer, [token], prefix, is_load=False
             )
-        return self.lexer.parse_func_content(
-            token.string[1:-1],
+        return self.lexer.parse_func_token(
+            token,
             file_path if file_path is not None else tokenizer.file_path,
-            token.line,
-            token.col,
             file_string if file_string is not None else tokenizer.file_string,
             prefix,
         )
@@ -610,7 +666,7 @@ class DataPack:
         """
         first_folder = func.split("/")[0]
         rest_of_name = func.replace(f"{first_folder}/", "", 1)
-        if first_folder in Header().namespace_overrides:
+        if first_folder in self.context.header.namespace_overrides:
             return f"{first_folder}:{rest_of_name}"
         return f"{self.namespace}:{func}"
 
@@ -646,22 +702,46 @@ class DataPack:
         """
         self.ints.add(integer)
 
+    def __build_ints(self, index: int, is_objective_implicit: bool) -> None:
+        """
+        Add `__int__` constants that are still referenced after optimization into load function
+
+        :param index: Index in load function to insert into (after objectives)
+        :param is_objective_implicit: Whether `__int__` objective was only added for the constants
+        """
+        if not self.ints:
+            return
+        referenced = referenced_ints(self)
+        ints = [n for n in self.ints if n in referenced]
+        if len(ints) != len(self.ints):
+            logger.debug(
+                f"Skipped {len(self.ints) - len(ints)} unreferenced integer constant(s)"
+            )
+        load_function = self.functions[self.load_name]
+        if not ints and is_objective_implicit:
+            load_function.commands.remove(
+                f"scoreboard objectives add {self.int_name} dummy"
+            )
+            return
+        load_function.commands[index:index] = [
+            f"scoreboard players set {n} {self.int_name} {n}" for n in ints
+        ]
+
     def build(self) -> None:
         """
         Finializing DataPack for building (NO file writing)
         """
         logger.debug("Finializing DataPack")
-        for py_func in Header().post_process:
+        for py_func in self.context.header.post_process:
             py_func(self)
+        is_int_objective_implicit = bool(self.ints) and self.int_name not in self.scoreboards
         if self.ints:
             self.add_objective(self.int_name)
         self.loads[0:0] = [
-            *[
-                f"scoreboard objectives add {objective} {criteria}"
-                for objective, criteria in self.scoreboards.items()
-            ],
-            *[f"scoreboard players set {n} {self.int_name} {n}" for n in self.ints],
+            f"scoreboard objectives add {objective} {criteria}"
+            for objective, criteria in self.scoreboards.items()
         ]
+        int_index = len(self.scoreboards)
         if self.loads:
             self.functions[self.load_name].insert_extend(self.loads, 0)
         if self.after_loads:
@@ -684,11 +764,30 @@ class DataPack:
                     self.after_func_token[_func_path][1],
                 )
             self.functions[_func_path].extend(_commands)
+        header = self.context.header
+        if header.is_optimize:
+            header.add_build_stat(
+                "deduplicated_functions", deduplicate_private_functions(self)
+            )
+        if header.is_stable_private_names:
+            # Before inlining, so names don't depend on inlining decisions and match paths in a function profile
+            stable_private_function_names(self)
+        if (
+            header.is_optimize or header.function_profile is not None
+        ) and not header.show_private_command:
+            header.add_build_stat(
+                "inlined_functions",
+                inline_private_functions(self, header.function_profile),
+            )
+            header.add_build_stat(
+                "unreachable_functions", remove_unreachable_private_functions(self)
+            )
         for name, functions in self.private_functions.items():
             for path, func in functions.items():
                 self.functions[f"{self.private_name}/{name}/{path}"] = func
+        self.__build_ints(int_index, is_int_objective_implicit)
 
-        if Header().copy is not None:
+        if self.context.header.copy is not None:
             for _func_path, _ in self.functions.items():
                 if self.is_function_in_copy(_func_path):
                     raise JMCBuildError(
@@ -722,7 +821,7 @@ class DataPack:
                 not is_function_called_in_copy
                 and function_called not in self.functions
                 and function_called.split("/", 1)[0].strip()
-                not in Header().datapack_link
+                not in self.context.header.datapack_link
             ):
                 if function_called in self.lexer.datapack.lazy_func:
                     raise JMCSyntaxException(
@@ -735,7 +834,7 @@ class DataPack:
                     f"Function '{function_called}' was never defined", token, tokenizer
                 )
 
-        envs = Header().envs
+        envs = self.context.header.envs
 
         if envs:
             envs_error = ", ".join(envs)
@@ -749,7 +848,7 @@ class DataPack:
         self.loads = []
         self.ticks = []
 
-        track_function_regexs = Header().track_function_regexs
+        track_function_regexs = self.context.header.track_function_regexs
         for regex, prefix, suffix, color, function_color in track_function_regexs:
             for name, function in self.functions.items():
                 if regex.fullmatch(name) is None:
@@ -758,7 +857,7 @@ class DataPack:
                 function.insert(tellraw, 0)
 
     def is_function_in_copy(self, function: str) -> bool:
-        header = Header()
+        header = self.context.header
         if header.copy is None:
             is_function_called_in_copy = False
         else:
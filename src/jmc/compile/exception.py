@@ -10,7 +10,6 @@ if TYPE_CHECKING:
     from .tokenizer import Token, Tokenizer
 
 logger = Logger(__name__)
-NEW_LINE = "\n"
 TAB = "\t"
 
 
@@ -91,29 +90,34 @@ def error_msg(
     else:
         display_col += 1
     try:
-        msgs_ = tokenizer.file_string.split(NEW_LINE)
-        msgs_.append("\n")
+        source = tokenizer.source
+        line_count = source.line_count + 1  # Extra line for the end of file
+
+        def get_line(index: int) -> str:
+            index %= line_count
+            return source.line(index + 1) if index < source.line_count else "\n"
+
         max_space = len(str(display_line + 1))
-        if display_line <= len(msgs_):
-            line_ = overide_file_str(msgs_[display_line - 1])
+        if display_line <= line_count:
+            line_ = overide_file_str(get_line(display_line - 1))
         else:
             line_ = ""
         if entire_line:
             tab_count = line_.count(TAB)
             msg = f"""In {relative_file_name(tokenizer.file_path, line)}
 {message} at line {line}.
-{display_line - 1}{" " * (max_space - len(str(display_line - 1)))} |{msgs_[(display_line - 2) % len(msgs_)].replace(TAB, "    ") if display_line > 1 else ""}
+{display_line - 1}{" " * (max_space - len(str(display_line - 1)))} |{get_line(display_line - 2).replace(TAB, "    ") if display_line > 1 else ""}
 {display_line}{" " * (max_space - len(str(display_line)))} |{line_.replace(TAB, "    ")}
 {" " * (col + max_space + 3 * tab_count + 1)}{"^" * (len(line_) - col + 1)}
-{display_line + 1} |{msgs_[display_line].replace(TAB, "    ") if display_line < len(msgs_) else ""}"""
+{display_line + 1} |{get_line(display_line).replace(TAB, "    ") if display_line < line_count else ""}"""
         else:
             tab_count = line_[: col - 1].count(TAB)
             msg = f"""In {relative_file_name(tokenizer.file_path, line, col)}
 {message} at line {line} col {col}.
-{display_line - 1}{" " * (max_space - len(str(display_line - 1)))} |{msgs_[(display_line - 2) % len(msgs_)].replace(TAB, "    ") if display_line > 1 else ""}
+{display_line - 1}{" " * (max_space - len(str(display_line - 1)))} |{get_line(display_line - 2).replace(TAB, "    ") if display_line > 1 else ""}
 {display_line}{" " * (max_space - len(str(display_line)))} |{line_.replace(TAB, "    ")}
 {" " * (col + max_space + 3 * tab_count + 1)}{"^" * (display_col - col)}
-{display_line + 1} |{msgs_[display_line].replace(TAB, "    ") if display_line < len(msgs_) else ""}"""
+{display_line + 1} |{get_line(display_line).replace(TAB, "    ") if display_line < line_count else ""}"""
     except ValueError as error:
         logger.critical(
             f"Error happens at wrong file: {tokenizer.file_path=}, {line=}, {col=}"
@@ -349,7 +353,7 @@ class JMCDecodeJSONError(ValueError):
         line = token.line + error.lineno - 1
         col = token.col + error.colno - 1 if token.line == line else error.colno
 
-        msg = f"In {tokenizer.file_path}\n{error.msg} at line {line} col {col}.\n{tokenizer.file_string.split(NEW_LINE)[line - 1][:col - 1]} <-"
+        msg = f"In {tokenizer.file_path}\n{error.msg} at line {line} col {col}.\n{tokenizer.source.line(line)[:col - 1]} <-"
 
         log(self, (msg,))
         super().__init__(msg)
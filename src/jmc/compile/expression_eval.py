@@ -298,6 +298,11 @@ def print_tree(node: Node, indent: str = "", is_left: bool = False) -> None:
 EXPONENTIAL_CAP = 5000
 
 
+def _is_division_by_zero(operator: Operator, number: Number) -> bool:
+    """Whether an operation divides by a constant zero, which is left for minecraft to handle instead of being folded"""
+    return operator.content in ("/", "%") and isinstance(number, Constant) and float(number.content) == 0
+
+
 def tree_to_operations(tree: Number, output: Variable, output_operation: str, tokenizer: Tokenizer) -> list[tuple[Variable, Operator, Number]]:
     if not isinstance(tree, Expression):
         return [(output, Operator(output_operation, Token.empty()), tree)]
@@ -372,7 +377,8 @@ def tree_to_operations(tree: Number, output: Variable, output_operation: str, to
             else:
                 operations.append((left_var, node.operator, right_var))
             return left_var
-        elif isinstance(left_var, Constant) and isinstance(right_var, Constant):
+        elif (isinstance(left_var, Constant) and isinstance(right_var, Constant)
+              and not _is_division_by_zero(node.operator, right_var)):
             const = Constant(eval_expr(left_var.content +
                                        node.content + right_var.content), Token.empty())
             if is_first_time:
@@ -541,6 +547,8 @@ def optimize_const(operations: list[tuple[Variable, Operator, Number]]) -> list[
             if first_const_index == -1:
                 first_const_index = i
                 continue
+            if _is_division_by_zero(op, num):
+                break
             const = temp_operations[first_const_index][2]
             temp_operations[first_const_index] = (temp_operations[first_const_index][0], temp_operations[first_const_index][1], Constant(
                 eval_expr(const.content + op.content + " " + num.content), const.token))
@@ -567,6 +575,8 @@ def optimize_const(operations: list[tuple[Variable, Operator, Number]]) -> list[
             if first_const_index == -1:
                 first_const_index = i
                 continue
+            if _is_division_by_zero(op, num):
+                break
             const = temp_operations[first_const_index][2]
             first_const_op = temp_operations[first_const_index][1]
 
@@ -590,9 +600,9 @@ def optimize_const(operations: list[tuple[Variable, Operator, Number]]) -> list[
                 raise Exception("Unreachable")
             indices_to_delete.append(i)
         if first_const_index != -1:
-            if temp_operations[first_const_index][1].content in "*%" and float(temp_operations[first_const_index][2].content) == 1:
+            if temp_operations[first_const_index][1].content in ("*", "/") and float(temp_operations[first_const_index][2].content) == 1:
                 indices_to_delete.insert(0, first_const_index)
-            elif temp_operations[first_const_index][1].content in "+-" and float(temp_operations[first_const_index][2].content) == 0:
+            elif temp_operations[first_const_index][1].content in ("+", "-") and float(temp_operations[first_const_index][2].content) == 0:
                 indices_to_delete.insert(0, first_const_index)
 
         for i in reversed(indices_to_delete):
@@ -613,3 +623,180 @@ def optimize_const(operations: list[tuple[Variable, Operator, Number]]) -> list[
 #             return frac
 #
 #     return frac
+
+
+def _node_key(node: Number) -> tuple | None:
+    """Get a hashable structural key of a node, None if it contains a command (which can have side effects)"""
+    if isinstance(node, CommandNumber):
+        return None
+    if isinstance(node, Expression):
+        left = _node_key(node.children[0])
+        right = _node_key(node.children[1])
+        if left is None or right is None:
+            return None
+        return (node.operator.content, left, right)
+    return (type(node).__name__, node.content)
+
+
+def eliminate_common_subexpression(tree: Number, output: Variable) -> Number:
+    """
+    Evaluate identical operands of the same operation only once
+
+    - `X + X` -> `X * 2` (strength reduced into `X += X`)
+    - `X * X` -> `X ** 2` (`X *= X`)
+    - `X - X` -> `0`
+
+    The first two are only applied when the output is a single score holder, as the result may be computed directly into the output and operating a multi-entity output against itself is incorrect (`X * 2` would then need a constant score instead of `X += X`)
+
+    :param tree: Expression tree
+    :param output: Variable the result is stored into
+    :return: Expression tree
+    """
+    if not isinstance(tree, Expression):
+        return tree
+    left = eliminate_common_subexpression(tree.children[0], output)
+    right = eliminate_common_subexpression(tree.children[1], output)
+    tree.children = (left, right)
+    if isinstance(left, Constant) or isinstance(right, Constant):
+        return tree
+    key = _node_key(left)
+    if key is None or key != _node_key(right):
+        return tree
+    if tree.operator.content == "-":
+        return Constant("0", tree.token)
+    if not _is_single_holder(output):
+        return tree
+    if tree.operator.content == "+":
+        return Expression("*", tree.token, (left, Constant("2", Token.empty())), Operator("*", tree.operator.token))
+    if tree.operator.content == "*":
+        return Expression("**", tree.token, (left, Constant("2", Token.empty())), Operator("**", tree.operator.token))
+    return tree
+
+
+def _is_temporary(variable: Number) -> bool:
+    return isinstance(variable, TemporaryVariable) and variable.index != -1
+
+
+def _is_single_holder(variable: Number) -> bool:
+    """Whether a score holder always resolves to one score (an operation against itself is safe)"""
+    return not variable.content.startswith("@") or variable.content.startswith("@s")
+
+
+def _constant_value(number: Number) -> float | None:
+    if not isinstance(number, Constant):
+        return None
+    return float(number.content)
+
+
+def _reduce_operations(operations: list[tuple[Variable, Operator, Number]]) -> list[tuple[Variable, Operator, Number]]:
+    """Remove identity operations and apply strength reduction"""
+    reduced: list[tuple[Variable, Operator, Number]] = []
+    for variable, operator, number in operations:
+        value = _constant_value(number)
+        if operator.content == "" and isinstance(number, Variable) and number.content == variable.content:
+            continue
+        if value is not None:
+            if (operator.content in ("+", "-") and value == 0) or (operator.content in ("*", "/") and value == 1):
+                continue
+            if (operator.content == "*" and value == 0) or (operator.content == "%" and value == 1):
+                reduced.append((variable, Operator("", operator.token), Constant("0", number.token)))
+                continue
+            if operator.content == "*" and value == 2 and _is_single_holder(variable):
+                reduced.append((variable, Operator("+", operator.token), variable))
+                continue
+        reduced.append((variable, operator, number))
+    return reduced
+
+
+def _propagate_constants(operations: list[tuple[Variable, Operator, Number]]) -> list[tuple[Variable, Operator, Number]]:
+    """Replace reads of temporary variables that hold a known constant with the constant"""
+    known: dict[str, Constant] = {}
+    propagated: list[tuple[Variable, Operator, Number]] = []
+    for variable, operator, number in operations:
+        if _is_temporary(number) and number.content in known:
+            number = Constant(known[number.content].content, number.token)
+        if _is_temporary(variable):
+            if operator.content == "" and isinstance(number, Constant):
+                known[variable.content] = number
+            else:
+                known.pop(variable.content, None)
+        propagated.append((variable, operator, number))
+    return propagated
+
+
+def optimize_operations(operations: list[tuple[Variable, Operator, Number]]) -> list[tuple[Variable, Operator, Number]]:
+    """
+    Optimize scoreboard operations (after optimize_const)
+
+    - Remove identity operations (`+0`, `-0`, `*1`, `/1`, `x = x`)
+    - Strength reduction (`*0` and `%1` into `= 0`, `*2` into `+= itself`)
+    - Propagate constants through temporary variables (`t = 0`, `x += t` into `x += 0`, which is then removed)
+    - Compute the result directly into the output instead of copying it from a temporary variable
+    - Remove dead stores to temporary variables
+    - Reallocate temporary variables so the ones with non-overlapping lifetimes share a score holder
+    """
+    reduced = _reduce_operations(_propagate_constants(_reduce_operations(operations)))
+
+    if reduced and reduced[-1][1].content == "" and _is_temporary(reduced[-1][2]):
+        output, _, result = reduced[-1]
+        start = -1
+        for index in range(len(reduced) - 2, -1, -1):
+            variable, operator, number = reduced[index]
+            if variable.content == result.content and operator.content == "":
+                start = index
+                break
+        if (start != -1 and _is_single_holder(output)
+                and all(
+                    output.content not in (variable.content, number.content) and not isinstance(number, CommandNumber)
+                    for variable, _, number in reduced[start:-1])):
+            renamed_output = Variable(output.content, output.token)
+            reduced = reduced[:start] + [
+                (renamed_output if variable.content == result.content else variable,
+                 operator,
+                 renamed_output if isinstance(number, Variable) and number.content == result.content else number)
+                for variable, operator, number in reduced[start:-1]
+            ]
+
+    live: set[str] = set()
+    alive: list[tuple[Variable, Operator, Number]] = []
+    for variable, operator, number in reversed(reduced):
+        if _is_temporary(variable) and variable.content not in live and not isinstance(number, CommandNumber):
+            continue
+        if operator.content == "":
+            live.discard(variable.content)
+        else:
+            live.add(variable.content)
+        if _is_temporary(number):
+            live.add(number.content)
+        alive.append((variable, operator, number))
+    alive.reverse()
+
+    last_use: dict[str, int] = {}
+    for index, (variable, _, number) in enumerate(alive):
+        for node in (variable, number):
+            if _is_temporary(node):
+                last_use[node.content] = index
+    registers: dict[str, int] = {}
+    free: list[int] = []
+    register_count = 0
+    allocated: list[tuple[Variable, Operator, Number]] = []
+    for index, (variable, operator, number) in enumerate(alive):
+        for node in (variable, number):
+            if not _is_temporary(node) or node.content in registers:
+                continue
+            if free:
+                registers[node.content] = free.pop(0)
+            else:
+                registers[node.content] = register_count
+                register_count += 1
+        if _is_temporary(variable):
+            register = registers[variable.content]
+            variable = TemporaryVariable(f"__temp{register}__ {DataPack.var_name}", variable.token, register)
+        if _is_temporary(number):
+            register = registers[number.content]
+            number = TemporaryVariable(f"__temp{register}__ {DataPack.var_name}", number.token, register)
+        allocated.append((variable, operator, number))
+        for content, last in last_use.items():
+            if last == index:
+                bisect.insort(free, registers[content])
+    return allocated
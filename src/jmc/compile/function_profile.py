@@ -0,0 +1,118 @@
+"""Module handling in-game function profiling data used for profile-guided optimization"""
+
+from json import JSONDecodeError, loads
+from pathlib import Path
+
+from .exception import JMCBuildError, JMCFileNotFoundError
+from .log import Logger
+
+logger = Logger(__name__)
+
+HOT_RATIO = 0.1
+"""Fraction of the hottest function's weight a function needs to be considered hot"""
+HOT_INLINE_MAX_COMMANDS = 8
+"""Maximum amount of commands of a hot private function to be spliced into every call site"""
+
+
+class FunctionProfile:
+    """
+    Call count and time of each function from a profiling session
+
+    Accepted file formats:
+    - JSON object of function path and either call count or `{"calls": int, "time": float}`
+    - Text with `<function path> <call count> [<time>]` on each line (`#` for comments)
+
+    Functions are weighted by time only when every function in the profile has a recorded time, otherwise by call count
+
+    :param calls: Dictionary of function path (`namespace:path`) and call count
+    :param times: Dictionary of function path and total time spent (any unit)
+    """
+
+    __slots__ = ("calls", "times", "is_timed", "max_weight")
+
+    calls: dict[str, int]
+    """Dictionary of function path and call count"""
+    times: dict[str, float]
+    """Dictionary of function path and total time spent"""
+    is_timed: bool
+    """Whether every function in the profile has a recorded time (weight is time instead of call count)"""
+    max_weight: float
+    """Weight of the hottest function"""
+
+    def __init__(self, calls: dict[str, int], times: dict[str, float]) -> None:
+        self.calls = calls
+        self.times = times
+        self.is_timed = bool(times) and calls.keys() <= times.keys()
+        self.max_weight = max(
+            (self.weight(path) for path in calls.keys() | times.keys()), default=0
+        )
+
+    @classmethod
+    def from_file(cls, path: Path) -> "FunctionProfile":
+        """
+        Read profile file
+
+        :param path: Path to JSON or text profile
+        :raises JMCFileNotFoundError: Profile file doesn't exist
+        :raises JMCBuildError: Profile file is invalid
+        :return: FunctionProfile
+        """
+        try:
+            content = path.read_text(encoding="utf-8")
+        except OSError as error:
+            raise JMCFileNotFoundError(
+                f"Profile file not found: {path.as_posix()}"
+            ) from error
+        calls: dict[str, int] = {}
+        times: dict[str, float] = {}
+        try:
+            if content.lstrip().startswith("{"):
+                for function_path, data in loads(content).items():
+                    if isinstance(data, dict):
+                        calls[function_path] = int(data.get("calls", 0))
+                        if "time" in data:
+                            times[function_path] = float(data["time"])
+                    else:
+                        calls[function_path] = int(data)
+            else:
+                for line in content.splitlines():
+                    line = line.split("#", 1)[0].strip()
+                    if not line:
+                        continue
+                    function_path, *values = line.split()
+                    calls[function_path] = int(values[0])
+                    if len(values) > 1:
+                        times[function_path] = float(values[1])
+        except (JSONDecodeError, AttributeError, IndexError, TypeError, ValueError) as error:
+            raise JMCBuildError(
+                f"Invalid profile file '{path.as_posix()}': {error}"
+            ) from error
+        logger.info(f"Loaded profile of {len(calls)} function(s)")
+        return cls(calls, times)
+
+    def weight(self, path: str) -> float:
+        """
+        Get how expensive a function is in the profile (time if every function has a recorded time, call count otherwise)
+
+        :param path: Function path (`namespace:path`)
+        :return: Weight
+        """
+        if self.is_timed:
+            return self.times.get(path, 0)
+        return self.calls.get(path, 0)
+
+    def is_hot(self, path: str) -> bool:
+        """
+        Whether a function is among the most expensive functions in the profile
+
+        :param path: Function path (`namespace:path`)
+        """
+        return self.max_weight > 0 and self.weight(path) >= self.max_weight * HOT_RATIO
+
+    def is_cold(self, path: str) -> bool:
+        """
+        Whether a function was recorded but never called (functions missing from the profile are unknown, not cold)
+
+        :param path: Function path (`namespace:path`)
+        """
+        return path in self.calls and self.calls[path] == 0
@@ -4,11 +4,13 @@ import re
 from pathlib import Path
 from typing import Any, Callable, TYPE_CHECKING
 
-from .utils import SingleTon
+from .context import _current_context, default_context
 from .log import Logger
 from .vanilla_command import VANILLA_CONDITIONS
 
 if TYPE_CHECKING:
+    from .function_profile import FunctionProfile
+    from .profiler import CompileProfiler
     from .tokenizer import Token
     from ..compile.datapack import DataPack
 
@@ -27,9 +29,21 @@ logger = Logger(__name__)
 MacroFactory = Callable[[list["Token"], int, int], list["Token"]]
 
 
-class Header(SingleTon):
+class HeaderMeta(type):
     """
-    A SingleTon class containing all information from header
+    Metaclass making `Header()` return the header of the compile context in use
+    """
+
+    def __call__(cls) -> "Header":
+        try:
+            return _current_context.get().header
+        except LookupError:
+            return default_context().header
+
+
+class Header(metaclass=HeaderMeta):
+    """
+    A class containing all information from header, `Header()` returns the one of the current CompileContext
     """
 
     file_read: set[str]
@@ -62,7 +76,7 @@ class Header(SingleTon):
     nometa: bool
     """Whether hand pack.mcmeta to user"""
     envs: list[str]
-    """Environment variables to set to 1 (gotten from cli). This should be empty list at the end of compilation"""
+    """Environment variables to set to 1 (gotten from cli), kept by `Header.clear`. This should be empty list at the end of compilation"""
     force_bst: bool
     """Whether to force binary search on switch case after vanilla macro"""
     show_private_command: bool
@@ -71,14 +85,39 @@ class Header(SingleTon):
     """List of regex from Debug.trackFunction, prefix, suffix, color and function name color"""
     copy: Path | None
     """Path to copy to the root of the built project"""
+    is_incremental_write: bool
+    """Whether to only write changed files and delete stale files (using output manifest) instead of deleting the namespace folder"""
+    is_optimize: bool
+    """Whether to run optimization passes that change the shape of the output (inlining, arithmetic rewriting, etc.)"""
+    is_stable_private_names: bool
+    """Whether to name private functions by hash of their content instead of sequential count"""
+    function_profile: "FunctionProfile | None"
+    """In-game profiling data for profile-guided optimization (from `jmc compile --pgo`)"""
+    profiler: "CompileProfiler | None"
+    """Profiler of the compiler itself (from `jmc compile --profile`)"""
+    build_stats: dict[str, int]
+    """Counters of what the compiler did (e.g. switch lowering strategy), reported after compilation"""
+    source_files: set[Path]
+    """Set of JMC files, imported folders and python files read while lexing (Used by watch mode)"""
+    output_manifest: dict[str, str]
+    """Dictionary of every file written to the output folder (relative path) and hash of its content, only recorded with `build(record_manifest=True)` (Used by serve mode)"""
+
+    @classmethod
+    def create(cls) -> "Header":
+        """
+        Create a new header that isn't attached to any context (Used by CompileContext)
 
-    def __init__(self) -> None:
-        self.__clear(self)
+        :return: Header
+        """
+        header = object.__new__(cls)
+        cls.__clear(header)
+        header.envs = []
+        return header
 
     @classmethod
     def clear(cls) -> None:
         """
-        Reset the single object
+        Reset the header of the current context
         """
         cls.__clear(cls())
 
@@ -103,6 +142,23 @@ class Header(SingleTon):
         obj.show_private_command = False
         obj.track_function_regexs = []
         obj.copy = None
+        obj.is_incremental_write = False
+        obj.is_stable_private_names = False
+        obj.is_optimize = False
+        obj.source_files = set()
+        obj.output_manifest = {}
+        obj.function_profile = None
+        obj.profiler = None
+        obj.build_stats = {}
+
+    def add_build_stat(self, key: str, amount: int = 1) -> None:
+        """
+        Increase a counter in build_stats
+
+        :param key: Name of the counter
+        :param amount: Amount to increase by, defaults to 1
+        """
+        self.build_stats[key] = self.build_stats.get(key, 0) + amount
 
     def add_file_read(self, path: Path) -> None:
         """
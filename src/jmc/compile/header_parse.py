@@ -610,6 +610,39 @@ def __parse_header(
                 )
             header.force_bst = True
 
+        # #incremental
+        elif directive_token.string == "incremental":
+            if arg_tokens:
+                raise HeaderSyntaxException(
+                    "Expected 0 arguments after '#incremental'",
+                    file_name,
+                    line,
+                    line_str,
+                )
+            header.is_incremental_write = True
+
+        # #stablenames
+        elif directive_token.string == "stablenames":
+            if arg_tokens:
+                raise HeaderSyntaxException(
+                    "Expected 0 arguments after '#stablenames'",
+                    file_name,
+                    line,
+                    line_str,
+                )
+            header.is_stable_private_names = True
+
+        # #optimize
+        elif directive_token.string == "optimize":
+            if arg_tokens:
+                raise HeaderSyntaxException(
+                    "Expected 0 arguments after '#optimize'",
+                    file_name,
+                    line,
+                    line_str,
+                )
+            header.is_optimize = True
+
         # #enum
         elif directive_token.string == "enum":
             if len(arg_tokens) < 2:
@@ -1,5 +1,7 @@
 from typing import Callable
 
+from .context import current_context
+
 _message_handler: Callable[[str], None] = print
 
 
@@ -16,8 +18,11 @@ def register_message(fn: Callable[[str], None]) -> None:
 
 
 def emit_message(message: str) -> None:
-    """Emit a user-facing message through the registered handler.
+    """Emit a user-facing message through the handler of the current CompileContext, or the registered handler if it has none.
 
     :param message: The message string to emit.
     """
-    _message_handler(message)
+    handler = current_context().message_handler
+    if handler is None:
+        handler = _message_handler
+    handler(message)
@@ -1,10 +1,8 @@
-from copy import deepcopy
 from pathlib import Path
 from json import loads, JSONDecodeError, dumps
 from typing import TYPE_CHECKING, Any
 
 from .decorator_parse import DECORATORS
-from .header import Header
 from .exception import (
     JMCDecodeJSONError,
     JMCFileNotFoundError,
@@ -13,8 +11,11 @@ from .exception import (
     relative_file_name,
 )
 from .tokenizer import Tokenizer, Token, TokenType
+from .cache import CompileCache
+from .context import CompileContext, current_context
 from .datapack import DataPack, Function, PreFunction
 from .log import Logger
+from .profiler import profile_span
 from .utils import (
     convention_jmc_to_mc,
     deep_merge,
@@ -114,6 +115,67 @@ LEGACY_JSON_FILE_TYPES = [
 """List of json file types that's different in older version"""
 
 
+def resolve_import(
+    command: list[Token], file_path: Path, tokenizer: Tokenizer
+) -> tuple[list[Path], Path | None]:
+    """
+    Find files imported by an `import` statement
+
+    :param command: Import statement (list of tokens starting with `import`)
+    :param file_path: Path to the file containing the statement
+    :param tokenizer: Tokenizer of the file
+    :raises JMCSyntaxException: Nothing after `@import`
+    :raises JMCSyntaxException: A token after `@import` is not a string
+    :raises JMCSyntaxException: Unexpected argument token in `@import`
+    :raises JMCSyntaxException: Path in `@import` is invalid
+    :raises JMCFileNotFoundError: Imported folder doesn't exist
+    :return: List of resolved paths to imported files in import order and the imported folder (None if it's not a folder import)
+    """
+    if len(command) < 2:
+        raise JMCSyntaxException(
+            "Expected string after '@import'",
+            command[0],
+            tokenizer,
+            col_length=True,
+        )
+    if command[1].token_type != TokenType.STRING:
+        raise JMCSyntaxException(
+            "Expected string after '@import'", command[1], tokenizer
+        )
+    if len(command) > 2:
+        raise JMCSyntaxException(
+            "Unexpected token",
+            command[1],
+            tokenizer,
+            display_col_length=False,
+        )
+    if command[1].string.endswith("/*") or command[1].string.endswith("\\*"):
+        try:
+            folder = Path(command[1].string[:-2])
+        except Exception as error:
+            raise JMCSyntaxException(
+                f"Unexpected invalid path ({command[1].string})",
+                command[1],
+                tokenizer,
+            ) from error
+        if not folder.is_dir():
+            raise JMCFileNotFoundError(
+                f"Directory(folder) not found: {folder.resolve().as_posix()}"
+            )
+        return [new_path.resolve() for new_path in folder.glob("**/*.jmc")], folder
+    try:
+        new_path = Path((file_path.parent / command[1].string).resolve())
+        if new_path.suffix != ".jmc":
+            new_path = Path((file_path.parent / (command[1].string + ".jmc")).resolve())
+    except Exception as error:
+        raise JMCSyntaxException(
+            f"Unexpected invalid path ({command[1].string})",
+            command[1],
+            tokenizer,
+        ) from error
+    return [new_path], None
+
+
 class Lexer:
     """
     Lexical Analyizer
@@ -128,6 +190,9 @@ class Lexer:
         "imports",
         "config",
         "datapack",
+        "cache",
+        "pretokenized",
+        "context",
     )
 
     if_else_box: list[tuple[Token | None, Token | list[Token]]]
@@ -142,9 +207,24 @@ class Lexer:
     """JMC configuration"""
     datapack: DataPack
     """Datapack object"""
-
-    def __init__(self, config: "Configuration", _test_file: str | None = None) -> None:
+    cache: CompileCache | None
+    """Persistent compile cache, None to always tokenize"""
+    pretokenized: dict[str, tuple[str, list[list[Token]]]]
+    """Dictionary of resolved file path and tuple of its content and programs that were already tokenized (by worker processes)"""
+    context: CompileContext
+    """Compile context the lexer was created in"""
+
+    def __init__(
+        self,
+        config: "Configuration",
+        _test_file: str | None = None,
+        cache: CompileCache | None = None,
+        pretokenized: dict[str, tuple[str, list[list[Token]]]] | None = None,
+    ) -> None:
         logger.debug("Initializing Lexer")
+        self.context = current_context()
+        self.cache = cache
+        self.pretokenized = pretokenized if pretokenized is not None else {}
         self.do_while_box = None
         self.imports = set()
         self.if_else_box = []
@@ -152,6 +232,8 @@ class Lexer:
         self.datapack = DataPack(config.namespace, float(config.pack_format), self)
         self.datapack.functions[self.datapack.load_name] = Function()
         self.parse_file(Path(self.config.target), _test_file, is_load=True)
+        if self.cache is not None:
+            self.cache.save_index()
 
         logger.debug("Load Function")
 
@@ -165,9 +247,10 @@ class Lexer:
     def parse_current_load(self):
         """Parse current load function that's in self.datapack.load_function and clear it"""
         if self.datapack.load_function:
-            self.datapack.functions[self.datapack.load_name].extend(
-                self.parse_load_func_content(programs=self.datapack.load_function)
-            )
+            with profile_span(f"function:{self.datapack.load_name}"):
+                self.datapack.functions[self.datapack.load_name].extend(
+                    self.parse_load_func_content(programs=self.datapack.load_function)
+                )
             self.datapack.load_function = []
 
     def parse_file(
@@ -191,6 +274,7 @@ class Lexer:
         logger.info(f"Parsing file: {file_path}")
         file_path_str = file_path.resolve().as_posix()
         if _test_file is None:
+            self.context.header.source_files.add(file_path)
             try:
                 with file_path.open("r", encoding="utf-8") as file:
                     raw_string = file.read()
@@ -200,9 +284,24 @@ class Lexer:
                 ) from error
         else:
             raw_string = _test_file
-        tokenizer = Tokenizer(raw_string, file_path_str)
+        if (
+            _test_file is None
+            and file_path_str in self.pretokenized
+            and self.pretokenized[file_path_str][0] == raw_string
+        ):
+            # Same string object the code blocks were tokenized with, so that their tokenizers are reused
+            raw_string = self.pretokenized[file_path_str][0]
+            tokenizer = Tokenizer.from_programs(
+                self.pretokenized[file_path_str][1], raw_string, file_path_str
+            )
+        elif self.cache is None or _test_file is not None:
+            with profile_span(f"tokenize:{file_path_str}"):
+                tokenizer = Tokenizer(raw_string, file_path_str)
+        else:
+            with profile_span(f"tokenize:{file_path_str}"):
+                tokenizer = self.cache.tokenize(raw_string, file_path_str)
         if is_load:
-            self.load_tokenizer = deepcopy(tokenizer)
+            self.load_tokenizer = tokenizer.fork()
 
         self.__update_load(file_path_str, raw_string)
 
@@ -227,59 +326,14 @@ class Lexer:
                 self.parse_class(tokenizer, command, file_path_str)
             elif command[0].string == "import":
                 self.parse_current_load()
-                if len(command) < 2:
-                    raise JMCSyntaxException(
-                        "Expected string after '@import'",
-                        command[0],
-                        tokenizer,
-                        col_length=True,
-                    )
-                if command[1].token_type != TokenType.STRING:
-                    raise JMCSyntaxException(
-                        "Expected string after '@import'", command[1], tokenizer
-                    )
-                if len(command) > 2:
-                    raise JMCSyntaxException(
-                        "Unexpected token",
-                        command[1],
-                        tokenizer,
-                        display_col_length=False,
-                    )
-                if command[1].string.endswith("/*") or command[1].string.endswith(
-                    "\\*"
-                ):
-                    try:
-                        folder = Path(command[1].string[:-2])
-                    except Exception as error:
-                        raise JMCSyntaxException(
-                            f"Unexpected invalid path ({command[1].string})",
-                            command[1],
-                            tokenizer,
-                        ) from error
-                    if not folder.is_dir():
-                        raise JMCFileNotFoundError(
-                            f"Directory(folder) not found: {folder.resolve().as_posix()}"
-                        )
-
-                    new_paths = folder.glob("**/*.jmc")
-                    for new_path in new_paths:
-                        self.parse_file(file_path=new_path.resolve())
-                        self.__update_load(file_path_str, raw_string)
-                    continue
-                try:
-                    new_path = Path((file_path.parent / command[1].string).resolve())
-                    if new_path.suffix != ".jmc":
-                        new_path = Path(
-                            (file_path.parent / (command[1].string + ".jmc")).resolve()
-                        )
-                except Exception as error:
-                    raise JMCSyntaxException(
-                        f"Unexpected invalid path ({command[1].string})",
-                        command[1],
-                        tokenizer,
-                    ) from error
-                self.parse_file(file_path=new_path)
-                self.__update_load(file_path_str, raw_string)
+                new_paths, folder = resolve_import(command, file_path, tokenizer)
+                if folder is not None:
+                    self.context.header.source_files.add(folder.resolve())
+                for new_path in new_paths:
+                    if self.cache is not None:
+                        self.cache.add_import(file_path_str, new_path.as_posix())
+                    self.parse_file(file_path=new_path)
+                    self.__update_load(file_path_str, raw_string)
             else:
                 self.datapack.load_function.append(command)
 
@@ -450,6 +504,7 @@ class Lexer:
             self,
             tokenizer,
             prefix,
+            command[3],
         )
 
     def parse_func(
@@ -480,7 +535,8 @@ class Lexer:
         pre_function = self.parse_func_tokens(
             tokenizer, command, file_path_str, prefix, is_save_to_datapack
         )
-        return_value = pre_function.parse()
+        with profile_span(f"function:{pre_function.func_path}"):
+            return_value = pre_function.parse()
         if is_save_to_datapack:
             self.datapack.functions[pre_function.func_path] = return_value
         return return_value, pre_function.func_path
@@ -612,7 +668,7 @@ class Lexer:
 
         if (
             json_type not in JSON_FILE_TYPES
-            and json_type not in Header().resources
+            and json_type not in self.context.header.resources
             and not json_type.startswith("tags/")
         ):
             if json_type + "s" in LEGACY_JSON_FILE_TYPES:
@@ -636,7 +692,7 @@ class Lexer:
         )
 
         namespace = json_name.split("/")[0]
-        if namespace in Header().namespace_overrides:
+        if namespace in self.context.header.namespace_overrides:
             json_path = (
                 namespace + "/" + json_type + "/" + json_name[len(namespace) + 1 :]
             )
@@ -680,7 +736,7 @@ class Lexer:
             )
 
         if extends_from:
-            if namespace in Header().namespace_overrides:
+            if namespace in self.context.header.namespace_overrides:
                 super_path = (
                     namespace
                     + "/"
@@ -777,13 +833,10 @@ class Lexer:
             raise JMCSyntaxException("Expected {", command[2], tokenizer)
 
         class_path = prefix + convention_jmc_to_mc(command[1], tokenizer, prefix="")
-        class_content = command[2].string[1:-1]
         self.parse_class_content(
             class_path + "/",
-            class_content,
+            command[2],
             file_path_str,
-            line=command[2].line,
-            col=command[2].col,
             file_string=tokenizer.file_string,
         )
 
@@ -834,6 +887,27 @@ class Lexer:
         programs = tokenizer.programs
         return self._parse_func_content(tokenizer, programs, prefix, is_load=False)
 
+    def parse_func_token(
+        self,
+        token: Token,
+        file_path_str: str,
+        file_string: str,
+        prefix: str,
+    ) -> list[str]:
+        """
+        Parse content of a paren_curly token, reusing its child tokens if it was already tokenized
+
+        :param token: paren_curly token
+        :param file_path_str: File path to current JMC function as string
+        :param file_string: Content of current JMC function
+        :param prefix: Prefix of function(for Class feature)
+        :return: List of commands(string)
+        """
+        tokenizer, programs = Tokenizer.from_paren_curly(
+            token, file_path_str, file_string
+        )
+        return self._parse_func_content(tokenizer, programs, prefix, is_load=False)
+
     def _parse_func_content(
         self,
         tokenizer: Tokenizer,
@@ -855,28 +929,24 @@ class Lexer:
     def parse_class_content(
         self,
         prefix: str,
-        class_content: str,
+        token: Token,
         file_path_str: str,
-        line: int,
-        col: int,
         file_string: str,
     ) -> None:
         """
         Parse content of a class
 
         :param prefix: Prefix of class(for Class feature)
-        :param class_content: Content inside class as string
+        :param token: paren_curly token of the class content
         :param file_path_str: File path to current JMC function as string
-        :param line: Current line in current JMC function
-        :param col: Current column in current JMC function
         :param file_string: Content of current JMC function
         :raises JMCSyntaxException: Importing in class
         :raises JMCSyntaxException: Got something else beside 'function' or 'new' or 'class'
         """
-        tokenizer = Tokenizer(
-            class_content, file_path_str, line=line, col=col, file_string=file_string
+        tokenizer, programs = Tokenizer.from_paren_curly(
+            token, file_path_str, file_string
         )
-        for command in tokenizer.programs:
+        for command in programs:
             if command[0].string == "function" and len(command) == 4:
                 self.parse_func(tokenizer, command, file_path_str, prefix)
             elif is_decorator(command[0].string):
@@ -26,7 +26,6 @@ from .utils import (
 from .datapack import DataPack
 from .command.condition import BOOL_FUNCTIONS, FUNC_CONTENT, extract_matches
 from .command.nbt_operation import extract_nbt, get_nbt_type, NBTType, nbt_operation
-from .header import Header
 from .command import (
     FLOW_CONTROL_COMMANDS,
     variable_operation,
@@ -400,7 +399,7 @@ class FuncContent:
             __token_string = __token_string[1:]
         __is_first_arg = (
             __token_string in FIRST_ARGUMENTS
-            or __token_string in Header().commands
+            or __token_string in self.lexer.context.header.commands
             or is_decorator(__token_string)
         )
         __is_not_exception = len(self.__commands) > command_pos and not (
@@ -409,7 +408,7 @@ class FuncContent:
             in FIRST_ARGUMENTS_EXCEPTION[__token_string]
         )
         __is_not_connected = not is_connected(token, self.command[key_pos - 1])
-        __is_not_deleted = __token_string not in Header().dels
+        __is_not_deleted = __token_string not in self.lexer.context.header.dels
 
         if (
             token.token_type == TokenType.KEYWORD
@@ -619,7 +618,7 @@ class FuncContent:
         if not self._bypass_checks:
             if (
                 token.string not in VANILLA_COMMANDS
-                and token.string not in Header().commands
+                and token.string not in self.lexer.context.header.commands
             ):
                 if not self.command_strings:
                     raise JMCSyntaxException(
@@ -1237,7 +1236,7 @@ class FuncContent:
                     raise normal_error
                 if (
                     token.string not in VANILLA_COMMANDS
-                    and token.string not in Header().commands
+                    and token.string not in self.lexer.context.header.commands
                     and token.string != ""
                 ):
                     raise var_error
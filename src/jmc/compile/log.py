@@ -1,21 +1,93 @@
 """Module handling logging"""
-from io import StringIO
+from collections import deque
 import logging
 
-debug_log_stream = StringIO()
-info_log_stream = StringIO()
+DEBUG_LOG_CAPACITY = 20_000
+"""Maximum amount of records kept in debug log, older records are discarded"""
+INFO_LOG_CAPACITY = 5_000
+"""Maximum amount of records kept in info log, older records are discarded"""
 FORMATTER = logging.Formatter(
     '%(asctime)s | %(name)s | %(levelname)s | %(message)s')
 
 
+class RingBufferHandler(logging.Handler):
+    """
+    Logging handler keeping only the latest records in memory, formatting them into log lines only when the log is requested
+
+    Messages are rendered when a record is kept, so the log shows values at logging time and records don't keep arguments alive
+
+    :param capacity: Maximum amount of records to keep
+    :param level: Minimum level of records to keep
+    """
+
+    def __init__(self, capacity: int, level: int) -> None:
+        super().__init__(level)
+        self.records: deque[logging.LogRecord] = deque(maxlen=capacity)
+        self.discarded = 0
+        """Amount of records discarded because of the capacity"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                if not record.exc_text:
+                    record.exc_text = (self.formatter or logging.Formatter()).formatException(
+                        record.exc_info
+                    )
+                record.exc_info = None
+        except Exception:  # Same as logging.StreamHandler
+            self.handleError(record)
+            return
+        if len(self.records) == self.records.maxlen:
+            self.discarded += 1
+        self.records.append(record)
+
+    def getvalue(self) -> str:
+        """Format every kept record into log string"""
+        lines = [
+            f"... {self.discarded} older record(s) discarded ...\n"] if self.discarded else []
+        for record in list(self.records):
+            try:
+                lines.append(self.format(record) + "\n")
+            except Exception:  # Same as logging.StreamHandler
+                self.handleError(record)
+        return "".join(lines)
+
+    def clear(self) -> None:
+        """Discard every record"""
+        self.records.clear()
+        self.discarded = 0
+
+
+debug_log_handler = RingBufferHandler(DEBUG_LOG_CAPACITY, logging.DEBUG)
+debug_log_handler.setFormatter(FORMATTER)
+info_log_handler = RingBufferHandler(INFO_LOG_CAPACITY, logging.INFO)
+info_log_handler.setFormatter(FORMATTER)
+_loggers: list[logging.Logger] = []
+_level = logging.DEBUG
+
+
 def get_info_log() -> str:
     """Return log string"""
-    return info_log_stream.getvalue()
+    return info_log_handler.getvalue()
 
 
 def get_debug_log() -> str:
     """Return log string"""
-    return debug_log_stream.getvalue()
+    return debug_log_handler.getvalue()
+
+
+def set_debug_log(is_enabled: bool) -> None:
+    """
+    Enable or disable debug log of every JMC logger, `logger.debug` returns immediately when disabled
+
+    :param is_enabled: Whether to record debug records
+    """
+    global _level
+    _level = logging.DEBUG if is_enabled else logging.INFO
+    for logger in _loggers:
+        logger.setLevel(_level)
 
 
 def Logger(name: str) -> logging.Logger:
@@ -25,17 +97,11 @@ def Logger(name: str) -> logging.Logger:
     ```"""
 
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-
-    stream_handler = logging.StreamHandler(debug_log_stream)
-    stream_handler.setFormatter(FORMATTER)
-    stream_handler.setLevel(logging.DEBUG)
-    logger.addHandler(stream_handler)
-
-    stream_handler = logging.StreamHandler(info_log_stream)
-    stream_handler.setFormatter(FORMATTER)
-    stream_handler.setLevel(logging.INFO)
-    logger.addHandler(stream_handler)
+    logger.setLevel(_level)
+    if debug_log_handler not in logger.handlers:
+        logger.addHandler(debug_log_handler)
+        logger.addHandler(info_log_handler)
+        _loggers.append(logger)
 
     logger.propagate = False
     return logger
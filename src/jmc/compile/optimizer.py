@@ -0,0 +1,476 @@
+"""Module handling optimization passes over the finished DataPack (before building)"""
+
+import re
+from json import dumps
+from typing import TYPE_CHECKING
+
+from .function_profile import HOT_INLINE_MAX_COMMANDS
+from .hooks import emit_message
+from .log import Logger
+
+if TYPE_CHECKING:
+    from .datapack import DataPack, Function
+    from .function_profile import FunctionProfile
+
+logger = Logger(__name__)
+
+PATH_END = r"(?![\w/.\-])"
+"""Lookahead making sure a function path isn't a prefix of a longer path"""
+STABLE_NAME_LENGTH = 8
+"""Length of content-hash based private function name"""
+
+
+def private_function_paths(datapack: "DataPack") -> dict[str, tuple[str, str]]:
+    """
+    Get every private function's call path
+
+    :param datapack: DataPack
+    :return: Dictionary of call path (namespace:__private__/name/count) and (name, count)
+    """
+    return {
+        f"{datapack.namespace}:{datapack.private_name}/{name}/{count}": (name, count)
+        for name, functions in datapack.private_functions.items()
+        for count in functions
+    }
+
+
+def scheduled_private_functions(datapack: "DataPack") -> set[str]:
+    """
+    Find private functions that are scheduled (`schedule function` replaces the previous schedule of the same function, so they can't be merged)
+
+    :param datapack: DataPack
+    :return: Set of call paths
+    """
+    namespace = re.escape(f"{datapack.namespace}:{datapack.private_name}/")
+    schedule_regex = re.compile(rf"schedule (?:function|clear) ({namespace}\S+)")
+    scheduled: set[str] = set()
+    for function in iter_functions(datapack):
+        for command in function.commands:
+            if datapack.private_name in command:
+                scheduled.update(schedule_regex.findall(command))
+    return scheduled
+
+
+def fixed_private_functions(
+    datapack: "DataPack", paths: dict[str, tuple[str, str]]
+) -> set[str]:
+    """
+    Find private functions whose path can't be changed, so they can't be merged or renamed
+
+    - Functions referenced inside jsons (function tags run each entry once)
+    - Functions reachable by a vanilla macro path (`function ...$(key)`)
+
+    :param datapack: DataPack
+    :param paths: Call paths from `private_function_paths`
+    :return: Set of call paths
+    """
+    namespace = re.escape(f"{datapack.namespace}:{datapack.private_name}/")
+    dynamic_regex = re.compile(rf"({namespace}[^\s$]*)\$\(")
+    dynamic_prefixes: set[str] = set()
+    for function in iter_functions(datapack):
+        for command in function.commands:
+            if command.startswith("$") and datapack.private_name in command:
+                dynamic_prefixes.update(dynamic_regex.findall(command))
+    jsons = dumps(datapack.jsons)
+    return {
+        path
+        for path in paths
+        if path in jsons or any(path.startswith(prefix) for prefix in dynamic_prefixes)
+    }
+
+
+def iter_functions(datapack: "DataPack") -> list["Function"]:
+    """
+    Get every function in the datapack including private functions that are not yet merged
+
+    :param datapack: DataPack
+    :return: List of functions
+    """
+    return [
+        *datapack.functions.values(),
+        *(
+            function
+            for functions in datapack.private_functions.values()
+            for function in functions.values()
+        ),
+    ]
+
+
+def rename_function_calls(datapack: "DataPack", renames: dict[str, str]) -> None:
+    """
+    Replace every reference of old call paths with new call paths
+
+    :param datapack: DataPack
+    :param renames: Dictionary of old call path and new call path
+    """
+    if not renames:
+        return
+    regex = re.compile(
+        "("
+        + "|".join(re.escape(path) for path in sorted(renames, key=len, reverse=True))
+        + ")"
+        + PATH_END
+    )
+    for function in iter_functions(datapack):
+        function.commands = [
+            (
+                regex.sub(lambda match: renames[match.group(1)], command)
+                if datapack.private_name in command
+                else command
+            )
+            for command in function.commands
+        ]
+
+
+def deduplicate_private_functions(datapack: "DataPack") -> int:
+    """
+    Merge private functions with identical content into the one created first and redirect calls to it
+
+    Runs until nothing changes, since redirecting calls can make parent functions identical as well
+
+    :param datapack: DataPack
+    :return: Amount of private functions removed
+    """
+    removed = 0
+    while True:
+        paths = private_function_paths(datapack)
+        pinned = scheduled_private_functions(datapack) | fixed_private_functions(
+            datapack, paths
+        )
+        seen: dict[tuple[str, ...], str] = {}
+        renames: dict[str, str] = {}
+        for path, (name, count) in paths.items():
+            if path in pinned:
+                continue
+            commands = tuple(datapack.private_functions[name][count].commands)
+            if commands in seen:
+                renames[path] = seen[commands]
+            else:
+                seen[commands] = path
+        if not renames:
+            break
+        for path in renames:
+            name, count = paths[path]
+            del datapack.private_functions[name][count]
+        rename_function_calls(datapack, renames)
+        removed += len(renames)
+    if removed:
+        logger.info(f"Deduplicated {removed} private function(s)")
+    return removed
+
+
+def stable_private_function_names(datapack: "DataPack") -> int:
+    """
+    Rename private functions from sequential count to a hash of their group name and content (`#stablenames`)
+
+    Functions are named bottom-up so a parent's hash includes its children's final names.
+    References inside a cycle (recursion) are hashed by group name only.
+    Only functions named by `DataPack.get_count` (digits) are renamed.
+
+    :param datapack: DataPack
+    :return: Amount of private functions renamed
+    """
+    from .command.utils import hash_string_to_string  # circular import
+
+    paths = private_function_paths(datapack)
+    fixed = fixed_private_functions(datapack, paths)
+    remaining = dict(
+        sorted(
+            (
+                (path, (name, count))
+                for path, (name, count) in paths.items()
+                if count.isdigit() and path not in fixed
+            ),
+            key=lambda item: (item[1][0], int(item[1][1])),
+        )
+    )
+    prefix = f"{datapack.namespace}:{datapack.private_name}/"
+    reference_regex = re.compile(rf"{re.escape(prefix)}[\w/.\-]+")
+    references = {
+        path: set(
+            reference_regex.findall(
+                datapack.private_functions[name][count].content
+            )
+        )
+        for path, (name, count) in remaining.items()
+    }
+    renames: dict[str, str] = {}
+    used = {
+        f"{name}/{count}"
+        for path, (name, count) in paths.items()
+        if path not in remaining
+    }
+
+    def normalize(match: re.Match, path: str) -> str:
+        reference = match.group(0)
+        if reference == path:
+            return "<self>"
+        if reference in renames:
+            return renames[reference]
+        if reference in remaining:
+            return remaining[reference][0] + "/<cycle>"
+        return reference
+
+    def rename(path: str) -> None:
+        name, count = remaining.pop(path)
+        content = reference_regex.sub(
+            lambda match: normalize(match, path),
+            datapack.private_functions[name][count].content,
+        )
+        hashed = hash_string_to_string(f"{name}\0{content}", STABLE_NAME_LENGTH)
+        while f"{name}/{hashed}" in used:
+            hashed += "_"
+        used.add(f"{name}/{hashed}")
+        renames[path] = f"{prefix}{name}/{hashed}"
+
+    while remaining:
+        ready = [
+            path
+            for path in remaining
+            if not any(
+                reference in remaining and reference != path
+                for reference in references[path]
+            )
+        ]
+        if not ready:
+            ready = [next(iter(remaining))]
+        for path in ready:
+            rename(path)
+
+    for path, new_path in renames.items():
+        name, count = paths[path]
+        datapack.private_functions[name][new_path.rsplit("/", 1)[1]] = (
+            datapack.private_functions[name].pop(count)
+        )
+    rename_function_calls(datapack, renames)
+    logger.info(f"Renamed {len(renames)} private function(s) by content hash")
+    return len(renames)
+
+
+def private_reference_regex(datapack: "DataPack") -> re.Pattern:
+    """
+    Get regex matching any reference to a private function
+
+    :param datapack: DataPack
+    :return: Compiled regex
+    """
+    return re.compile(
+        rf"{re.escape(f'{datapack.namespace}:{datapack.private_name}/')}[\w/.\-]+"
+    )
+
+
+def private_call_graph(datapack: "DataPack") -> dict[str, set[str]]:
+    """
+    Get call paths of private functions referenced by each function (including non-private functions)
+
+    :param datapack: DataPack
+    :return: Dictionary of function's call path and set of private call paths it references
+    """
+    regex = private_reference_regex(datapack)
+    graph: dict[str, set[str]] = {}
+    for name, function in datapack.functions.items():
+        graph[f"{datapack.namespace}:{name}"] = set(regex.findall(function.content))
+    for path, (name, count) in private_function_paths(datapack).items():
+        graph[path] = set(
+            regex.findall(datapack.private_functions[name][count].content)
+        )
+    return graph
+
+
+def recursive_functions(graph: dict[str, set[str]]) -> set[str]:
+    """
+    Find functions that can (directly or indirectly) call themselves, using Tarjan's strongly connected components algorithm
+
+    :param graph: Call graph from `private_call_graph`
+    :return: Set of call paths
+    """
+    index: dict[str, int] = {}
+    low_link: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    recursive: set[str] = set()
+    for root in graph:
+        if root in index:
+            continue
+        work: list[tuple[str, list[str]]] = [(root, [*graph[root]])]
+        index[root] = low_link[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            if children:
+                child = children.pop()
+                if child not in graph:
+                    continue
+                if child not in index:
+                    index[child] = low_link[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, [*graph[child]]))
+                elif child in on_stack:
+                    low_link[node] = min(low_link[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low_link[parent] = min(low_link[parent], low_link[node])
+            if low_link[node] != index[node]:
+                continue
+            component: list[str] = []
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                component.append(member)
+                if member == node:
+                    break
+            if len(component) > 1 or node in graph[node]:
+                recursive.update(component)
+    return recursive
+
+
+INLINE_CALL_REGEX = re.compile(r"^((?:execute .+ run )?)function (\S+)$")
+"""Regex matching a command that only calls a function, group 1 is the execute prefix"""
+RETURN_REGEX = re.compile(r"(?:^|\brun )return\b")
+"""Regex matching a command that returns (which would return from the caller once inlined)"""
+
+
+def __inlinable_body(commands: list[str]) -> bool:
+    return bool(commands) and not any(
+        not command
+        or command.startswith(("$", "#"))
+        or RETURN_REGEX.search(command) is not None
+        for command in commands
+    )
+
+
+def inline_private_functions(
+    datapack: "DataPack", profile: "FunctionProfile | None" = None
+) -> int:
+    """
+    Inline private functions into their call sites where it doesn't change the semantics
+
+    - Function with a single command is inlined into any `function` / `execute ... run function` call site (except `store` and `return`)
+    - Function called exactly once by a plain `function` command is spliced into its caller
+    - With a profile, hot function with at most HOT_INLINE_MAX_COMMANDS commands is spliced into every plain `function` call site
+      while cold function (recorded but never called) is kept out of line
+
+    Functions containing macro lines, comments or `return` and recursive functions are never inlined
+
+    :param datapack: DataPack
+    :param profile: Profiling data for hot/cold decisions, defaults to None
+    :return: Amount of call sites inlined
+    """
+    if profile is not None and not datapack.context.header.is_stable_private_names:
+        emit_message(
+            "Warning: Function profile is used without '#stablenames', private function paths in the profile may not match this build"
+        )
+        logger.warning("Function profile used without #stablenames")
+
+    inlined = 0
+    while True:
+        graph = private_call_graph(datapack)
+        recursive = recursive_functions(graph)
+        paths = private_function_paths(datapack)
+        reference_counts: dict[str, int] = {}
+        for function in iter_functions(datapack):
+            for reference in private_reference_regex(datapack).findall(
+                function.content
+            ):
+                reference_counts[reference] = reference_counts.get(reference, 0) + 1
+        changed = False
+        for function in iter_functions(datapack):
+            commands: list[str] = []
+            for command in function.commands:
+                match = INLINE_CALL_REGEX.match(command)
+                path = match.group(2) if match is not None else ""
+                if (
+                    match is None
+                    or path not in paths
+                    or path in recursive
+                    or (profile is not None and profile.is_cold(path))
+                ):
+                    commands.append(command)
+                    continue
+                name, count = paths[path]
+                body = datapack.private_functions[name][count].commands
+                prefix = match.group(1)
+                if not __inlinable_body(body):
+                    commands.append(command)
+                    continue
+                if len(body) == 1 and not (
+                    " store " in prefix or " return " in prefix
+                ):
+                    if prefix and body[0].startswith("execute "):
+                        commands.append(prefix[: -len("run ")] + body[0][8:])
+                    else:
+                        commands.append(prefix + body[0])
+                elif not prefix and (
+                    reference_counts.get(path) == 1
+                    or (
+                        profile is not None
+                        and profile.is_hot(path)
+                        and len(body) <= HOT_INLINE_MAX_COMMANDS
+                    )
+                ):
+                    commands.extend(body)
+                else:
+                    commands.append(command)
+                    continue
+                reference_counts[path] -= 1
+                inlined += 1
+                changed = True
+            function.commands = commands
+        if not changed:
+            break
+    if inlined:
+        logger.info(f"Inlined {inlined} private function call(s)")
+    return inlined
+
+
+def remove_unreachable_private_functions(datapack: "DataPack") -> int:
+    """
+    Remove private functions that can't be reached from any non-private function, json or vanilla macro path
+
+    :param datapack: DataPack
+    :return: Amount of private functions removed
+    """
+    graph = private_call_graph(datapack)
+    paths = private_function_paths(datapack)
+    reachable = fixed_private_functions(datapack, paths)
+    queue = [
+        *reachable,
+        *(path for path in graph if path not in paths),
+    ]
+    while queue:
+        path = queue.pop()
+        for reference in graph.get(path, ()):
+            if reference not in reachable:
+                reachable.add(reference)
+                queue.append(reference)
+    removed = 0
+    for path, (name, count) in paths.items():
+        if path not in reachable:
+            del datapack.private_functions[name][count]
+            removed += 1
+    if removed:
+        logger.info(f"Removed {removed} unreachable private function(s)")
+    return removed
+
+
+def referenced_ints(datapack: "DataPack") -> set[int]:
+    """
+    Get integer constants (`<n> __int__`) referenced by any command of the datapack
+
+    :param datapack: DataPack
+    :return: Set of referenced integers
+    """
+    regex = re.compile(
+        rf"(?<![\w.\-])(-?\d+) {re.escape(datapack.int_name)}{PATH_END}"
+    )
+    referenced: set[int] = set()
+    for function in iter_functions(datapack):
+        for command in function.commands:
+            if datapack.int_name not in command:
+                continue
+            referenced.update(int(match) for match in regex.findall(command))
+    return referenced
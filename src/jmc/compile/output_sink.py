@@ -0,0 +1,189 @@
+"""Module handling where built datapack files are written to"""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from io import BufferedIOBase
+from pathlib import Path
+from types import TracebackType
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+from .log import Logger
+
+logger = Logger(__name__)
+
+PARALLEL_WRITE_THRESHOLD = 64
+"""Amount of files to write before using a thread pool"""
+PARALLEL_WRITE_WORKERS = 16
+"""Amount of threads writing files"""
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+"""Timestamp of every zip entry, the earliest one zip supports, so that the archive only depends on its content"""
+ZIP_FILE_PERMISSION = 0o644
+
+
+def _write_file(path: Path, content: str | bytes) -> None:
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+        return
+    with path.open("w+", encoding="utf-8") as file:
+        file.write(content)
+
+
+def write_files(output: dict[Path, str] | dict[Path, str | bytes]) -> None:
+    """
+    Write every file in output
+
+    - Every unique parent directory is created once before writing
+    - Files are written from a thread pool when there are more than PARALLEL_WRITE_THRESHOLD of them, since per-file latency (especially on network filesystems and WSL mounts) dominates
+
+    :param output: Dictionary of file path and file content
+    """
+    for directory in sorted({path.parent for path in output}):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    if len(output) <= PARALLEL_WRITE_THRESHOLD:
+        for path, content in output.items():
+            _write_file(path, content)
+        return
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_WRITE_WORKERS) as executor:
+        futures = [
+            executor.submit(_write_file, path, content)
+            for path, content in output.items()
+        ]
+        for future in futures:
+            future.result()
+
+
+class OutputSink(ABC):
+    """
+    Destination of built datapack files
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def write(
+        self, output: dict[Path, str] | dict[Path, str | bytes], output_folder: Path
+    ) -> None:
+        """
+        Write files into the sink
+
+        :param output: Dictionary of file path and file content
+        :param output_folder: Root folder of the datapack (where pack.mcmeta is), every path in output is relative to it
+        """
+
+    def close(self) -> None:
+        """
+        Finish writing
+        """
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class DirectorySink(OutputSink):
+    """
+    Sink writing files into a folder
+
+    :param folder: Folder to write the datapack in
+    """
+
+    __slots__ = ("folder",)
+
+    folder: Path
+    """Folder to write the datapack in"""
+
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+
+    def write(
+        self, output: dict[Path, str] | dict[Path, str | bytes], output_folder: Path
+    ) -> None:
+        write_files(
+            {
+                self.folder / path.relative_to(output_folder): content
+                for path, content in output.items()
+            }
+        )
+
+
+class ZipSink(OutputSink):
+    """
+    Sink writing files straight into a zip archive
+
+    Entries are sorted and timestamped with ZIP_DATE_TIME so the same datapack always results in a byte-identical archive
+
+    :param file: Path to the zip file or a binary file object to stream the archive into, a path is only replaced once the sink is closed without error
+    """
+
+    __slots__ = ("zip_file", "names", "path")
+
+    zip_file: ZipFile
+    """Archive being written"""
+    names: set[str]
+    """Set of entry names already written"""
+    path: Path | None
+    """Path to the zip file, None if writing into a file object"""
+
+    def __init__(self, file: Path | BufferedIOBase) -> None:
+        self.names = set()
+        if isinstance(file, Path):
+            file.parent.mkdir(parents=True, exist_ok=True)
+            self.path = file
+            self.zip_file = ZipFile(
+                self.__temp_path(file), "w", compression=ZIP_DEFLATED
+            )
+        else:
+            self.path = None
+            self.zip_file = ZipFile(file, "w", compression=ZIP_DEFLATED)
+
+    @staticmethod
+    def __temp_path(path: Path) -> Path:
+        return path.with_name(path.name + ".tmp")
+
+    def write(
+        self, output: dict[Path, str] | dict[Path, str | bytes], output_folder: Path
+    ) -> None:
+        entries = sorted(
+            (
+                (path.relative_to(output_folder).as_posix(), content)
+                for path, content in output.items()
+            ),
+            key=lambda entry: entry[0],
+        )
+        for name, content in entries:
+            if name in self.names:
+                raise ValueError(f"Duplicated zip entry: {name}")
+            self.names.add(name)
+            info = ZipInfo(name, date_time=ZIP_DATE_TIME)
+            info.compress_type = ZIP_DEFLATED
+            info.external_attr = ZIP_FILE_PERMISSION << 16
+            self.zip_file.writestr(
+                info, content if isinstance(content, bytes) else content.encode("utf-8")
+            )
+
+    def close(self) -> None:
+        self.zip_file.close()
+        if self.path is not None:
+            self.__temp_path(self.path).replace(self.path)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        self.zip_file.close()
+        if self.path is not None:
+            self.__temp_path(self.path).unlink(missing_ok=True)
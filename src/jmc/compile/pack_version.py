@@ -108,6 +108,8 @@ class PackVersionFeature:
     """NBT text components need 'source' to specify entity/block/storage"""
     SHORT_GRASS = PackVersion(26)
     """Rename 'grass' to 'short_grass'"""
+    EXECUTE_IF_FUNCTION = PackVersion(26)
+    """Add `execute if function` and `return run`"""
     COMPONENT = PackVersion(33)
     """Switch from NBT system to Component system"""
     LEGACY_FOLDER_RENAME = PackVersion(48)
@@ -0,0 +1,171 @@
+"""Module handling tokenizing JMC files in parallel worker processes"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .cache import CompileCache
+from .header import Header
+from .lexer import resolve_import
+from .log import Logger
+from .tokenizer import Token, Tokenizer, TokenType
+from .exception import EXCEPTIONS
+
+if TYPE_CHECKING:
+    from ..terminal import Configuration
+
+logger = Logger(__name__)
+
+Pretokenized = dict[str, tuple[str, list[list[Token]]]]
+"""Dictionary of resolved file path and tuple of its content and programs"""
+
+
+def _init_worker(
+    namespace: str,
+    description: str,
+    pack_format: str,
+    target: Path,
+    output: Path,
+    envs: list[str],
+) -> None:
+    """
+    Parse header inside worker process so that macros are the same as the main process
+    """
+    from ..terminal import Configuration, GlobalData
+    from .compiling import read_header
+
+    Header.clear()
+    Header().envs = envs
+    read_header(
+        Configuration(GlobalData(), namespace, description, pack_format, target, output)
+    )
+
+
+def _tokenize_children(tokenizer: Tokenizer) -> None:
+    """
+    Tokenize content of every paren_curly token (recursively) and attach it to the token, so that the main process doesn't tokenize code blocks while lexing
+
+    Content that isn't JMC code (e.g. JSON) is left for the main process
+    """
+    for program in tokenizer.programs:
+        for token in program:
+            if token.token_type != TokenType.PAREN_CURLY:
+                continue
+            try:
+                children, _ = Tokenizer.from_paren_curly(
+                    token, tokenizer.file_path, tokenizer.file_string
+                )
+            except EXCEPTIONS:
+                continue
+            _tokenize_children(children)
+
+
+def _tokenize(file_path_str: str) -> tuple[str, list[list[Token]]] | None:
+    """
+    Tokenize a file and its code blocks inside worker process
+
+    :param file_path_str: Resolved path of the file
+    :return: Content of the file and its programs, None if it can't be tokenized (main process will raise the error while lexing)
+    """
+    try:
+        with open(file_path_str, "r", encoding="utf-8") as file:
+            raw_string = file.read()
+        tokenizer = Tokenizer(raw_string, file_path_str)
+    except (OSError, *EXCEPTIONS):
+        return None
+    _tokenize_children(tokenizer)
+    return raw_string, tokenizer.programs
+
+
+def _find_imports(
+    file_path_str: str, raw_string: str, programs: list[list[Token]]
+) -> list[Path]:
+    """
+    Find files imported by top level `import` statements, ignoring invalid ones (main process will raise the error while lexing)
+    """
+    file_path = Path(file_path_str)
+    tokenizer = Tokenizer.from_programs(programs, raw_string, file_path_str)
+    imports: list[Path] = []
+    for command in programs:
+        if command[0].string != "import" or command[0].token_type != TokenType.KEYWORD:
+            continue
+        try:
+            imports.extend(resolve_import(command, file_path, tokenizer)[0])
+        except EXCEPTIONS:
+            continue
+    return imports
+
+
+def pretokenize(
+    config: "Configuration",
+    envs: list[str],
+    jobs: int,
+    cache: CompileCache | None = None,
+) -> Pretokenized:
+    """
+    Tokenize main JMC file and every file it (transitively) imports in worker processes
+
+    Files are submitted as soon as an import is discovered, so independent import trees are tokenized concurrently.
+    Lexing still happens in the main process in import order since it mutates the shared DataPack.
+
+    :param config: JMC configuration
+    :param envs: Environment variables given before header was parsed
+    :param jobs: Amount of worker processes
+    :param cache: Compile cache to read from and write into, defaults to None
+    :return: Dictionary of resolved file path and tuple of its content and programs
+    """
+    result: Pretokenized = {}
+    seen: set[str] = set()
+    futures: dict[Future[tuple[str, list[list[Token]]] | None], str] = {}
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(
+            config.namespace,
+            config.description,
+            config.pack_format,
+            config.target,
+            config.output,
+            envs,
+        ),
+    ) as executor:
+
+        def submit(file_path: Path) -> None:
+            file_path_str = file_path.resolve().as_posix()
+            if file_path_str in seen:
+                return
+            seen.add(file_path_str)
+            if cache is not None:
+                try:
+                    raw_string = file_path.read_text(encoding="utf-8")
+                except OSError:
+                    return
+                programs = cache.get_programs(file_path_str, raw_string)
+                if programs is not None:
+                    done(file_path_str, raw_string, programs)
+                    return
+            futures[executor.submit(_tokenize, file_path_str)] = file_path_str
+
+        def done(
+            file_path_str: str, raw_string: str, programs: list[list[Token]]
+        ) -> None:
+            result[file_path_str] = (raw_string, programs)
+            for new_path in _find_imports(file_path_str, raw_string, programs):
+                submit(new_path)
+
+        submit(Path(config.target))
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                file_path_str = futures.pop(future)
+                tokenized = future.result()
+                if tokenized is None:
+                    continue
+                raw_string, programs = tokenized
+                if cache is not None:
+                    cache.set_programs(file_path_str, raw_string, programs)
+                done(file_path_str, raw_string, programs)
+
+    logger.info(f"Pretokenized {len(result)} file(s) with {jobs} worker(s)")
+    return result
@@ -0,0 +1,240 @@
+"""Module handling profiling of the compiler itself (time and memory allocations of each compilation phase)"""
+
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from json import dumps
+from pathlib import Path
+from time import perf_counter
+import tracemalloc
+from typing import Iterator
+
+from .header import Header
+from .log import Logger
+
+logger = Logger(__name__)
+
+PROFILE_REPORT_SUFFIX = ".json"
+PROFILE_COLLAPSED_SUFFIX = ".collapsed"
+DEFAULT_PROFILE_PATH = Path("jmc_profile")
+"""Default path (without suffix) of profile report files"""
+
+
+class _Frame:
+    """Accumulated data of a unique call stack"""
+
+    __slots__ = ("calls", "total_time", "child_time", "peak_allocated", "retained")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_time = 0.0
+        self.child_time = 0.0
+        self.peak_allocated = 0
+        self.retained = 0
+
+
+class CompileProfiler:
+    """
+    Profiler recording time and memory allocations of nested compilation phases
+
+    Memory of a phase is recorded as its peak allocation (highest traced memory during the phase above the memory at its start) and its retained memory (traced memory at its end minus the memory at its start, negative when the phase frees more than it allocates).
+
+    Phases are named `<kind>` or `<kind>:<detail>` (e.g. `tokenize:main.jmc`, `call:Hardcode.repeat`) and are recorded per call stack, so the same phase inside different parents is kept apart.
+
+    :param trace_memory: Whether to record allocations with tracemalloc (slows compilation down), defaults to True
+    """
+
+    __slots__ = (
+        "frames",
+        "stack",
+        "trace_memory",
+        "is_tracemalloc_owner",
+        "start_time",
+        "stop_time",
+    )
+
+    frames: dict[tuple[str, ...], _Frame]
+    """Dictionary of call stack and its accumulated data"""
+    stack: list[tuple[str, float, int, float, int]]
+    """Stack of current phases (name, start time, traced memory at start, time spent in children, highest traced memory seen in children)"""
+    trace_memory: bool
+    """Whether allocations are recorded"""
+    is_tracemalloc_owner: bool
+    """Whether this profiler started tracemalloc (and should stop it)"""
+    start_time: float
+    """perf_counter of when profiling started"""
+    stop_time: float | None
+    """perf_counter of when profiling stopped"""
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.frames = {}
+        self.stack = []
+        self.trace_memory = trace_memory
+        self.start_time = perf_counter()
+        self.stop_time = None
+        self.is_tracemalloc_owner = trace_memory and not tracemalloc.is_tracing()
+        if self.is_tracemalloc_owner:
+            tracemalloc.start()
+
+    def __memory(self) -> tuple[int, int]:
+        """
+        Get traced memory and peak traced memory since the last reset, then reset the peak
+
+        :return: Current traced memory and peak traced memory
+        """
+        if not self.trace_memory:
+            return 0, 0
+        memory = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return memory
+
+    def __update_parent_peak(self, peak: int) -> None:
+        """
+        Keep the highest traced memory seen by the current phase, since resetting the peak for a child hides it from its parent
+
+        :param peak: Peak traced memory seen before the reset
+        """
+        if not self.stack:
+            return
+        name, start, start_memory, child_time, parent_peak = self.stack[-1]
+        self.stack[-1] = (name, start, start_memory, child_time, max(parent_peak, peak))
+
+    def push(self, name: str) -> None:
+        """
+        Start a phase inside the current phase
+
+        :param name: Name of the phase
+        """
+        memory, peak = self.__memory()
+        self.__update_parent_peak(peak)
+        self.stack.append((name.replace(";", ":"), perf_counter(), memory, 0.0, memory))
+
+    def pop(self) -> None:
+        """
+        Stop the current phase
+        """
+        stop = perf_counter()
+        memory, peak = self.__memory()
+        key = tuple(name for name, *_ in self.stack)
+        _, start, start_memory, child_time, child_peak = self.stack.pop()
+        peak = max(peak, child_peak)
+        elapsed = stop - start
+        if key not in self.frames:
+            self.frames[key] = _Frame()
+        frame = self.frames[key]
+        frame.calls += 1
+        frame.total_time += elapsed
+        frame.child_time += child_time
+        frame.peak_allocated = max(frame.peak_allocated, peak - start_memory)
+        frame.retained += memory - start_memory
+        if self.stack:
+            name, parent_start, parent_memory, parent_child_time, parent_peak = self.stack[-1]
+            self.stack[-1] = (
+                name,
+                parent_start,
+                parent_memory,
+                parent_child_time + elapsed,
+                max(parent_peak, peak),
+            )
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Context manager recording a phase
+
+        :param name: Name of the phase
+        """
+        self.push(name)
+        try:
+            yield
+        finally:
+            self.pop()
+
+    def stop(self) -> None:
+        """
+        Stop profiling, closing every unfinished phase
+        """
+        while self.stack:
+            self.pop()
+        self.stop_time = perf_counter()
+        if self.is_tracemalloc_owner and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.is_tracemalloc_owner = False
+
+    def report(self) -> dict[str, object]:
+        """
+        Make a report of every phase, sorted by total time
+
+        :return: Dictionary of total time, per call stack data and per phase kind summary
+        """
+        stop_time = self.stop_time if self.stop_time is not None else perf_counter()
+        summary: dict[str, dict[str, float]] = {}
+        for stack, frame in self.frames.items():
+            kind = stack[-1].split(":", 1)[0]
+            kind_summary = summary.setdefault(
+                kind, {"calls": 0, "self_time": 0.0, "peak_allocated": 0, "retained": 0}
+            )
+            kind_summary["calls"] += frame.calls
+            kind_summary["self_time"] += frame.total_time - frame.child_time
+            kind_summary["peak_allocated"] = max(
+                kind_summary["peak_allocated"], frame.peak_allocated
+            )
+            kind_summary["retained"] += frame.retained
+        return {
+            "total_time": stop_time - self.start_time,
+            "trace_memory": self.trace_memory,
+            "phases": [
+                {
+                    "stack": ";".join(stack),
+                    "calls": frame.calls,
+                    "total_time": frame.total_time,
+                    "self_time": frame.total_time - frame.child_time,
+                    "peak_allocated": frame.peak_allocated,
+                    "retained": frame.retained,
+                }
+                for stack, frame in sorted(
+                    self.frames.items(), key=lambda item: item[1].total_time, reverse=True
+                )
+            ],
+            "summary": dict(
+                sorted(summary.items(), key=lambda item: item[1]["self_time"], reverse=True)
+            ),
+        }
+
+    def collapsed_stacks(self) -> str:
+        """
+        Make flamegraph-compatible collapsed stacks (`phase;phase;phase <self time in microseconds>`)
+
+        :return: Content of the collapsed stack file
+        """
+        return "\n".join(
+            f"{';'.join(stack)} {round((frame.total_time - frame.child_time) * 1_000_000)}"
+            for stack, frame in self.frames.items()
+        ) + "\n"
+
+    def write(self, path: Path) -> tuple[Path, Path]:
+        """
+        Write JSON report and collapsed stacks
+
+        :param path: Path of the files without suffix
+        :return: Path of the JSON report and path of the collapsed stack file
+        """
+        report_path = path.with_name(path.name + PROFILE_REPORT_SUFFIX)
+        collapsed_path = path.with_name(path.name + PROFILE_COLLAPSED_SUFFIX)
+        if path.parent != Path():
+            path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(dumps(self.report(), indent=4), encoding="utf-8")
+        collapsed_path.write_text(self.collapsed_stacks(), encoding="utf-8")
+        logger.info(f"Profile written to {report_path} and {collapsed_path}")
+        return report_path, collapsed_path
+
+
+def profile_span(name: str) -> AbstractContextManager[None]:
+    """
+    Record a phase if the compiler is being profiled, do nothing otherwise
+
+    :param name: Name of the phase
+    :return: Context manager
+    """
+    profiler = Header().profiler
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name)
@@ -7,6 +7,7 @@ from ..terminal import Configuration, GlobalData
 from .log import Logger
 from .header import Header
 from .compiling import read_cert, read_header, build
+from .function_profile import FunctionProfile
 from .lexer import Lexer
 
 logger = Logger(__name__)
@@ -22,11 +23,20 @@ class JMCTestPack:
     :param output: virtual directory for output, defaults to "VIRTUAL"
     """
 
-    __slots__ = ("cert", "jmc_file", "header_file", "__built", "config", "envs")
+    __slots__ = (
+        "cert",
+        "jmc_file",
+        "header_file",
+        "__built",
+        "config",
+        "envs",
+        "function_profile",
+    )
     cert: str
     jmc_file: str
     header_file: str | None
     envs: list[str]
+    function_profile: FunctionProfile | None
     __built: dict[str, str] | None
     """Dictionary of file name and file content"""
 
@@ -48,6 +58,7 @@ INT=__int__"""
             output=Path(output),
         )
         self.envs = []
+        self.function_profile = None
 
     def set_pack_format(self, pack_format: float) -> "JMCTestPack":
         self.config.pack_format = str(pack_format)
@@ -93,6 +104,16 @@ INT=__int__"""
         self.envs = envs
         return self
 
+    def set_function_profile(self, function_profile: FunctionProfile) -> "JMCTestPack":
+        """
+        Set profiling data (--pgo)
+
+        :param function_profile: Function profile
+        :return: Self
+        """
+        self.function_profile = function_profile
+        return self
+
     def build(self) -> "JMCTestPack":
         """
         Build datapack
@@ -103,6 +124,7 @@ INT=__int__"""
         Header().envs = self.envs.copy()
         is_delete, cert_config, cert_file = read_cert(self.config, _test_file=self.cert)
         read_header(self.config, _test_file=self.header_file)
+        Header().function_profile = self.function_profile
         lexer = Lexer(self.config, _test_file=self.jmc_file)
         built = build(
             lexer.datapack,
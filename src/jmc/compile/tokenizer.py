@@ -1,8 +1,9 @@
-from copy import deepcopy
 from dataclasses import dataclass, field
 from ast import literal_eval
 from enum import Enum
+from functools import lru_cache
 import re
+from sys import intern
 from typing import TYPE_CHECKING, Any
 
 
@@ -66,6 +67,10 @@ class Token:
     _macro_length: int = 0
     quote: str = ""
     _embeded_data: Any = field(default=None, repr=False)
+    _children: "Tokenizer | None" = field(default=None, repr=False)
+    """Tokenizer of the content of a paren_curly token, created on first access (See Tokenizer.from_paren_curly)"""
+    _length: int = field(default=-1, repr=False)
+    """Cached length, -1 if not yet calculated"""
 
     # def __new__(cls: type["Token"], token_type: TokenType, line: int, col: int, string: str) -> "Token":
     #     return super().__new__(cls)
@@ -88,11 +93,14 @@ class Token:
         :return: Length of the string
         """
         # if not self._macro_length:
-        return (
-            len(repr(self.string))
-            if self.token_type == TokenType.STRING
-            else len(self.string)
-        )
+        if self._length == -1:
+            _set_length(
+                self,
+                len(repr(self.string))
+                if self.token_type == TokenType.STRING
+                else len(self.string),
+            )
+        return self._length
         # else:
         #     return self._macro_length
 
@@ -124,6 +132,49 @@ class Token:
         """
         return cls(token_type, -1, -1, string)
 
+    @classmethod
+    def unchecked(
+        cls,
+        token_type: TokenType,
+        line: int,
+        col: int,
+        string: str,
+        quote: str = "",
+    ) -> "Token":
+        """
+        Create a token without going through dataclass __init__ and __post_init__ validation (for tokens created by the tokenizer itself)
+
+        :param token_type: Type of the token
+        :param line: Which line it's found in
+        :param col: Which column it's found in
+        :param string: The string representation
+        :param quote: Quotation mark of string token, defaults to ""
+        :return: New token
+        """
+        token = _new_object(cls)
+        _set_token_type(token, token_type)
+        _set_line(token, line)
+        _set_col(token, col)
+        _set_string(token, string)
+        _set_macro_length(token, 0)
+        _set_quote(token, quote)
+        _set_embeded_data(token, None)
+        _set_children(token, None)
+        _set_length(token, -1)
+        return token
+
+
+_new_object = object.__new__
+_set_token_type = Token.token_type.__set__  # type: ignore
+_set_line = Token.line.__set__  # type: ignore
+_set_col = Token.col.__set__  # type: ignore
+_set_string = Token.string.__set__  # type: ignore
+_set_macro_length = Token._macro_length.__set__  # type: ignore
+_set_quote = Token.quote.__set__  # type: ignore
+_set_embeded_data = Token._embeded_data.__set__  # type: ignore
+_set_children = Token._children.__set__  # type: ignore
+_set_length = Token._length.__set__  # type: ignore
+
 
 @dataclass(frozen=True, eq=False, slots=True)
 class Pos:
@@ -173,6 +224,83 @@ PAREN_PAIR = {
 
 OPERATORS = {"+", "-", "*", "/", ">", "<", "=", "%", ":", "!", "|", "&", "?", "\\"}
 
+PAREN_SKIP = re.compile(r"[^(){}\[\]\"'`#/\n]+")
+"""Run of characters inside parenthesis that doesn't change tokenizer state"""
+STRING_SKIP = re.compile(r"[^\"'`\\\n]+")
+"""Run of characters inside string that doesn't change tokenizer state"""
+COMMENT_SKIP = re.compile(r"[^\n]+")
+"""Run of characters inside comment that doesn't change tokenizer state"""
+KEYWORD_SKIP = re.compile(r"[^\s\"'{(\[,;+\-*/><=%:!|&?\\]+")
+"""Run of characters that continues a keyword"""
+WHITESPACE_SKIP = re.compile(r"[^\S\n]+")
+"""Run of whitespaces between tokens"""
+
+
+class SourceFile:
+    """
+    Entire string of a source file with an index of where each line starts
+
+    Shared by every tokenizer of the same file (see `get_source_file`), so that getting a line doesn't split the entire file
+
+    :param string: Entire string read from a file
+    """
+
+    __slots__ = ("string", "line_offsets")
+
+    string: str
+    """Entire string read from a file"""
+    line_offsets: list[int]
+    """Index in string where each line starts (line 1 is at index 0 of the list)"""
+
+    def __init__(self, string: str) -> None:
+        self.string = string
+        self.line_offsets = [0]
+        self.line_offsets.extend(
+            match.end() for match in re.finditer(NEW_LINE, string)
+        )
+
+    @property
+    def line_count(self) -> int:
+        """Amount of lines (Same as `len(string.split("\\n"))`)"""
+        return len(self.line_offsets)
+
+    def line(self, line: int) -> str:
+        """
+        Get a line without its new line character (Same as `string.split("\\n")[line - 1]`)
+
+        :param line: Line number, starts at 1 (Non-positive number counts from the end)
+        :raises IndexError: Line doesn't exist
+        :return: Content of the line
+        """
+        index = line - 1
+        if index < 0:
+            index += len(self.line_offsets)
+        start = self.line_offsets[index]
+        if index + 1 < len(self.line_offsets):
+            return self.string[start: self.line_offsets[index + 1] - 1]
+        return self.string[start:]
+
+    def offset(self, line: int, col: int) -> int:
+        """
+        Get index in string of a position
+
+        :param line: Line number, starts at 1
+        :param col: Column number, starts at 1
+        :return: Index in string
+        """
+        return self.line_offsets[line - 1] + col - 1
+
+
+@lru_cache(maxsize=64)
+def get_source_file(string: str) -> SourceFile:
+    """
+    Get SourceFile of an entire string of a source file, reusing the index of the same string
+
+    :param string: Entire string read from a file
+    :return: SourceFile
+    """
+    return SourceFile(string)
+
 
 class Tokenizer:
     """
@@ -209,6 +337,7 @@ class Tokenizer:
         "is_comment",
         "allow_semicolon",
         "macro_factory",
+        "header",
     )
 
     programs: list[list[Token]]
@@ -258,6 +387,8 @@ class Tokenizer:
     """Whether to allow semicolon at the next char(For minecraft array `[I;int, ...]`)"""
     macro_factory: tuple[str, MacroFactory, int, Pos] | None
     """Tuple of (Macro's name and MacroFactory and argument count and the position)"""
+    header: Header
+    """Header of the compile context the tokenizer was created in"""
 
     def __init__(
         self,
@@ -270,6 +401,7 @@ class Tokenizer:
         allow_semicolon: bool = False,
     ) -> None:
         logger.debug("Initializing Tokenizer")
+        self.header = Header()
         self.macro_factory = None
         self.allow_semicolon = allow_semicolon
         self.raw_string = raw_string
@@ -282,11 +414,112 @@ class Tokenizer:
             self.raw_string, line=line, col=col, expect_semicolon=expect_semicolon
         )
 
+    @property
+    def source(self) -> SourceFile:
+        """SourceFile of file_string, for getting a line without splitting the entire file"""
+        return get_source_file(self.file_string)
+
+    @classmethod
+    def from_programs(
+        cls, programs: list[list[Token]], raw_string: str, file_path_str: str
+    ) -> "Tokenizer":
+        """
+        Create a tokenizer of already tokenized programs without parsing (Used by compile cache)
+
+        :param programs: List of lines(list of tokens)
+        :param raw_string: Raw string read from file
+        :param file_path_str: File path as string
+        :return: Tokenizer
+        """
+        tokenizer = cls.__new__(cls)
+        tokenizer.header = Header()
+        tokenizer.macro_factory = None
+        tokenizer.allow_semicolon = False
+        tokenizer.raw_string = raw_string
+        tokenizer.file_string = raw_string
+        tokenizer.file_path = file_path_str
+        tokenizer.list_of_keywords = programs
+        tokenizer.programs = programs
+        tokenizer.line = raw_string.count(NEW_LINE) + 1
+        tokenizer.col = 0
+        tokenizer.keywords = []
+        tokenizer.state = None
+        tokenizer.token_str = ""
+        tokenizer.token_pos = None
+        tokenizer.quote = None
+        tokenizer.is_escaped = False
+        tokenizer.paren = None
+        tokenizer.r_paren = None
+        tokenizer.paren_count = 0
+        tokenizer.is_string = False
+        tokenizer.is_comment = False
+        tokenizer.is_slash = False
+        return tokenizer
+
+    @classmethod
+    def from_paren_curly(
+        cls, token: Token, file_path_str: str, file_string: str
+    ) -> tuple["Tokenizer", list[list[Token]]]:
+        """
+        Get tokenizer and programs of the content of a paren_curly token
+
+        The content is only tokenized on first access, the tokenizer is then attached to the token so that callers reaching the same code block (lexer, datapack, pre-function parsing) share one tokenization instead of each tokenizing it again.
+        This does not make nested blocks linear: the enclosing tokenizer still scans the text of every nested block to find its closing bracket (with `PAREN_SKIP` jumping over plain characters), so a block nested N deep is scanned N+1 times in total.
+
+        :param token: paren_curly token
+        :param file_path_str: File path to current JMC function as string
+        :param file_string: Entire string read from current file
+        :return: Tokenizer and a copy of its programs (safe to be mutated)
+        """
+        tokenizer = token._children
+        if (
+            tokenizer is None
+            or tokenizer.file_path != file_path_str
+            or tokenizer.file_string is not file_string
+        ):
+            tokenizer = cls(
+                token.string[1:-1],
+                file_path_str,
+                line=token.line,
+                col=token.col,
+                file_string=file_string,
+            )
+            _set_children(token, tokenizer)
+        elif not hasattr(tokenizer, "header"):  # Unpickled from a worker process
+            tokenizer.header = Header()
+        return tokenizer, [program.copy() for program in tokenizer.programs]
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Header is per process and compile context, see `from_paren_curly`
+        return {
+            slot: getattr(self, slot)
+            for slot in Tokenizer.__slots__
+            if slot != "header" and hasattr(self, slot)
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def fork(self) -> "Tokenizer":
+        """
+        Create a tokenizer that shares source strings and programs with this tokenizer but has its own parsing state (Cheap alternative to deepcopy)
+
+        :return: Forked tokenizer
+        """
+        tokenizer = Tokenizer.__new__(Tokenizer)
+        for slot in Tokenizer.__slots__:
+            if hasattr(self, slot):  # programs isn't set yet while still parsing
+                setattr(tokenizer, slot, getattr(self, slot))
+        tokenizer.keywords = []
+        tokenizer.list_of_keywords = []
+        return tokenizer
+
     def append_token(self) -> None:
         """
         Append the current token into self.keywords
         """
-        header = Header()
+        header = self.header
         if self.state is None:
             raise ValueError(
                 "Tokenizer.append_token() called but Tokenizer.state is still None"
@@ -298,12 +531,16 @@ class Tokenizer:
         quote = ""
         if self.quote == Quote.BACKTICK:
             quote = self.quote
-        new_token = Token(
+        new_token = Token.unchecked(
             self.state,
             self.token_pos.line,
             self.token_pos.col,
-            self.token_str,
-            quote=quote,
+            (
+                intern(self.token_str)
+                if self.state == TokenType.KEYWORD or self.state == TokenType.OPERATOR
+                else self.token_str
+            ),
+            quote,
         )
         if (
             new_token.token_type == TokenType.KEYWORD
@@ -332,7 +569,7 @@ class Tokenizer:
             name, macro_factory, arg_count, token_pos = self.macro_factory
             self.macro_factory = None
             args: list[Token] = []
-            args_, kwargs = deepcopy(self).parse_func_args(new_token)
+            args_, kwargs = self.fork().parse_func_args(new_token)
             for arg_ in args_:
                 # if arg_[0].token_type != TokenType.KEYWORD:
                 #     raise JMCSyntaxException(
@@ -369,7 +606,7 @@ class Tokenizer:
         :raises JMCSyntaxWarning: Unnecessary semicolon
         """
         if len(self.keywords) != 0:
-            logger.debug(f"Appending keywords: {self.keywords}")
+            logger.debug("Appending keywords: %s", self.keywords)
             self.list_of_keywords.append(self.keywords)
             self.keywords = []
         else:
@@ -606,8 +843,57 @@ class Tokenizer:
                 self.is_slash = True
         return False
 
+    def __skip_run(self, string: str, index: int) -> int:
+        """
+        Consume a run of characters that can't change tokenizer state with a single regex match
+
+        :param string: String being parsed
+        :param index: Index of the next character
+        :return: Index of the next character that needs to be parsed by the state machine
+        """
+        if self.is_escaped:
+            return index
+        state = self.state
+        if state is None:
+            match = WHITESPACE_SKIP.match(string, index)
+            if match is None:
+                return index
+            end = match.end()
+            self.col += end - index
+            return end
+        if state == TokenType.KEYWORD:
+            match = KEYWORD_SKIP.match(string, index)
+        elif state == TokenType.STRING:
+            match = STRING_SKIP.match(string, index)
+        elif state == TokenType.COMMENT:
+            match = COMMENT_SKIP.match(string, index)
+        elif state == TokenType.PAREN:
+            if self.is_string:
+                match = STRING_SKIP.match(string, index)
+            elif self.is_comment:
+                match = COMMENT_SKIP.match(string, index)
+            else:
+                match = PAREN_SKIP.match(string, index)
+        else:
+            return index
+        if match is None:
+            return index
+        end = match.end()
+        if state != TokenType.COMMENT:
+            self.token_str += string[index:end]
+        self.col += end - index
+        self.is_slash = string[end - 1] == Re.SLASH
+        return end
+
     def __parse_chars(self, string: str, expect_semicolon: bool):
-        for char in string:
+        index = 0
+        length = len(string)
+        while index < length:
+            index = self.__skip_run(string, index)
+            if index == length:
+                break
+            char = string[index]
+            index += 1
             self.col += 1
             if char == Re.SEMICOLON and self.state is None and not expect_semicolon:
                 raise JMCSyntaxException("Unexpected semicolon(;)", None, self)
@@ -754,7 +1040,7 @@ class Tokenizer:
         tokens: list[Token] = []
         col = token.col
         for string in strings:
-            tokens.append(Token(TokenType.KEYWORD, token.line, col, string))
+            tokens.append(Token.unchecked(TokenType.KEYWORD, token.line, col, string))
             col += len(string)
         return tokens
 
@@ -309,6 +309,11 @@ class GlobalData(SingleTon):
         "LOG_PATH",
         "EVENT",
         "commands",
+        "use_cache",
+        "zip_output",
+        "jobs",
+        "function_profile",
+        "profile",
     )
 
     def init(self, version: str, config_file_name: str) -> None:
@@ -320,7 +325,17 @@ class GlobalData(SingleTon):
         self.commands: dict[str, tuple[TerminalCommand, str]] = {}
         """Dictionary of command_name and tuple of function and its usage(string)"""
         self.EVENT = threading.Event()
-        self.interval = -1
+        self.interval: float = -1
+        self.use_cache: bool = True
+        """Whether to use compile cache (`.jmc_cache` folder next to main JMC file)"""
+        self.zip_output: Path | None = None
+        """Path to zip file to write the datapack into instead of output folder"""
+        self.jobs: int = 1
+        """Amount of worker processes to tokenize files with"""
+        self.function_profile: Path | None = None
+        """Path to in-game profiling data for profile-guided optimization"""
+        self.profile: Path | None = None
+        """Path (without suffix) to write the compiler's own profile report to"""
 
     def add_command(self, func: TerminalCommand, usage: str) -> None:
         command = func.__name__
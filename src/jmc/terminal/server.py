@@ -0,0 +1,318 @@
+"""Module handling compile daemon (`jmc serve`) that keeps compiler state warm between compilations"""
+
+from json import JSONDecodeError, dumps, loads
+from pathlib import Path
+import re
+import socket
+import socketserver
+from threading import Lock
+from time import perf_counter
+from traceback import format_exc
+from typing import Any, TextIO
+
+from ..compile import EXCEPTIONS, Logger
+from ..compile.cache import CompileCache
+from ..compile.compiling import read_cert, read_header, build
+from ..compile.context import CompileContext
+from ..compile.header import Header
+from ..compile.lexer import Lexer
+from ..config import CONFIG_FILE_NAME
+from .configuration import Configuration, GlobalData
+
+logger = Logger(__name__)
+
+JSON_RPC_VERSION = "2.0"
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+ERROR_FILE_REGEX = re.compile(r"^In (.+?)(?::\d+(?::\d+)?)?$", re.MULTILINE)
+"""Regex of the file line of JMC error message (`In <file>[:<line>[:<col>]]`)"""
+ERROR_POSITION_REGEX = re.compile(r" at line (\d+)(?: col (\d+))?\.")
+"""Regex of the position in JMC error message (`at line <line> col <col>.`)"""
+
+
+class JSONRPCError(Exception):
+    """
+    Error to respond to a JSON-RPC request with
+
+    :param code: JSON-RPC error code
+    :param message: Error message
+    """
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class _Workspace:
+    """State of a workspace kept between compilations"""
+
+    __slots__ = ("context", "memory", "manifest", "lock")
+
+    def __init__(self) -> None:
+        self.context = CompileContext()
+        self.memory: dict[str, bytes] = {}
+        """Pickled tokens of every file used in the last compilation"""
+        self.manifest: dict[str, str] = {}
+        """Output manifest of the last compilation"""
+        self.lock = Lock()
+
+
+class CompileServer:
+    """
+    JSON-RPC 2.0 server compiling JMC workspaces, one request/response per line
+
+    Each workspace keeps its own CompileContext, tokens of every file (in memory) and output manifest of the last compilation,
+    so recompiling only tokenizes changed files and reports which output files changed.
+
+    Methods:
+    - `compile`: `{"workspace": str, "envs"?: list[str], "pack_format"?: str}` -> `{"success", "time", "changed", "deleted", "diagnostics", "messages"}`
+    - `ping`: -> `"pong"`
+    - `shutdown`: -> `null`, then stop serving
+    """
+
+    __slots__ = ("workspaces", "is_running", "lock")
+
+    workspaces: dict[Path, _Workspace]
+    """Dictionary of workspace folder and its state"""
+    is_running: bool
+    """Whether the server should keep serving"""
+    lock: Lock
+    """Lock for workspaces dictionary"""
+
+    def __init__(self) -> None:
+        self.workspaces = {}
+        self.is_running = True
+        self.lock = Lock()
+
+    def handle_line(self, line: str) -> str | None:
+        """
+        Handle a line of JSON-RPC request
+
+        :param line: JSON string of a request
+        :return: JSON string of the response, None for notification
+        """
+        try:
+            request = loads(line)
+        except JSONDecodeError as error:
+            return dumps(self.__error(None, PARSE_ERROR, f"Parse error: {error}"))
+        response = self.handle_request(request)
+        if response is None:
+            return None
+        return dumps(response)
+
+    def handle_request(self, request: Any) -> dict[str, Any] | None:
+        """
+        Handle a JSON-RPC request
+
+        :param request: Decoded request
+        :return: Response, None for notification
+        """
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return self.__error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        params = request.get("params", {})
+        method = request["method"]
+        try:
+            if not isinstance(params, dict):
+                raise JSONRPCError(INVALID_PARAMS, "Invalid params: params must be an object")
+            if method == "compile":
+                self.__check_params(params, {"workspace"}, {"envs", "pack_format"})
+                result: Any = self.compile(**params)
+            elif method == "ping":
+                result = "pong"
+            elif method == "shutdown":
+                self.is_running = False
+                result = None
+            else:
+                raise JSONRPCError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        except JSONRPCError as error:
+            return self.__error(request_id, error.code, str(error))
+        except Exception as error:
+            logger.exception("Non-JMC Error occur")
+            return self.__error(request_id, INTERNAL_ERROR, f"{type(error).__name__}: {error}", format_exc())
+        if "id" not in request:
+            return None
+        return {"jsonrpc": JSON_RPC_VERSION, "id": request_id, "result": result}
+
+    @staticmethod
+    def __check_params(params: dict[str, Any], required: set[str], optional: set[str]) -> None:
+        missing = required - params.keys()
+        if missing:
+            raise JSONRPCError(INVALID_PARAMS, f"Invalid params: missing {', '.join(sorted(missing))}")
+        unexpected = params.keys() - required - optional
+        if unexpected:
+            raise JSONRPCError(INVALID_PARAMS, f"Invalid params: unexpected {', '.join(sorted(unexpected))}")
+
+    @staticmethod
+    def __error(request_id: Any, code: int, message: str, data: Any = None) -> dict[str, Any]:
+        error: dict[str, Any] = {"code": code, "message": message}
+        if data is not None:
+            error["data"] = data
+        return {"jsonrpc": JSON_RPC_VERSION, "id": request_id, "error": error}
+
+    def __workspace(self, folder: Path) -> _Workspace:
+        with self.lock:
+            if folder not in self.workspaces:
+                self.workspaces[folder] = _Workspace()
+            return self.workspaces[folder]
+
+    def compile(
+        self,
+        workspace: str,
+        envs: list[str] | None = None,
+        pack_format: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Compile a workspace
+
+        :param workspace: Folder containing JMC configuration file
+        :param envs: Environment variables to set to 1, defaults to None
+        :param pack_format: pack_format to compile with instead of the one in configuration, defaults to None
+        :raises JSONRPCError: Invalid workspace
+        :return: Whether it succeeded, time it took, changed and deleted output files (relative to output folder), diagnostics and messages
+        """
+        folder = Path(workspace).resolve()
+        config = self.__read_config(folder)
+        if pack_format is not None:
+            config.pack_format = str(pack_format)
+        state = self.__workspace(folder)
+        messages: list[str] = []
+        diagnostics: list[dict[str, Any]] = []
+        with state.lock, state.context.use():
+            state.context.message_handler = messages.append
+            start_time = perf_counter()
+            try:
+                Header.clear()
+                envs_ = list(envs) if envs is not None else []
+                Header().envs = envs_.copy()
+                read_header(config)
+                is_delete, cert_config, cert_file = read_cert(config)
+                cache = CompileCache.from_config(config, envs_, state.memory)
+                lexer = Lexer(config, cache=cache)
+                build(
+                    lexer.datapack,
+                    config,
+                    is_delete,
+                    cert_config,
+                    cert_file,
+                    record_manifest=True,
+                )
+            except EXCEPTIONS as error:
+                diagnostics.append(self.diagnostic(error))
+            finally:
+                state.context.message_handler = None
+            stop_time = perf_counter()
+            if diagnostics:
+                changed: list[str] = []
+                deleted: list[str] = []
+            else:
+                state.memory = cache.touched
+                manifest = Header().output_manifest
+                changed = sorted(
+                    path for path, content_hash in manifest.items()
+                    if state.manifest.get(path) != content_hash
+                )
+                deleted = sorted(state.manifest.keys() - manifest.keys())
+                state.manifest = manifest
+        logger.info(
+            f"Served compilation of {folder} in {stop_time - start_time:.5f} seconds"
+        )
+        return {
+            "success": not diagnostics,
+            "time": stop_time - start_time,
+            "changed": changed,
+            "deleted": deleted,
+            "diagnostics": diagnostics,
+            "messages": messages,
+        }
+
+    @staticmethod
+    def __read_config(folder: Path) -> Configuration:
+        try:
+            json = loads((folder / CONFIG_FILE_NAME).read_text(encoding="utf-8"))
+            return Configuration(
+                GlobalData(),
+                namespace=json["namespace"],
+                description=json["description"],
+                pack_format=json["pack_format"],
+                target=folder / json["target"],
+                output=folder / json["output"],
+                is_configed=True,
+            )
+        except (OSError, JSONDecodeError, KeyError, TypeError) as error:
+            raise JSONRPCError(
+                INVALID_PARAMS,
+                f"Invalid workspace, {CONFIG_FILE_NAME} can't be read: {error!r}",
+            ) from error
+
+    @staticmethod
+    def diagnostic(error: Exception) -> dict[str, Any]:
+        """
+        Turn JMC exception into diagnostic
+
+        :param error: JMC exception
+        :return: Dictionary of type, message, and file/line/col if the message has them
+        """
+        message = str(error)
+        diagnostic: dict[str, Any] = {"type": type(error).__name__, "message": message}
+        match = ERROR_FILE_REGEX.search(message)
+        if match is not None:
+            diagnostic["file"] = match.group(1)
+        match = ERROR_POSITION_REGEX.search(message)
+        if match is not None:
+            diagnostic["line"] = int(match.group(1))
+            if match.group(2) is not None:
+                diagnostic["col"] = int(match.group(2))
+        return diagnostic
+
+    def serve_stream(self, input_stream: TextIO, output_stream: TextIO) -> None:
+        """
+        Serve requests line by line until shutdown or end of input
+
+        :param input_stream: Stream to read requests from (e.g. stdin)
+        :param output_stream: Stream to write responses to (e.g. stdout)
+        """
+        for line in input_stream:
+            if not line.strip():
+                continue
+            response = self.handle_line(line)
+            if response is not None:
+                output_stream.write(response + "\n")
+                output_stream.flush()
+            if not self.is_running:
+                break
+
+    def serve_socket(self, path: Path) -> None:
+        """
+        Serve requests from clients of a Unix socket until shutdown, each client in its own thread
+
+        :param path: Path of the socket file
+        :raises OSError: Unix socket isn't supported
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix socket is not supported on this platform, use stdio")
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line_bytes in self.rfile:
+                    line = line_bytes.decode("utf-8")
+                    if not line.strip():
+                        continue
+                    response = server.handle_line(line)
+                    if response is not None:
+                        self.wfile.write((response + "\n").encode("utf-8"))
+                        self.wfile.flush()
+                    if not server.is_running:
+                        break
+
+        path.unlink(missing_ok=True)
+        with socketserver.ThreadingUnixStreamServer(path.as_posix(), Handler) as unix_server:
+            unix_server.timeout = 0.5
+            logger.info(f"Serving on {path}")
+            while self.is_running:
+                unix_server.handle_request()
+        path.unlink(missing_ok=True)
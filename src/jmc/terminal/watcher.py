@@ -0,0 +1,146 @@
+"""Module handling change detection of source files for watch mode"""
+
+from pathlib import Path
+from threading import Event
+from time import monotonic
+
+from ..compile import Logger
+
+logger = Logger(__name__)
+
+Signature = tuple[int, int] | tuple[tuple[str, int, int], ...] | None
+"""(mtime_ns, size) of a file, sorted signatures of jmc files inside a folder or None if missing"""
+
+FOLDER_GLOB = "**/*.jmc"
+
+
+def path_signature(path: Path) -> Signature:
+    """
+    Get a cheap signature of a path that changes whenever its content is likely to change
+
+    :param path: Path to a file or a folder (folder from `import "folder/*"`)
+    :return: Signature
+    """
+    try:
+        if path.is_dir():
+            signatures: list[tuple[str, int, int]] = []
+            for sub_path in path.glob(FOLDER_GLOB):
+                stat = sub_path.stat()
+                signatures.append((sub_path.as_posix(), stat.st_mtime_ns, stat.st_size))
+            return tuple(sorted(signatures))
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def is_modified_since(signature: Signature, time_ns: int) -> bool:
+    """
+    Check whether a path was modified at or after a point in time
+
+    :param signature: Signature of the path (See path_signature)
+    :param time_ns: Time in nanoseconds since the epoch
+    :return: Whether the file (or any jmc file inside the folder) has a newer mtime
+    """
+    if signature is None:
+        return False
+    if isinstance(signature[0], int):
+        return signature[0] >= time_ns
+    return any(mtime_ns >= time_ns for _, mtime_ns, _ in signature)
+
+
+class FileWatcher:
+    """
+    Watch a set of source files by scanning their mtime and size
+
+    :param debounce: Seconds the files have to stay unchanged before a change is reported, defaults to 0.2
+    """
+
+    __slots__ = ("paths", "snapshot", "debounce")
+
+    paths: set[Path]
+    """Set of watched paths"""
+    snapshot: dict[Path, Signature]
+    """Dictionary of watched path and its last seen signature"""
+    debounce: float
+    """Seconds the files have to stay unchanged before a change is reported"""
+
+    def __init__(self, debounce: float = 0.2) -> None:
+        self.paths = set()
+        self.snapshot = {}
+        self.debounce = debounce
+
+    def set_paths(
+        self,
+        paths: set[Path],
+        snapshot: dict[Path, Signature] | None = None,
+        start_ns: int | None = None,
+    ) -> None:
+        """
+        Replace watched paths and take a new snapshot of them
+
+        When the paths come from a compilation, pass the snapshot and time taken before it started so that files edited while compiling are still reported as changed
+
+        :param paths: Set of paths to watch
+        :param snapshot: Signatures scanned before the paths were read, kept for the paths it contains, defaults to None
+        :param start_ns: Time (`time.time_ns()`) before the paths were read, paths missing from `snapshot` modified since then are reported as changed, defaults to None
+        """
+        self.paths = paths
+        current = self.scan()
+        if snapshot is not None:
+            for path, signature in current.items():
+                if path in snapshot:
+                    current[path] = snapshot[path]
+                elif start_ns is not None and is_modified_since(signature, start_ns):
+                    current[path] = None
+        self.snapshot = current
+        logger.debug(f"Watching {len(self.paths)} path(s)")
+
+    def scan(self) -> dict[Path, Signature]:
+        """
+        Get current signatures of every watched path
+
+        :return: Dictionary of path and signature
+        """
+        return {path: path_signature(path) for path in self.paths}
+
+    def changed(self) -> set[Path]:
+        """
+        Get paths that changed since the last snapshot and update the snapshot
+
+        :return: Set of changed paths
+        """
+        current = self.scan()
+        changed = {
+            path
+            for path, signature in current.items()
+            if self.snapshot.get(path) != signature
+        }
+        self.snapshot = current
+        return changed
+
+    def wait_for_change(self, event: Event, interval: float) -> set[Path]:
+        """
+        Block until a watched path changed and stopped changing for `debounce` seconds
+
+        :param event: Event to stop waiting
+        :param interval: Seconds between each scan
+        :return: Set of changed paths, empty set if the event was set
+        """
+        changed: set[Path] = set()
+        while not event.wait(interval):
+            changed |= self.changed()
+            if changed:
+                break
+        else:
+            return set()
+
+        last_change = monotonic()
+        while monotonic() - last_change < self.debounce:
+            if event.wait(min(interval, self.debounce)):
+                return set()
+            new_changed = self.changed()
+            if new_changed:
+                changed |= new_changed
+                last_change = monotonic()
+        return changed
@@ -5,11 +5,14 @@ import os
 from pathlib import Path
 import sys
 import threading
-from time import perf_counter
+from time import perf_counter, time_ns
 from traceback import format_exc
 
 from .compile.header import Header
 from .compile.hooks import register_message
+from .compile.output_sink import ZipSink
+from .compile.profiler import PROFILE_COLLAPSED_SUFFIX, PROFILE_REPORT_SUFFIX
+from .terminal.watcher import FileWatcher
 from .terminal import GlobalData, add_command, Colors, eprint, error_report, get_input, handle_exception, press_enter, pprint, RestartException
 from .compile import compile_jmc, Logger, EXCEPTIONS, get_debug_log, get_info_log
 
@@ -17,6 +20,8 @@ global_data: GlobalData = GlobalData()
 logger = Logger(__name__)
 
 NEW_LINE = "\n"
+WATCH_INTERVAL = 0.5
+"""Seconds between each scan of source files in watch mode"""
 
 
 @add_command("help [<command>]", rename="help")
@@ -46,25 +51,47 @@ def exit_() -> None:
 @add_command("compile [env ...]", "compile")
 def compile_(*envs: str) -> None:
     """Compile main JMC file"""
+    __compile(envs)
+
+
+def __compile(envs: tuple[str, ...]) -> bool:
+    """
+    Compile main JMC file
+
+    :param envs: Environment variables to set to 1
+    :return: Whether the compilation succeeded
+    """
     register_message(lambda msg: pprint(msg, Colors.YELLOW))
     pprint("Compiling...", Colors.INFO)
     if not global_data.config:
         global_data.config.ask_and_save()
-        return
+        return False
     try:
         start_time = perf_counter()
         Header().envs = list(envs)
-        compile_jmc(global_data.config, debug=True)
+        if global_data.zip_output is None:
+            compile_jmc(global_data.config, debug=True, use_cache=global_data.use_cache, jobs=global_data.jobs, function_profile=global_data.function_profile, profile=global_data.profile)
+        else:
+            with ZipSink(global_data.zip_output) as sink:
+                compile_jmc(global_data.config, debug=True, use_cache=global_data.use_cache, sink=sink, jobs=global_data.jobs, function_profile=global_data.function_profile, profile=global_data.profile)
         finished_compiled_time = Header().finished_compiled_time
         stop_time = perf_counter()
         pprint(
             f"Compiled successfully in {finished_compiled_time - start_time:.5f} seconds, datapack built in {stop_time - finished_compiled_time:.5f} seconds", Colors.INFO)
+        build_stats = {key: value for key, value in Header().build_stats.items() if value}
+        if build_stats:
+            pprint("Build stats: " + ", ".join(f"{key}={value}" for key, value in build_stats.items()), Colors.INFO)
+        if global_data.profile is not None:
+            pprint(f"Profile written to {global_data.profile}{PROFILE_REPORT_SUFFIX} and {global_data.profile}{PROFILE_COLLAPSED_SUFFIX}", Colors.INFO)
     except EXCEPTIONS as error:
         logger.debug(format_exc())
         error_report(error)
+        return False
     except Exception as error:
         logger.exception("Non-JMC Error occur")
         handle_exception(error, global_data.EVENT, is_ok=False)
+        return False
+    return True
 
 
 def __log_debug() -> None:
@@ -170,30 +197,56 @@ def config(mode: str = "") -> None:
         raise TypeError(f"Unrecognized mode '{mode}'")
 
 
-def __background() -> None:
-    while not global_data.EVENT.is_set():
-        logger.debug("Auto compiling")
-        compile_()
-        global_data.EVENT.wait(global_data.interval)
+def __source_files() -> set[Path]:
+    """
+    Get every source file the last compilation depended on
 
+    :return: Set of paths to watch
+    """
+    header = Header()
+    config = global_data.config
+    return (
+        {config.target, Path(config.target_str[: -len(".jmc")] + ".hjmc")}
+        | {Path(file_read) for file_read in header.file_read}
+        | header.source_files
+    )
 
-@add_command("autocompile <interval (second)>")
-def autocompile(interval: str) -> None:
-    """Start automatically compiling with certain interval (Press Enter to stop)"""
-    try:
-        global_data.interval = int(interval)
-    except ValueError as error:
-        raise TypeError("Invalid integer for interval") from error
-    if global_data.interval == 0:
-        eprint("Interval cannot be 0 seconds")
-        return
 
+def watch_loop(envs: tuple[str, ...], interval: float) -> None:
+    """
+    Compile, then recompile every time a source file changes until global_data.EVENT is set
+
+    :param envs: Environment variables to set to 1
+    :param interval: Seconds between each scan of source files
+    """
+    watcher = FileWatcher()
+    while not global_data.EVENT.is_set():
+        logger.debug("Auto compiling")
+        snapshot = watcher.scan()
+        start_ns = time_ns()
+        is_success = __compile(envs)
+        source_files = __source_files()
+        if not is_success:
+            source_files |= watcher.paths
+        watcher.set_paths(source_files, snapshot, start_ns)
+        pprint(f"Watching {len(source_files)} file(s) for changes...", Colors.INFO)
+        changed = watcher.wait_for_change(global_data.EVENT, interval)
+        if changed:
+            pprint(
+                "Changes detected: " + ", ".join(sorted(path.name for path in changed)),
+                Colors.INFO,
+            )
+
+
+def __watch_until_enter(envs: tuple[str, ...], interval: float) -> None:
     if not global_data.config:
         global_data.config.ask_and_save()
         return
 
+    global_data.interval = interval
     thread = threading.Thread(
-        target=__background,
+        target=watch_loop,
+        args=(envs, interval),
         daemon=True
     )
     global_data.EVENT.clear()
@@ -205,6 +258,25 @@ def autocompile(interval: str) -> None:
     thread.join()
 
 
+@add_command("watch [env ...]")
+def watch(*envs: str) -> None:
+    """Compile and recompile whenever a source file changes (Press Enter to stop)"""
+    __watch_until_enter(envs, WATCH_INTERVAL)
+
+
+@add_command("autocompile <interval (second)>")
+def autocompile(interval: str) -> None:
+    """Compile and recompile whenever a source file changes, checking every interval (Press Enter to stop)"""
+    try:
+        interval_ = int(interval)
+    except ValueError as error:
+        raise TypeError("Invalid integer for interval") from error
+    if interval_ == 0:
+        eprint("Interval cannot be 0 seconds")
+        return
+    __watch_until_enter((), interval_)
+
+
 @add_command("cd <path>", rename="cd")
 def chdir(path: str) -> None:
     """Change current directory"""
@@ -22,7 +22,7 @@ setup(
     description=DESCRIPTION,
     long_description_content_type="text/markdown",
     long_description=README,
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=[],
     keywords=["python", "minecraft", "mcfunction", "datapack", "compiler"],
     classifiers=[
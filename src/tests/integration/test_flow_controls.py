@@ -90,6 +90,44 @@ scoreboard players set __if_else__ __variable__ 1
             """),
         )
 
+    def test_if_deduplicate(self):
+        pack = JMCTestPack().set_jmc_file("""
+function a() {
+    if (entity @s) { say "1"; say "2"; }
+    if (entity @p) { say "1"; say "2"; }
+    if (entity @a) { if (entity @e) { say "3"; say "4"; } say "5"; }
+    if (entity @r) { if (entity @e) { say "3"; say "4"; } say "5"; }
+}
+        """).set_header_file("#optimize").build()
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/functions/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/functions/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+> VIRTUAL/data/TEST/functions/a.mcfunction
+execute if entity @s run function TEST:__private__/if_else/0
+execute if entity @p run function TEST:__private__/if_else/0
+execute if entity @a run function TEST:__private__/if_else/3
+execute if entity @r run function TEST:__private__/if_else/3
+> VIRTUAL/data/TEST/functions/__private__/if_else/0.mcfunction
+say 1
+say 2
+> VIRTUAL/data/TEST/functions/__private__/if_else/2.mcfunction
+say 3
+say 4
+> VIRTUAL/data/TEST/functions/__private__/if_else/3.mcfunction
+execute if entity @e run function TEST:__private__/if_else/2
+say 5
+            """),
+        )
+
 
 class TestDoWhile(unittest.TestCase):
 
@@ -410,6 +448,112 @@ tellraw @s "You are a god?"
             """),
         )
 
+    def test_switch_case_sparse_bst(self):
+        pack = JMCTestPack().set_jmc_file("""
+switch($x) {
+    case 1: say "1";
+    case 5: say "5";
+    case 9: say "9";
+    default: say "d";
+}
+        """).set_header_file("#forcebst").set_pack_format(57).build()
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/function/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/function/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+scoreboard players operation __switch__0 __variable__ = $x __variable__
+function TEST:__private__/switch_case/0
+> VIRTUAL/data/TEST/function/__private__/switch_case/0.mcfunction
+execute if score __switch__0 __variable__ matches ..1 run function TEST:__private__/switch_case/2
+execute if score __switch__0 __variable__ matches 2.. run function TEST:__private__/switch_case/3
+> VIRTUAL/data/TEST/function/__private__/switch_case/1.mcfunction
+say d
+> VIRTUAL/data/TEST/function/__private__/switch_case/2.mcfunction
+execute if score __switch__0 __variable__ matches 1 run function TEST:__private__/switch_case/4
+execute unless score __switch__0 __variable__ matches 1 run function TEST:__private__/switch_case/1
+> VIRTUAL/data/TEST/function/__private__/switch_case/3.mcfunction
+execute if score __switch__0 __variable__ matches 2..5 run function TEST:__private__/switch_case/5
+execute if score __switch__0 __variable__ matches 6.. run function TEST:__private__/switch_case/6
+> VIRTUAL/data/TEST/function/__private__/switch_case/4.mcfunction
+say 1
+> VIRTUAL/data/TEST/function/__private__/switch_case/5.mcfunction
+execute if score __switch__0 __variable__ matches 5 run function TEST:__private__/switch_case/7
+execute unless score __switch__0 __variable__ matches 5 run function TEST:__private__/switch_case/1
+> VIRTUAL/data/TEST/function/__private__/switch_case/6.mcfunction
+execute if score __switch__0 __variable__ matches 9 run function TEST:__private__/switch_case/8
+execute unless score __switch__0 __variable__ matches 9 run function TEST:__private__/switch_case/1
+> VIRTUAL/data/TEST/function/__private__/switch_case/7.mcfunction
+say 5
+> VIRTUAL/data/TEST/function/__private__/switch_case/8.mcfunction
+say 9
+            """),
+        )
+
+    def test_switch_case_optimize(self):
+        pack = JMCTestPack().set_jmc_file("""
+switch($x) {
+    case 1: say "1";
+    case 5: say "5";
+    default: say "d";
+}
+        """).set_header_file("#optimize").set_pack_format(57).build()
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/function/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/function/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+scoreboard players operation __switch__0 __variable__ = $x __variable__
+execute if score __switch__0 __variable__ matches 1 run say 1
+execute if score __switch__0 __variable__ matches 5 run say 5
+execute unless score __switch__0 __variable__ matches 1 unless score __switch__0 __variable__ matches 5 run say d
+            """),
+        )
+
+    def test_switch_case_optimize_with(self):
+        pack = JMCTestPack().set_jmc_file("""
+switch($x) {
+    case 1: $say "$(text)";
+    case 2: say "2";
+} with a:b::c;
+        """).set_header_file("#optimize").set_pack_format(57).build()
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/function/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/function/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+execute store result storage TEST:__storage__ switch_key int 1 run scoreboard players get $x __variable__
+function TEST:__private__/switch_case/0/select with storage TEST:__storage__
+> VIRTUAL/data/TEST/function/__private__/switch_case/0/1.mcfunction
+$say $(text)
+> VIRTUAL/data/TEST/function/__private__/switch_case/0/2.mcfunction
+say 2
+> VIRTUAL/data/TEST/function/__private__/switch_case/0/select.mcfunction
+$function TEST:__private__/switch_case/0/$(switch_key) with storage a:b c
+            """),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ sys.path.append("./src")  # noqa
 import unittest
 from tests.utils import string_to_tree_dict
 from jmc.compile.test_compile import JMCTestPack
+from jmc.compile.function_profile import FunctionProfile
 
 from jmc.compile.exception import HeaderSyntaxException, JMCSyntaxException
 
@@ -292,6 +293,338 @@ execute if score @s test matches -2..-1 run say 3
             """),
         )
 
+    def test_stablenames(self):
+        jmc_file = """
+function a() {
+    if (entity @s) { say "1"; say "2"; }
+    while (entity @s) { say "3"; say "4"; }
+}
+        """
+        pack = (
+            JMCTestPack()
+            .set_jmc_file(jmc_file)
+            .set_header_file("#stablenames")
+            .build()
+        )
+        shifted_pack = (
+            JMCTestPack()
+            .set_jmc_file("""
+function b() {
+    if (entity @s) { say "5"; say "6"; }
+}
+        """ + jmc_file)
+            .set_header_file("#stablenames")
+            .build()
+        )
+
+        private_files = {
+            path for path in pack.built if "__private__" in path}
+        self.assertEqual(len(private_files), 2)
+        self.assertTrue(private_files < set(shifted_pack.built))
+        for path in private_files | {"VIRTUAL/data/TEST/functions/a.mcfunction"}:
+            self.assertEqual(pack.built[path], shifted_pack.built[path])
+        self.assertNotIn("if_else/0", pack.built["VIRTUAL/data/TEST/functions/a.mcfunction"])
+
+    def test_optimize(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file("""
+Particle.line("flame", distance=3, spread=2);
+execute as @a run Particle.line("flame", distance=3, spread=3);
+execute as @a run Particle.line("flame", distance=1, spread=1);
+while (entity @s) { say "1"; say "2"; }
+        """)
+            .set_header_file("#optimize")
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/functions/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/functions/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+particle flame ^ ^ ^1.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^2.5000000000 0 0 0 1 1 normal
+execute as @a run function TEST:__private__/particle_line/1
+execute as @a run particle flame ^ ^ ^1.0000000000 0 0 0 1 1 normal
+execute if entity @s run function TEST:__private__/while_loop/0
+> VIRTUAL/data/TEST/functions/__private__/particle_line/1.mcfunction
+particle flame ^ ^ ^1.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^2.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^3.0000000000 0 0 0 1 1 normal
+> VIRTUAL/data/TEST/functions/__private__/while_loop/0.mcfunction
+say 1
+say 2
+execute if entity @s run function TEST:__private__/while_loop/0
+            """),
+        )
+
+    def test_optimize_expression(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file("""
+$x := $y * 2;
+$x := ($a + $b) * ($a + $b);
+$x := ($a * $b) + ($a * $b) + 0;
+$x := $a * 1 + $b * 0;
+obj:@e[tag=t] := $y * 2;
+obj:@e[tag=t] := $a + $a;
+obj:@e[tag=t] := $a * $a;
+        """)
+            .set_header_file("#optimize")
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/functions/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/functions/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+scoreboard objectives add __int__ dummy
+scoreboard players set 2 __int__ 2
+scoreboard players operation $x __variable__ = $y __variable__
+scoreboard players operation $x __variable__ += $x __variable__
+scoreboard players operation $x __variable__ = $a __variable__
+scoreboard players operation $x __variable__ += $b __variable__
+scoreboard players operation $x __variable__ *= $x __variable__
+scoreboard players operation $x __variable__ = $a __variable__
+scoreboard players operation $x __variable__ *= $b __variable__
+scoreboard players operation $x __variable__ += $x __variable__
+scoreboard players operation $x __variable__ = $a __variable__
+scoreboard players operation @e[tag=t] obj = $y __variable__
+scoreboard players operation @e[tag=t] obj *= 2 __int__
+scoreboard players operation @e[tag=t] obj = $a __variable__
+scoreboard players operation @e[tag=t] obj += $a __variable__
+scoreboard players operation @e[tag=t] obj = $a __variable__
+scoreboard players operation @e[tag=t] obj *= $a __variable__
+            """),
+        )
+
+    def test_optimize_expression_constant(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file("""
+$x := $c - $c;
+$x := 3 % (($a - $a) * 2);
+        """)
+            .set_header_file("#optimize")
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/functions/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/functions/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+scoreboard objectives add __int__ dummy
+scoreboard players set 0 __int__ 0
+scoreboard players set $x __variable__ 0
+scoreboard players set $x __variable__ 3
+scoreboard players operation $x __variable__ %= 0 __int__
+            """),
+        )
+
+    def test_optimize_condition(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file("""
+if ($x == 1 || $x == 2 || $x matches 3..5 || $x > 10) { say "a"; }
+if ($x >= 0 && $x <= 5) { say "b"; }
+if (($a == 1 || entity @s) && $b == 2 && ($a == 1 || entity @s)) { say "c"; }
+if (!($a == 1 && entity @s)) { say "d"; }
+        """)
+            .set_header_file("#optimize")
+            .set_pack_format(57)
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/function/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/function/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+execute if function TEST:__private__/condition/0 run say a
+execute if score $x __variable__ matches 0..5 run say b
+execute if function TEST:__private__/condition/1 if score $b __variable__ matches 2 run say c
+execute unless function TEST:__private__/condition/2 run say d
+> VIRTUAL/data/TEST/function/__private__/condition/0.mcfunction
+execute if score $x __variable__ matches 1..5 run return 1
+execute if score $x __variable__ matches 11.. run return 1
+> VIRTUAL/data/TEST/function/__private__/condition/1.mcfunction
+execute if score $a __variable__ matches 1 run return 1
+execute if entity @s run return 1
+> VIRTUAL/data/TEST/function/__private__/condition/2.mcfunction
+execute if score $a __variable__ matches 1 if entity @s run return 1
+            """),
+        )
+
+    def test_optimize_condition_legacy(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file("""
+if ($x == 1 || $x == 2 || $x > 10) { say "a"; }
+if (($a == 1 || entity @s) && ($a == 1 || entity @s)) { say "b"; }
+        """)
+            .set_header_file("#optimize")
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/functions/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/functions/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+scoreboard players set __logic__0 __variable__ 0
+execute if score $x __variable__ matches 1..2 run scoreboard players set __logic__0 __variable__ 1
+execute unless score __logic__0 __variable__ matches 1 if score $x __variable__ matches 11.. run scoreboard players set __logic__0 __variable__ 1
+execute if score __logic__0 __variable__ matches 1 run say a
+scoreboard players set __logic__0 __variable__ 0
+execute if score $a __variable__ matches 1 run scoreboard players set __logic__0 __variable__ 1
+execute unless score __logic__0 __variable__ matches 1 if entity @s run scoreboard players set __logic__0 __variable__ 1
+execute if score __logic__0 __variable__ matches 1 run say b
+            """),
+        )
+
+    def test_optimize_profile(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file("""
+Particle.line("flame", distance=3, spread=3);
+Particle.line("flame", distance=3, spread=3);
+execute as @a run Particle.line("flame", distance=1, spread=1);
+        """)
+            .set_header_file("#optimize")
+            .set_function_profile(FunctionProfile(
+                {"TEST:__private__/particle_line/0": 1000,
+                 "TEST:__private__/particle_line/2": 0}, {}))
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/functions/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/functions/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+particle flame ^ ^ ^1.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^2.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^3.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^1.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^2.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^3.0000000000 0 0 0 1 1 normal
+execute as @a run function TEST:__private__/particle_line/2
+> VIRTUAL/data/TEST/functions/__private__/particle_line/2.mcfunction
+particle flame ^ ^ ^1.0000000000 0 0 0 1 1 normal
+            """),
+        )
+
+    def test_optimize_profile_stablenames(self):
+        jmc_file = """
+Particle.line("flame", distance=3, spread=3);
+Particle.line("flame", distance=2, spread=2);
+execute as @a run Particle.line("flame", distance=1, spread=1);
+        """
+        profiled_pack = (
+            JMCTestPack()
+            .set_jmc_file(jmc_file)
+            .set_header_file("#stablenames")
+            .build()
+        )
+        load = profiled_pack.built["VIRTUAL/data/TEST/functions/__load__.mcfunction"]
+        paths = [command.rsplit(" ", 1)[1] for command in load.splitlines()[1:]]
+        self.assertEqual(len(paths), 3)
+
+        pack = (
+            JMCTestPack()
+            .set_jmc_file(jmc_file)
+            .set_header_file("#optimize\n#stablenames")
+            .set_function_profile(FunctionProfile(
+                {paths[0]: 0, paths[1]: 1000, paths[2]: 0}, {}))
+            .build()
+        )
+        self.assertEqual(
+            pack.built["VIRTUAL/data/TEST/functions/__load__.mcfunction"],
+            f"""scoreboard objectives add __variable__ dummy
+function {paths[0]}
+particle flame ^ ^ ^1.0000000000 0 0 0 1 1 normal
+particle flame ^ ^ ^2.0000000000 0 0 0 1 1 normal
+execute as @a run function {paths[2]}""",
+        )
+
+    def test_optimize_not_inlinable(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file("""
+if ($a == 1) { $x = 1; return 1; }
+switch ($a) { case 1: $say "$(x)"; $x = 1; case 2: $say "$(y)"; $y = 2; }
+        """)
+            .set_header_file("#optimize")
+            .set_pack_format(57)
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict("""
+> VIRTUAL/data/minecraft/tags/function/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/function/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+execute if score $a __variable__ matches 1 run function TEST:__private__/if_else/0
+scoreboard players operation __switch__0 __variable__ = $a __variable__
+execute if score __switch__0 __variable__ matches 1 run function TEST:__private__/switch_case/1
+execute if score __switch__0 __variable__ matches 2 run function TEST:__private__/switch_case/2
+> VIRTUAL/data/TEST/function/__private__/if_else/0.mcfunction
+scoreboard players set $x __variable__ 1
+return 1
+> VIRTUAL/data/TEST/function/__private__/switch_case/1.mcfunction
+$say $(x)
+scoreboard players set $x __variable__ 1
+> VIRTUAL/data/TEST/function/__private__/switch_case/2.mcfunction
+$say $(y)
+scoreboard players set $y __variable__ 2
+            """),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
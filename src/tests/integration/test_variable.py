@@ -370,6 +370,87 @@ execute store result score $a __variable__ run data get entity @s SelectedItem.t
             ),
         )
 
+    def test_constant_operation(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file(
+                """
+$a *= 1;
+$a *= 0;
+$a %= 1;
+if ($a > 1) { $x *= 1; }
+        """
+            )
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict(
+                """
+> VIRTUAL/data/minecraft/tags/functions/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/functions/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+scoreboard objectives add __int__ dummy
+scoreboard players set 0 __int__ 0
+scoreboard players set 1 __int__ 1
+scoreboard players operation $a __variable__ *= 1 __int__
+scoreboard players operation $a __variable__ *= 0 __int__
+scoreboard players operation $a __variable__ %= 1 __int__
+execute if score $a __variable__ matches 2.. run scoreboard players operation $x __variable__ *= 1 __int__
+            """
+            ),
+        )
+
+    def test_constant_operation_optimize(self):
+        pack = (
+            JMCTestPack()
+            .set_jmc_file(
+                """
+$a *= 1;
+$a /= 1;
+$a *= 0;
+$a %= 1;
+$a *= 3;
+if ($a > 1) { $x *= 1; }
+if ($a > 1) { $x *= 0; }
+        """
+            )
+            .set_header_file("#optimize")
+            .build()
+        )
+
+        self.assertDictEqual(
+            pack.built,
+            string_to_tree_dict(
+                """
+> VIRTUAL/data/minecraft/tags/functions/load.json
+{
+    "values": [
+        "TEST:__load__"
+    ]
+}
+> VIRTUAL/data/TEST/functions/__load__.mcfunction
+scoreboard objectives add __variable__ dummy
+scoreboard objectives add __int__ dummy
+scoreboard players set 1 __int__ 1
+scoreboard players set 3 __int__ 3
+scoreboard players operation $a __variable__ *= 1 __int__
+scoreboard players operation $a __variable__ /= 1 __int__
+scoreboard players set $a __variable__ 0
+scoreboard players set $a __variable__ 0
+scoreboard players operation $a __variable__ *= 3 __int__
+execute if score $a __variable__ matches 2.. run scoreboard players operation $x __variable__ *= 1 __int__
+execute if score $a __variable__ matches 2.. run scoreboard players set $x __variable__ 0
+            """
+            ),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
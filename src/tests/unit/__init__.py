@@ -1,4 +1,5 @@
 from types import ModuleType as __ModuleType
-from . import test_terminal, test_tokenizer, test_utils
-ALL: tuple[__ModuleType, ...] = (test_terminal, test_tokenizer,
-                                 test_utils)
+from . import test_benchmarks, test_builtin_function, test_cache, test_context, test_log, test_optimizer, test_output, test_parallel, test_profiler, test_server, test_terminal, test_tokenizer, test_utils, test_watcher
+ALL: tuple[__ModuleType, ...] = (test_benchmarks, test_builtin_function, test_cache, test_context, test_log,
+                                 test_optimizer, test_output, test_parallel, test_profiler, test_server,
+                                 test_terminal, test_tokenizer, test_utils, test_watcher)
@@ -0,0 +1,57 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+import unittest  # noqa
+from json import dumps, loads  # noqa
+
+from benchmarks import SCENARIOS, CorpusConfig, compare, generate_corpus, run_benchmarks
+
+SMALL_CORPUS = CorpusConfig(
+    files=2, functions=2, statements=2, nesting=2, repeat_iterations=2, switch_cases=3
+)
+
+
+class TestCorpus(unittest.TestCase):
+    def test_deterministic(self):
+        self.assertDictEqual(generate_corpus(SMALL_CORPUS), generate_corpus(SMALL_CORPUS))
+        other_seed = CorpusConfig(**SMALL_CORPUS.toJSON())
+        other_seed.seed = 1
+        self.assertNotEqual(generate_corpus(SMALL_CORPUS), generate_corpus(other_seed))
+
+    def test_scaled(self):
+        corpus = generate_corpus(SMALL_CORPUS.scaled(3))
+        self.assertEqual(len([path for path in corpus if path.startswith("modules/")]), 6)
+        self.assertEqual(SMALL_CORPUS.files, 2)
+
+
+class TestScenarios(unittest.TestCase):
+    def test_run_benchmarks(self):
+        result = loads(dumps(run_benchmarks([1], repeat=1, warmup=0, corpus_config=SMALL_CORPUS)))
+        self.assertEqual(
+            [row["scenario"] for row in result["results"]], list(SCENARIOS)
+        )
+        for row in result["results"]:
+            self.assertEqual(len(row["samples"]), 1)
+            self.assertGreater(row["median"], 0)
+            self.assertEqual(row["corpus"]["files"], 4)
+        self.assertDictEqual(result["corpus_config"], SMALL_CORPUS.toJSON())
+
+    def test_compare(self):
+        def result(**medians: float):
+            return {
+                "results": [
+                    {"scenario": scenario, "scale": 1, "median": median}
+                    for scenario, median in medians.items()
+                ]
+            }
+
+        rows = compare(result(lex=1.0, tokenize=1.0), result(lex=1.5, tokenize=1.05, build_disk=1.0))
+        self.assertEqual(
+            [(row["scenario"], row["is_regression"]) for row in rows],
+            [("lex", True), ("tokenize", False)],
+        )
+        self.assertAlmostEqual(rows[0]["ratio"], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+import unittest  # noqa
+import os  # noqa
+import subprocess  # noqa
+from importlib import import_module  # noqa
+from pathlib import Path  # noqa
+
+import jmc
+from jmc.compile.command.builtin_function import BUILTIN_FUNCTIONS
+from jmc.compile.command.jmc_function import FuncType, JMCFunction
+
+BUILTIN_PACKAGE = "jmc.compile.command.builtin_function"
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    """Run code in a new interpreter that imports jmc from the same place as the tests"""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(jmc.__file__).parent.parent)
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time(code: str) -> dict[str, int]:
+    """Run code with `-X importtime` and return cumulative import time (us) of every statically imported module"""
+    modules: dict[str, int] = {}
+    for line in run_python(code, "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestBuiltinFunctionManifest(unittest.TestCase):
+    def test_manifest(self):
+        module_names = {
+            value.split(":")[0]
+            for functions in BUILTIN_FUNCTIONS.values()
+            for value in functions.values()
+        }
+        for module_name in module_names:
+            import_module(f"{BUILTIN_PACKAGE}.{module_name}")
+        for func_type in FuncType:
+            registry = JMCFunction.get_subclasses(func_type)
+            registered = {
+                call_string: f"{cls.__module__.removeprefix(BUILTIN_PACKAGE + '.')}:{cls.__name__}"
+                for call_string, cls in dict.items(registry)
+            }
+            self.assertDictEqual(
+                registered, BUILTIN_FUNCTIONS[func_type.name], func_type.name
+            )
+
+    def test_registry(self):
+        registry = JMCFunction.get_subclasses(FuncType.BOOL_FUNCTION)
+        self.assertIn("Timer.isOver", registry)
+        self.assertNotIn("Timer.isNotAFunction", registry)
+        self.assertIsNone(registry.get("Timer.isNotAFunction"))
+        self.assertEqual(registry["Timer.isOver"].__name__, "TimerIsOver")
+        self.assertEqual(
+            list(registry), list(BUILTIN_FUNCTIONS[FuncType.BOOL_FUNCTION.name])
+        )
+        with self.assertRaises(KeyError):
+            registry["Timer.isNotAFunction"]
+
+
+class TestStartup(unittest.TestCase):
+    def test_lazy_import(self):
+        modules = import_time("import jmc")
+        self.assertIn("jmc.compile.lexer", modules)
+        self.assertEqual(
+            [name for name in modules if name.startswith(BUILTIN_PACKAGE + ".")], []
+        )
+
+    def test_import_on_lookup(self):
+        result = run_python(
+            "import sys\n"
+            "from jmc.compile.command.jmc_function import FuncType, JMCFunction\n"
+            "JMCFunction.get_subclasses(FuncType.BOOL_FUNCTION)['Timer.isOver']\n"
+            f"print(*sorted(name for name in sys.modules if name.startswith('{BUILTIN_PACKAGE}.')))"
+        )
+        self.assertEqual(result.stdout.split(), [f"{BUILTIN_PACKAGE}.bool_function"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+from pathlib import Path  # noqa
+from tempfile import TemporaryDirectory  # noqa
+import unittest  # noqa
+
+from jmc.compile.cache import CompileCache
+from jmc.compile.tokenizer import Tokenizer
+
+SOURCE = """
+function main() {
+    say "hello";
+}
+$x = 1;
+"""
+
+
+def programs_to_strings(programs):
+    return [[(token.token_type, token.line, token.col, token.string)
+             for token in program] for program in programs]
+
+
+class TestCompileCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.folder = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_hit(self):
+        cache = CompileCache(self.folder, "fingerprint")
+        cache.tokenize(SOURCE, "main.jmc")
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        tokenizer = cache.tokenize(SOURCE, "main.jmc")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(
+            programs_to_strings(tokenizer.programs),
+            programs_to_strings(Tokenizer(SOURCE, "main.jmc").programs)
+        )
+        self.assertEqual(tokenizer.file_string, SOURCE)
+
+    def test_miss_on_change(self):
+        cache = CompileCache(self.folder, "fingerprint")
+        cache.tokenize(SOURCE, "main.jmc")
+        cache.tokenize(SOURCE + "$y = 2;", "main.jmc")
+        CompileCache(self.folder, "other").tokenize(SOURCE, "main.jmc")
+        cache.tokenize(SOURCE, "other.jmc")
+        self.assertEqual(cache.hits, 0)
+
+    def test_index(self):
+        cache = CompileCache(self.folder, "fingerprint")
+        cache.add_import("main.jmc", "lib.jmc")
+        cache.save_index()
+        self.assertEqual(
+            CompileCache(self.folder, "fingerprint").read_index(),
+            {"main.jmc": ["lib.jmc"]}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+import unittest  # noqa
+from concurrent.futures import ThreadPoolExecutor  # noqa
+from pathlib import Path  # noqa
+from tempfile import TemporaryDirectory  # noqa
+
+from jmc.compile.compiling import compile_jmc
+from jmc.compile.context import CompileContext, current_context
+from jmc.compile.datapack import DataPack
+from jmc.compile.header import Header
+from jmc.compile.hooks import emit_message, register_message
+from jmc.compile.test_compile import JMCTestPack
+from jmc.terminal import Configuration, GlobalData
+
+
+def build(var_name: str) -> dict[str, str]:
+    return (
+        JMCTestPack()
+        .set_cert(f"LOAD=__load__\nTICK=__tick__\nPRIVATE=__private__\nVAR={var_name}\nINT=__int__")
+        .set_jmc_file("""
+$a = 1;
+$b = $a;
+$b *= 3;
+if ($b > 2) { say "big"; }
+        """)
+        .build()
+        .built
+    )
+
+
+class TestCompileContext(unittest.TestCase):
+    def test_isolation(self):
+        outer = current_context()
+        context = CompileContext()
+        with context.use():
+            self.assertIs(current_context(), context)
+            self.assertIs(Header(), context.header)
+            Header().is_optimize = True
+            DataPack.var_name = "__other__"
+            self.assertEqual(context.var_name, "__other__")
+        self.assertIs(current_context(), outer)
+        self.assertIsNot(Header(), context.header)
+        self.assertFalse(Header().is_optimize)
+        self.assertNotEqual(DataPack.var_name, "__other__")
+
+    def test_compile_in_new_context(self):
+        with TemporaryDirectory() as folder:
+            (Path(folder) / "main.jmc").write_text('say "a";')
+            global_data = GlobalData()
+            global_data.cwd = Path(folder)
+            config = Configuration(
+                global_data,
+                namespace="test",
+                description="",
+                pack_format="57",
+                target=Path(folder) / "main.jmc",
+                output=Path(folder) / "out",
+            )
+            context = CompileContext()
+            compile_jmc(config, context=context)
+            self.assertListEqual(context.header.envs, [])
+            self.assertIn(
+                "say a",
+                (Path(folder) / "out/data/test/function/__load__.mcfunction").read_text(),
+            )
+
+    def test_message_handler(self):
+        registered: list[str] = []
+        received: list[str] = []
+        register_message(registered.append)
+        try:
+            context = CompileContext()
+            context.message_handler = received.append
+            with context.use():
+                emit_message("inside")
+            emit_message("outside")
+        finally:
+            register_message(print)
+        self.assertListEqual(received, ["inside"])
+        self.assertListEqual(registered, ["outside"])
+
+    def test_concurrent_build(self):
+        var_names = [f"__var{i}__" for i in range(4)]
+        expected = {var_name: build(var_name) for var_name in var_names}
+
+        def build_in_context(var_name: str) -> dict[str, str]:
+            with CompileContext().use():
+                return build(var_name)
+
+        with ThreadPoolExecutor(max_workers=len(var_names)) as executor:
+            results = list(executor.map(build_in_context, var_names * 5))
+        for var_name, result in zip(var_names * 5, results):
+            self.assertDictEqual(result, expected[var_name])
+            self.assertIn(f"scoreboard objectives add {var_name} dummy", result["VIRTUAL/data/TEST/functions/__load__.mcfunction"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+import unittest  # noqa
+import logging  # noqa
+
+from jmc.compile.log import Logger, RingBufferHandler, set_debug_log, FORMATTER
+
+
+class TestRingBufferHandler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.handler = RingBufferHandler(3, logging.DEBUG)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        self.logger = logging.getLogger("jmc.test_log")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self) -> None:
+        self.logger.removeHandler(self.handler)
+
+    def test_capacity(self):
+        for i in range(5):
+            self.logger.debug("record %d", i)
+        self.assertEqual(
+            self.handler.getvalue(),
+            "... 2 older record(s) discarded ...\nrecord 2\nrecord 3\nrecord 4\n",
+        )
+        self.handler.clear()
+        self.assertEqual(self.handler.getvalue(), "")
+
+    def test_format_on_emit(self):
+        tokens = ["a"]
+        self.logger.debug("tokens: %s", tokens)
+        tokens.append("b")
+        self.assertEqual(self.handler.getvalue(), "tokens: ['a']\n")
+        self.assertIsNone(self.handler.records[0].args)
+
+    def test_disabled_level(self):
+        class Counter:
+            count = 0
+
+            def __str__(self) -> str:
+                Counter.count += 1
+                return "counter"
+
+        self.logger.setLevel(logging.INFO)
+        self.logger.debug("value: %s", Counter())
+        self.assertEqual(Counter.count, 0)
+        self.assertEqual(self.handler.getvalue(), "")
+
+
+class TestLogger(unittest.TestCase):
+    def test_set_debug_log(self):
+        logger = Logger("jmc.test_log.logger")
+        self.assertIs(Logger("jmc.test_log.logger"), logger)
+        self.assertEqual(len(logger.handlers), 2)
+        self.assertIs(logger.handlers[0].formatter, FORMATTER)
+        try:
+            set_debug_log(False)
+            self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+            self.assertTrue(logger.isEnabledFor(logging.INFO))
+        finally:
+            set_debug_log(True)
+        self.assertTrue(logger.isEnabledFor(logging.DEBUG))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+import unittest  # noqa
+from pathlib import Path  # noqa
+from tempfile import TemporaryDirectory  # noqa
+
+from jmc.compile.command.condition import AND_OPERATOR, IF, Condition, optimize_ast
+from jmc.compile.context import CompileContext
+from jmc.compile.datapack import DataPack, Function
+from jmc.compile.exception import JMCBuildError
+from jmc.compile.function_profile import FunctionProfile
+from jmc.compile.optimizer import (
+    INLINE_CALL_REGEX,
+    inline_private_functions,
+    recursive_functions,
+)
+
+
+class TestCallGraph(unittest.TestCase):
+    def test_recursive_functions(self):
+        graph = {
+            "a": {"b"},
+            "b": {"c", "outside"},
+            "c": {"b"},
+            "d": {"d"},
+            "e": {"a", "d"},
+        }
+        self.assertSetEqual(recursive_functions(graph), {"b", "c", "d"})
+        self.assertSetEqual(recursive_functions({"a": set(), "b": {"a"}}), set())
+
+    def test_inline_call_regex(self):
+        match = INLINE_CALL_REGEX.match(
+            "execute as @a run function TEST:__private__/a/0")
+        assert match is not None
+        self.assertEqual(match.group(1), "execute as @a run ")
+        self.assertEqual(match.group(2), "TEST:__private__/a/0")
+        self.assertIsNone(INLINE_CALL_REGEX.match(
+            "function TEST:__private__/a/0 with storage a:b"))
+
+
+class _Lexer:
+    context = CompileContext()
+
+
+class TestInline(unittest.TestCase):
+    def inline(self, body: list[str]) -> list[str]:
+        datapack = DataPack("TEST", 57, _Lexer())  # type: ignore
+        datapack.functions["main"] = Function([
+            "function TEST:__private__/a/0",
+            "execute as @a run function TEST:__private__/a/0",
+        ])
+        datapack.private_functions["a"]["0"] = Function(body)
+        self.assertEqual(inline_private_functions(datapack), 0)
+        return datapack.functions["main"].commands
+
+    def test_not_inlinable(self):
+        expected = [
+            "function TEST:__private__/a/0",
+            "execute as @a run function TEST:__private__/a/0",
+        ]
+        self.assertListEqual(self.inline(["say a", "return 1"]), expected)
+        self.assertListEqual(self.inline(["$say $(a)"]), expected)
+        self.assertListEqual(self.inline([]), expected)
+
+
+class TestConditionOptimizer(unittest.TestCase):
+    def test_duplicate(self):
+        datapack = DataPack("TEST", 57, _Lexer())  # type: ignore
+        ast = optimize_ast(
+            {"operator": AND_OPERATOR, "body": [
+                Condition("entity @s", IF), Condition("entity @s", IF)]},
+            datapack)
+        assert isinstance(ast, Condition)
+        self.assertEqual(str(ast), "if entity @s")
+
+    def test_duplicate_pre_commands(self):
+        datapack = DataPack("TEST", 57, _Lexer())  # type: ignore
+        ast = optimize_ast(
+            {"operator": AND_OPERATOR, "body": [
+                Condition("entity @s", IF, ["say a"]),
+                Condition("entity @s", IF, ["say a"])]},
+            datapack)
+        assert isinstance(ast, dict)
+        self.assertEqual(len(ast["body"]), 2)
+
+
+class TestFunctionProfile(unittest.TestCase):
+    def test_from_file(self):
+        with TemporaryDirectory() as folder:
+            json_path = Path(folder) / "profile.json"
+            json_path.write_text(
+                '{"ns:a": {"calls": 100, "time": 50.0}, "ns:b": 3, "ns:c": {"calls": 0}}')
+            profile = FunctionProfile.from_file(json_path)
+            self.assertDictEqual(profile.calls, {"ns:a": 100, "ns:b": 3, "ns:c": 0})
+            self.assertTrue(profile.is_hot("ns:a"))
+            self.assertFalse(profile.is_hot("ns:b"))
+            self.assertTrue(profile.is_cold("ns:c"))
+            self.assertFalse(profile.is_cold("ns:unknown"))
+
+            text_path = Path(folder) / "profile.txt"
+            text_path.write_text("# path calls time\nns:a 10 0.5\nns:b 200 0.01\n")
+            profile = FunctionProfile.from_file(text_path)
+            self.assertDictEqual(profile.times, {"ns:a": 0.5, "ns:b": 0.01})
+            self.assertTrue(profile.is_hot("ns:a"))
+            self.assertFalse(profile.is_hot("ns:b"))
+
+            text_path.write_text("ns:a many\n")
+            with self.assertRaises(JMCBuildError):
+                FunctionProfile.from_file(text_path)
+
+    def test_weight(self):
+        profile = FunctionProfile({"ns:a": 10, "ns:b": 200}, {"ns:a": 0.5})
+        self.assertFalse(profile.is_timed)
+        self.assertEqual(profile.weight("ns:a"), 10)
+        self.assertTrue(profile.is_hot("ns:b"))
+        self.assertFalse(profile.is_hot("ns:a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+from pathlib import Path  # noqa
+from tempfile import TemporaryDirectory  # noqa
+import unittest  # noqa
+
+from io import BytesIO  # noqa
+from zipfile import ZipFile  # noqa
+
+from jmc.compile.compiling import hash_content, write_differential
+from jmc.compile.output_sink import (
+    PARALLEL_WRITE_THRESHOLD,
+    DirectorySink,
+    OutputSink,
+    ZipSink,
+    write_files,
+)
+
+
+class TestDifferentialWrite(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.folder = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def build(self, files: dict[str, str], old_manifest: dict[str, str]) -> dict[str, str]:
+        return write_differential(
+            {self.folder / path: content for path, content in files.items()},
+            self.folder, old_manifest, set()
+        )
+
+    def test_first_write(self):
+        manifest = self.build({"a/b.mcfunction": "say a"}, {})
+        self.assertEqual(manifest, {"a/b.mcfunction": hash_content("say a")})
+        self.assertEqual((self.folder / "a/b.mcfunction").read_text(), "say a")
+
+    def test_skip_unchanged(self):
+        manifest = self.build({"a.mcfunction": "say a"}, {})
+        path = self.folder / "a.mcfunction"
+        path.write_text("edited outside of jmc")
+        self.build({"a.mcfunction": "say a"}, manifest)
+        self.assertEqual(path.read_text(), "edited outside of jmc")
+
+    def test_rewrite_missing(self):
+        manifest = self.build({"a.mcfunction": "say a"}, {})
+        (self.folder / "a.mcfunction").unlink()
+        self.build({"a.mcfunction": "say a"}, manifest)
+        self.assertEqual((self.folder / "a.mcfunction").read_text(), "say a")
+
+    def test_delete_stale(self):
+        manifest = self.build(
+            {"keep.mcfunction": "say a", "old/deep/stale.mcfunction": "say b"}, {})
+        write_files({self.folder / "user.txt": "not from jmc"})
+        new_manifest = self.build({"keep.mcfunction": "say c"}, manifest)
+        self.assertEqual(list(new_manifest), ["keep.mcfunction"])
+        self.assertFalse((self.folder / "old").exists())
+        self.assertTrue((self.folder / "user.txt").is_file())
+        self.assertEqual((self.folder / "keep.mcfunction").read_text(), "say c")
+
+
+class TestWriteFiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.folder = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parallel(self):
+        output = {
+            self.folder / f"group{i % 7}" / f"{i}.mcfunction": f"say {i}"
+            for i in range(PARALLEL_WRITE_THRESHOLD * 3)
+        }
+        write_files(output)
+        for path, content in output.items():
+            self.assertEqual(path.read_text(), content)
+
+
+class TestSink(unittest.TestCase):
+    ROOT = Path("/virtual/output")
+    OUTPUT = {
+        ROOT / "pack.mcmeta": "{}",
+        ROOT / "data/ns/function/b.mcfunction": "say b",
+        ROOT / "data/ns/function/a.mcfunction": "say a",
+        ROOT / "icon.png": b"\x89PNG",
+    }
+
+    def zip_bytes(self, output) -> bytes:
+        buffer = BytesIO()
+        with ZipSink(buffer) as sink:
+            sink.write(output, self.ROOT)
+        return buffer.getvalue()
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            OutputSink()  # type: ignore
+
+    def test_zip_content(self):
+        with ZipFile(BytesIO(self.zip_bytes(self.OUTPUT))) as zip_file:
+            self.assertEqual(zip_file.namelist(), [
+                "data/ns/function/a.mcfunction",
+                "data/ns/function/b.mcfunction",
+                "icon.png",
+                "pack.mcmeta",
+            ])
+            self.assertEqual(zip_file.read("icon.png"), b"\x89PNG")
+            self.assertEqual(
+                zip_file.read("data/ns/function/a.mcfunction"), b"say a")
+
+    def test_zip_deterministic(self):
+        reversed_output = dict(reversed(self.OUTPUT.items()))
+        self.assertEqual(self.zip_bytes(self.OUTPUT),
+                         self.zip_bytes(reversed_output))
+
+    def test_zip_path_discarded_on_error(self):
+        with TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "pack.zip"
+            with self.assertRaises(RuntimeError):
+                with ZipSink(path) as sink:
+                    sink.write(self.OUTPUT, self.ROOT)
+                    raise RuntimeError()
+            self.assertEqual(list(Path(temp_dir).iterdir()), [])
+            with ZipSink(path) as sink:
+                sink.write(self.OUTPUT, self.ROOT)
+            self.assertEqual(list(Path(temp_dir).iterdir()), [path])
+
+    def test_directory(self):
+        with TemporaryDirectory() as temp_dir:
+            DirectorySink(Path(temp_dir)).write(self.OUTPUT, self.ROOT)
+            self.assertEqual(
+                (Path(temp_dir) / "data/ns/function/a.mcfunction").read_text(),
+                "say a")
+
+
+if __name__ == '__main__':
+    unittest.main()
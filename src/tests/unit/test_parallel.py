@@ -0,0 +1,67 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+from pathlib import Path  # noqa
+from tempfile import TemporaryDirectory  # noqa
+import unittest  # noqa
+
+from jmc.compile.header import Header
+from jmc.compile.parallel import pretokenize
+from jmc.compile.tokenizer import Tokenizer
+from jmc.terminal import Configuration, GlobalData
+
+FILES = {
+    "main.jmc": 'import "lib";\nimport "lib";\nfunction main() { say "main"; }',
+    "lib.jmc": 'import "sub/deep";\n$x = HELLO;',
+    "sub/deep.jmc": 'function deep() { tellraw @a "deep"; }',
+    "main.hjmc": "#define HELLO 5",
+}
+
+
+def programs_to_strings(programs):
+    return [[(token.token_type, token.line, token.col, token.string)
+             for token in program] for program in programs]
+
+
+class TestPretokenize(unittest.TestCase):
+    def test_import_tree(self):
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir).resolve()
+            for name, content in FILES.items():
+                (folder / name).parent.mkdir(parents=True, exist_ok=True)
+                (folder / name).write_text(content)
+            config = Configuration(
+                GlobalData(), "namespace", "", "48",
+                folder / "main.jmc", folder / "output"
+            )
+            result = pretokenize(config, [], jobs=2)
+            self.assertEqual(set(result), {
+                (folder / name).as_posix() for name in FILES
+                if name.endswith(".jmc")
+            })
+            raw_string, programs = result[(folder / "lib.jmc").as_posix()]
+            self.assertEqual(raw_string, FILES["lib.jmc"])
+            self.assertEqual(programs[1][2].string, "5")
+
+            Header.clear()
+            self.assertEqual(
+                programs_to_strings(
+                    result[(folder / "sub/deep.jmc").as_posix()][1]),
+                programs_to_strings(
+                    Tokenizer(FILES["sub/deep.jmc"],
+                              (folder / "sub/deep.jmc").as_posix()).programs)
+            )
+
+            main_path = (folder / "main.jmc").as_posix()
+            raw_string, programs = result[main_path]
+            body = programs[2][3]
+            self.assertIsNotNone(body._children)
+            children, children_programs = Tokenizer.from_paren_curly(
+                body, main_path, raw_string)
+            self.assertIs(children, body._children)
+            self.assertIs(children.header, Header())
+            self.assertEqual(children_programs[0][1].string, "main")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+import unittest  # noqa
+from json import loads  # noqa
+from pathlib import Path  # noqa
+from tempfile import TemporaryDirectory  # noqa
+import tracemalloc  # noqa
+
+from jmc.compile.header import Header
+from jmc.compile.profiler import CompileProfiler, profile_span
+
+
+class TestCompileProfiler(unittest.TestCase):
+    def test_nested_span(self):
+        profiler = CompileProfiler(trace_memory=False)
+        with profiler.span("lex"):
+            with profiler.span("function:a"):
+                with profiler.span("call:Hardcode.repeat"):
+                    pass
+            with profiler.span("function:b;c"):
+                pass
+        profiler.stop()
+
+        self.assertSetEqual(
+            set(profiler.frames),
+            {
+                ("lex",),
+                ("lex", "function:a"),
+                ("lex", "function:a", "call:Hardcode.repeat"),
+                ("lex", "function:b:c"),
+            },
+        )
+        lex = profiler.frames[("lex",)]
+        function_a = profiler.frames[("lex", "function:a")]
+        self.assertEqual(lex.calls, 1)
+        self.assertGreaterEqual(lex.total_time, lex.child_time)
+        self.assertGreaterEqual(lex.child_time, function_a.total_time)
+
+        report = profiler.report()
+        self.assertEqual(report["phases"][0]["stack"], "lex")  # type: ignore
+        self.assertSetEqual(
+            set(report["summary"]), {"lex", "function", "call"}  # type: ignore
+        )
+        lines = profiler.collapsed_stacks().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn("lex;function:a;call:Hardcode.repeat", [line.rsplit(" ", 1)[0] for line in lines])
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+    def test_write(self):
+        profiler = CompileProfiler()
+        with profiler.span("build"):
+            _ = [str(i) for i in range(1000)]
+        profiler.stop()
+        with TemporaryDirectory() as folder:
+            report_path, collapsed_path = profiler.write(Path(folder) / "profile")
+            report = loads(report_path.read_text())
+            self.assertEqual(report["phases"][0]["calls"], 1)
+            self.assertGreater(report["phases"][0]["peak_allocated"], 0)
+            self.assertTrue(collapsed_path.read_text().startswith("build "))
+
+    def test_peak_allocated(self):
+        profiler = CompileProfiler()
+        with profiler.span("build"):
+            with profiler.span("lex"):
+                data = bytearray(1_000_000)
+                del data
+            with profiler.span("optimize"):
+                pass
+        profiler.stop()
+        phases = {
+            phase["stack"]: phase for phase in profiler.report()["phases"]  # type: ignore
+        }
+        self.assertGreaterEqual(phases["build;lex"]["peak_allocated"], 1_000_000)
+        self.assertLess(phases["build;lex"]["retained"], 1_000_000)
+        self.assertGreaterEqual(phases["build"]["peak_allocated"], 1_000_000)
+        self.assertLess(phases["build;optimize"]["peak_allocated"], 1_000_000)
+
+    def test_tracemalloc_owner(self):
+        profiler = CompileProfiler()
+        self.assertTrue(tracemalloc.is_tracing())
+        profiler.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+        tracemalloc.start()
+        try:
+            profiler = CompileProfiler()
+            profiler.stop()
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_profile_span_disabled(self):
+        Header.clear()
+        with profile_span("build"):
+            pass
+        self.assertIsNone(Header().profiler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+from io import StringIO  # noqa
+from json import dumps, loads  # noqa
+from pathlib import Path  # noqa
+from tempfile import TemporaryDirectory  # noqa
+import unittest  # noqa
+
+from jmc.terminal.server import INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, CompileServer
+
+
+class TestCompileServer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.folder = Path(self.temp_dir.name)
+        (self.folder / "jmc_config.json").write_text(dumps({
+            "namespace": "test",
+            "description": "",
+            "pack_format": "57",
+            "target": "main.jmc",
+            "output": "out",
+        }))
+        self.main = self.folder / "main.jmc"
+        self.server = CompileServer()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def compile(self) -> dict:
+        response = self.server.handle_request({
+            "jsonrpc": "2.0", "id": 1, "method": "compile",
+            "params": {"workspace": self.folder.as_posix()},
+        })
+        assert response is not None
+        return response["result"]
+
+    def test_compile(self):
+        self.main.write_text('function a() { say "a"; }\nfunction b() { say "b"; }\nJMC.todo("later");')
+        result = self.compile()
+        self.assertTrue(result["success"])
+        self.assertEqual(len(result["messages"]), 1)
+        self.assertTrue(result["messages"][0].endswith(": later"))
+        self.assertIn("data/test/function/a.mcfunction", result["changed"])
+        self.assertIn("pack.mcmeta", result["changed"])
+        self.assertEqual(
+            (self.folder / "out/data/test/function/a.mcfunction").read_text(), "say a")
+
+        result = self.compile()
+        self.assertListEqual(result["changed"], [])
+
+        self.main.write_text('function a() { say "changed"; }')
+        result = self.compile()
+        self.assertListEqual(result["changed"], ["data/test/function/a.mcfunction"])
+        self.assertListEqual(result["deleted"], ["data/test/function/b.mcfunction"])
+
+    def test_diagnostics(self):
+        self.main.write_text('function a() {\n  say "a"\n')
+        result = self.compile()
+        self.assertFalse(result["success"])
+        self.assertEqual(len(result["diagnostics"]), 1)
+        self.assertEqual(result["diagnostics"][0]["type"], "JMCSyntaxException")
+        self.assertEqual(result["diagnostics"][0]["line"], 1)
+        self.assertEqual(result["diagnostics"][0]["col"], 14)
+        self.assertTrue(result["diagnostics"][0]["file"].endswith("main.jmc"))
+
+    def test_errors(self):
+        response = self.server.handle_request({"jsonrpc": "2.0", "id": 1, "method": "unknown"})
+        self.assertEqual(response["error"]["code"], METHOD_NOT_FOUND)  # type: ignore
+        response = self.server.handle_request({"jsonrpc": "2.0", "id": 2, "method": "compile", "params": {}})
+        self.assertEqual(response["error"]["code"], INVALID_PARAMS)  # type: ignore
+        response = self.server.handle_request({
+            "jsonrpc": "2.0", "id": 3, "method": "compile",
+            "params": {"workspace": (self.folder / "missing").as_posix()},
+        })
+        self.assertEqual(response["error"]["code"], INVALID_PARAMS)  # type: ignore
+        self.assertIsNone(self.server.handle_request({"jsonrpc": "2.0", "method": "ping"}))
+
+    def test_serve_stream(self):
+        input_stream = StringIO(
+            '{"jsonrpc": "2.0", "id": 1, "method": "ping"}\n'
+            "not json\n"
+            '{"jsonrpc": "2.0", "id": 2, "method": "shutdown"}\n'
+            '{"jsonrpc": "2.0", "id": 3, "method": "ping"}\n'
+        )
+        output_stream = StringIO()
+        self.server.serve_stream(input_stream, output_stream)
+        responses = [loads(line) for line in output_stream.getvalue().splitlines()]
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(responses[0]["result"], "pong")
+        self.assertEqual(responses[1]["error"]["code"], PARSE_ERROR)
+        self.assertFalse(self.server.is_running)
+
+
+if __name__ == "__main__":
+    unittest.main()
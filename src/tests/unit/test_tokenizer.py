@@ -115,6 +115,93 @@ class TestTokenizer(unittest.TestCase):
         with self.assertRaises(JMCSyntaxException):
             Tokenizer('"HELLO\nWORLD;"')
 
+    def test_paren_skip(self):
+        self.assertListEqual(
+            [(token.string, token.line, token.col) for token in Tokenizer(
+                "A {B('}', \"{\\\"\");\n// }\n[C]} D;").programs[0]],
+            [
+                ("A", 1, 1),
+                ("{B('}', \"{\\\"\");\n// }\n[C]}", 1, 3),
+                ("D", 3, 6)
+            ]
+        )
+
+    def test_skip_run(self):
+        self.assertListEqual(
+            [[(token.string, token.line, token.col) for token in program]
+             for program in Tokenizer(
+                "say  hello\t'wor/ld' // a;b\n$x+=abc}/2;# c\n").programs],
+            [
+                [("say", 1, 1), ("hello", 1, 6), ("wor/ld", 1, 12),
+                 ("$x", 2, 1), ("+=", 2, 3), ("abc}", 2, 5), ("/", 2, 9),
+                 ("2", 2, 10)]
+            ]
+        )
+
+    def test_token_length(self):
+        string_token = Tokenizer("'a\\nb';").programs[0][0]
+        self.assertEqual(string_token.length, len(repr("a\nb")))
+        self.assertEqual(string_token.length, 6)
+        self.assertEqual(tokenizer.Token.empty("abc").length, 3)
+
+    def test_token_unchecked(self):
+        token = tokenizer.Token.unchecked(
+            tokenizer.TokenType.KEYWORD, 2, 3, "abc")
+        self.assertEqual(
+            (token.token_type, token.line, token.col, token.string,
+             token.quote, token._macro_length),
+            (tokenizer.TokenType.KEYWORD, 2, 3, "abc", "", 0)
+        )
+        self.assertEqual(token.length, 3)
+
+    def test_fork(self):
+        original = Tokenizer("say hello;")
+        forked = original.fork()
+        self.assertIs(forked.raw_string, original.raw_string)
+        self.assertIs(forked.programs, original.programs)
+        args, kwargs = forked.parse_func_args(
+            tokenizer.Token(tokenizer.TokenType.PAREN_ROUND, 1, 1, "(a, b=c)"))
+        self.assertListEqual([[token.string for token in arg]
+                             for arg in args], [["a"]])
+        self.assertListEqual(list(kwargs), ["b"])
+        self.assertListEqual(
+            [token.string for token in original.programs[0]], ["say", "hello"])
+        self.assertListEqual(original.list_of_keywords, original.programs)
+
+    def test_paren_curly_children(self):
+        raw_string = "function a() {\n  say 1;\n  if (x) {say 2;}\n}"
+        token = Tokenizer(raw_string).programs[0][3]
+        child, programs = tokenizer.Tokenizer.from_paren_curly(
+            token, '', raw_string)
+        self.assertListEqual(
+            [[token_.string for token_ in program] for program in programs],
+            [["say", "1"], ["if", "(x)", "{say 2;}"]]
+        )
+        self.assertEqual(programs[1][2].line, 3)
+        programs[0].clear()
+        same_child, same_programs = tokenizer.Tokenizer.from_paren_curly(
+            token, '', raw_string)
+        self.assertIs(child, same_child)
+        self.assertListEqual(
+            [token_.string for token_ in same_programs[0]], ["say", "1"])
+        other_child, _ = tokenizer.Tokenizer.from_paren_curly(
+            token, 'other', raw_string)
+        self.assertIsNot(child, other_child)
+
+    def test_source_file(self):
+        for string in ("", "\n", "say 1;", "a\nb\n\nc", "a\r\nb\n", "\n\nend"):
+            source = tokenizer.get_source_file(string)
+            lines = string.split("\n")
+            self.assertEqual(source.line_count, len(lines))
+            for line in range(-len(lines) + 1, len(lines) + 1):
+                self.assertEqual(source.line(line), lines[line - 1])
+            with self.assertRaises(IndexError):
+                source.line(len(lines) + 1)
+        source = tokenizer.get_source_file("ab\ncd")
+        self.assertEqual(source.string[source.offset(2, 2)], "d")
+        self.assertIs(source, tokenizer.get_source_file("ab\ncd"))
+        self.assertEqual(Tokenizer("say 1;\nsay 2;").source.line(2), "say 2;")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+import os  # noqa
+from pathlib import Path  # noqa
+from tempfile import TemporaryDirectory  # noqa
+from threading import Event, Timer  # noqa
+from time import time_ns  # noqa
+import unittest  # noqa
+
+from jmc.terminal.watcher import FileWatcher, path_signature
+
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.folder = Path(self.temp_dir.name)
+        self.file = self.folder / "main.jmc"
+        self.file.write_text("$x = 1;")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def touch(self, path: Path, content: str):
+        path.write_text(content)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_no_change(self):
+        watcher = FileWatcher()
+        watcher.set_paths({self.file})
+        self.assertEqual(watcher.changed(), set())
+
+    def test_change(self):
+        watcher = FileWatcher()
+        watcher.set_paths({self.file})
+        self.touch(self.file, "$x = 2;")
+        self.assertEqual(watcher.changed(), {self.file})
+        self.assertEqual(watcher.changed(), set())
+
+    def test_missing_file(self):
+        missing = self.folder / "main.hjmc"
+        watcher = FileWatcher()
+        watcher.set_paths({missing})
+        self.assertIsNone(path_signature(missing))
+        missing.write_text("#define X 1")
+        self.assertEqual(watcher.changed(), {missing})
+
+    def test_folder(self):
+        sub_folder = self.folder / "lib"
+        sub_folder.mkdir()
+        watcher = FileWatcher()
+        watcher.set_paths({sub_folder})
+        (sub_folder / "new.txt").write_text("")
+        self.assertEqual(watcher.changed(), set())
+        (sub_folder / "new.jmc").write_text("")
+        self.assertEqual(watcher.changed(), {sub_folder})
+
+    def test_change_during_compile(self):
+        watcher = FileWatcher()
+        watcher.set_paths({self.file})
+        snapshot = watcher.scan()
+        start_ns = time_ns()
+        self.touch(self.file, "$x = 2;")  # Edited while compiling
+        watcher.set_paths({self.file}, snapshot, start_ns)
+        self.assertEqual(watcher.changed(), {self.file})
+
+    def test_new_path_changed_during_compile(self):
+        new_file = self.folder / "lib.jmc"
+        start_ns = time_ns()
+        self.touch(new_file, "$y = 1;")  # Imported file edited while compiling
+        watcher = FileWatcher()
+        watcher.set_paths({self.file, new_file}, {}, start_ns)
+        self.assertEqual(watcher.changed(), {new_file})
+
+    def test_wait_for_change(self):
+        watcher = FileWatcher(debounce=0.05)
+        watcher.set_paths({self.file})
+        timer = Timer(0.05, self.touch, (self.file, "$x = 3;"))
+        timer.start()
+        self.assertEqual(watcher.wait_for_change(Event(), 0.01), {self.file})
+        timer.join()
+
+    def test_wait_for_change_stopped(self):
+        watcher = FileWatcher()
+        watcher.set_paths({self.file})
+        event = Event()
+        event.set()
+        self.assertEqual(watcher.wait_for_change(event, 0.01), set())
+
+
+if __name__ == '__main__':
+    unittest.main()